@@ -0,0 +1,249 @@
+"""מדידת דיוק וזמני זיהוי של SmartLoginFieldsFinder על אוסף דפי התחברות שמורים"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from driver_profiler import DriverProfiler
+from modern_login_manager import SmartLoginFieldsFinder
+from vector_scoring import create_scorer
+
+FIELD_TYPES = ('username', 'password')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """מגיש קבצים ללא הדפסת שורת לוג לכל בקשה"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """שרת HTTP מקומי שמגיש את דפי האוסף במקום האתרים האמיתיים"""
+
+    def __init__(self, directory: str):
+        handler = partial(QuietHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, file_name: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{file_name}"
+
+
+def create_driver(headless: bool = True):
+    """הפעלת Chrome בגודל חלון קבוע כדי שהמיקומים יהיו יציבים בין הרצות"""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--window-size=1280,900')
+    return webdriver.Chrome(options=options)
+
+
+def classify(detected, expected) -> str:
+    """סיווג התוצאה עבור שדה בודד מול התווית הידועה"""
+    if expected is None:
+        return 'none' if detected is None else 'spurious'
+    if detected is None:
+        return 'missed'
+    return 'correct' if detected == expected else 'wrong'
+
+
+def run_page(driver, server, scorer, page, repeat, snapshots_dir=None) -> dict:
+    """הרצת הזיהוי על דף אחד ומדידת זמן, פקודות ודיוק"""
+    latencies = []
+    commands = []
+    login_fields = {}
+    finder = None
+    profiler = None
+
+    for _ in range(repeat):
+        driver.get(server.url(page['file']))
+        profiler = DriverProfiler(page['file']).attach(driver)
+        finder = SmartLoginFieldsFinder(driver, scorer, profiler=profiler)
+        start = time.perf_counter()
+        try:
+            login_fields = finder.find_login_fields()
+        except Exception as e:
+            login_fields = {}
+            print(f"  error on {page['file']}: {e}", file=sys.stderr)
+        finally:
+            profiler.detach()
+        latencies.append((time.perf_counter() - start) * 1000)
+        commands.append(profiler.total_commands)
+
+    # השוואה לתוויות - מחוץ למדידה
+    detected = dict(zip(FIELD_TYPES, finder.resolve_selectors(
+        [login_fields.get(field_type) for field_type in FIELD_TYPES]
+    )))
+    outcomes = {}
+    expected_elements = {}
+    for field_type in FIELD_TYPES:
+        selector = page['expected'].get(field_type)
+        expected = None
+        if selector:
+            matches = driver.find_elements(By.CSS_SELECTOR, selector)
+            expected = matches[0] if matches else None
+        outcomes[field_type] = classify(detected[field_type], expected)
+        expected_elements[field_type] = expected
+
+    if snapshots_dir:
+        # שמירה יחד עם אינדקס השדה הנכון - לאימון ולמדידה של הניקוד הוקטורי ללא דפדפן
+        snapshot = finder.take_snapshot()
+        data = snapshot.to_dict()
+        data['labels'] = {
+            field_type: next(
+                (i for i, el in enumerate(snapshot.elements)
+                 if expected_elements[field_type] is not None and el == expected_elements[field_type]),
+                None
+            )
+            for field_type in FIELD_TYPES
+        }
+        name = os.path.splitext(page['file'])[0]
+        with open(os.path.join(snapshots_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    return {
+        'file': page['file'],
+        'lang': page['lang'],
+        'kind': page['kind'],
+        'tier': finder.last_result.tier if finder.last_result else None,
+        'latency_ms': {
+            'median': statistics.median(latencies),
+            'min': min(latencies),
+            'max': max(latencies)
+        },
+        'commands': statistics.median(commands),
+        'stages': profiler.to_dict()['stages'],
+        'outcomes': outcomes
+    }
+
+
+def summarize(results: list) -> dict:
+    """סיכום דיוק וזמנים על כל האוסף"""
+    outcomes = Counter(o for r in results for o in r['outcomes'].values())
+    detections = outcomes['correct'] + outcomes['wrong'] + outcomes['spurious']
+    expected = outcomes['correct'] + outcomes['wrong'] + outcomes['missed']
+    return {
+        'pages': len(results),
+        'outcomes': dict(outcomes),
+        'precision': outcomes['correct'] / detections if detections else None,
+        'recall': outcomes['correct'] / expected if expected else None,
+        'latency_ms_median': statistics.median(r['latency_ms']['median'] for r in results),
+        'latency_ms_total': sum(r['latency_ms']['median'] for r in results),
+        'commands_total': sum(r['commands'] for r in results),
+        'tiers': dict(Counter(r['tier'] for r in results))
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, text=True
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+def print_report(report: dict, baseline: dict = None):
+    """הדפסת טבלת תוצאות, עם הפרשים מול הרצה קודמת אם סופקה"""
+    previous = {r['file']: r for r in baseline['pages']} if baseline else {}
+
+    print(f"{'page':34} {'tier':12} {'ms':>9} {'cmds':>6}  username/password")
+    for r in report['pages']:
+        line = (f"{r['file']:34} {str(r['tier']):12} {r['latency_ms']['median']:9.1f} "
+                f"{r['commands']:6.0f}  {r['outcomes']['username']}/{r['outcomes']['password']}")
+        old = previous.get(r['file'])
+        if old:
+            line += (f"   (ms {r['latency_ms']['median'] - old['latency_ms']['median']:+.1f}, "
+                     f"cmds {r['commands'] - old['commands']:+.0f}")
+            if old['outcomes'] != r['outcomes']:
+                line += f", was {old['outcomes']['username']}/{old['outcomes']['password']}"
+            line += ")"
+        print(line)
+
+    summary = report['summary']
+    print()
+    print(f"precision: {summary['precision']}, recall: {summary['recall']}")
+    print(f"median latency: {summary['latency_ms_median']:.1f} ms, "
+          f"total commands: {summary['commands_total']:.0f}, tiers: {summary['tiers']}")
+    if baseline:
+        old = baseline['summary']
+        print(f"baseline ({baseline.get('revision')}): precision {old['precision']}, "
+              f"recall {old['recall']}, median latency {old['latency_ms_median']:.1f} ms, "
+              f"total commands {old['commands_total']:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per page')
+    parser.add_argument('--pages', nargs='*', help='only run these fixture files')
+    parser.add_argument('--output', default='bench_results.json', help='machine-readable results')
+    parser.add_argument('--baseline', help='results file of a previous run to diff against')
+    parser.add_argument('--save-snapshots', help='directory for page snapshots (offline scoring)')
+    parser.add_argument('--headed', action='store_true', help='show the browser window')
+    parser.add_argument('--scorer', choices=['heuristic', 'vector'], default='heuristic',
+                        help='field scoring mode')
+    parser.add_argument('--weights', help='trained weights for the vector scorer')
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, 'manifest.json'), encoding='utf-8') as f:
+        pages = json.load(f)['pages']
+    if args.pages:
+        pages = [p for p in pages if p['file'] in args.pages]
+    if args.save_snapshots:
+        os.makedirs(args.save_snapshots, exist_ok=True)
+
+    driver = create_driver(headless=not args.headed)
+    scorer = create_scorer(args.scorer, args.weights)
+    try:
+        with FixtureServer(FIXTURES_DIR) as server:
+            results = [
+                run_page(driver, server, scorer, page, args.repeat, args.save_snapshots)
+                for page in pages
+            ]
+    finally:
+        driver.quit()
+
+    report = {
+        'revision': git_revision(),
+        'scorer': args.scorer,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': args.repeat,
+        'pages': results,
+        'summary': summarize(results)
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""התחברות HTTP מול שרת התחברות מקומי: טופס עם אסימון CSRF, סיסמה שגויה ודף שנבנה ב-JavaScript"""
+import argparse
+import os
+import secrets
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from http_login import HttpLoginClient, JavaScriptRequired
+
+USERNAME = 'demo@example.com'
+PASSWORD = 'correct horse'
+# משתמש שהשרת מגביל את קצב ההתחברות שלו (429) - תוצאה לא ודאית ומעבר לדפדפן, לא "פרטים שגויים"
+THROTTLED_USERNAME = 'throttled@example.com'
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><title>Sign in</title><script src="/analytics.js"></script></head>
+<body>
+  <form method="get" action="/search"><input type="search" name="q" placeholder="Search"></form>
+  <h1>Sign in to your account</h1>
+  {error}
+  <form method="post" action="/login">
+    <input type="hidden" name="csrf" value="{token}">
+    <label for="user">Email</label>
+    <input id="user" name="email" type="email" autocomplete="username">
+    <label>Password <input name="pass" type="password" autocomplete="current-password"></label>
+    <label><input type="checkbox" name="remember" checked> Remember me</label>
+    <button type="submit" name="action" value="login">Log in</button>
+  </form>
+  <form method="post" action="/newsletter"><input name="newsletter_email" type="email"></form>
+</body></html>"""
+
+SPA_PAGE = """<!doctype html>
+<html><head><script src="/app.js"></script></head>
+<body><div id="root"></div><noscript>You need to enable JavaScript to run this app.</noscript></body></html>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """שרת התחברות מינימלי: סשן בעוגייה, אסימון CSRF לכל טעינה, הפניה לדף הבית בהצלחה"""
+
+    protocol_version = 'HTTP/1.1'
+    tokens = set()
+    sessions = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: str = '', headers=None):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _login_page(self, error: str = '', status: int = 200):
+        token = secrets.token_hex(8)
+        self.tokens.add(token)
+        self._send(status, LOGIN_PAGE.format(token=token, error=error))
+
+    def do_GET(self):
+        if self.path == '/login':
+            self._login_page()
+        elif self.path == '/spa':
+            self._send(200, SPA_PAGE)
+        elif self.path == '/home':
+            cookie = self.headers.get('Cookie', '')
+            if any(f'sid={sid}' in cookie for sid in self.sessions):
+                self._send(200, '<html><body><h1>Welcome back</h1><a href="/logout">Log out</a></body></html>')
+            else:
+                self._send(302, headers={'Location': '/login'})
+        else:
+            self._send(404, 'not found')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        if self.path != '/login':
+            self._send(404, 'not found')
+        elif form.get('csrf') not in self.tokens:
+            self._send(403, 'invalid csrf token')
+        elif form.get('email') == THROTTLED_USERNAME:
+            self._send(429, 'too many requests', {'Retry-After': '60'})
+        elif form.get('email') == USERNAME and form.get('pass') == PASSWORD:
+            sid = secrets.token_hex(16)
+            self.sessions.add(sid)
+            self._send(302, headers={'Location': '/home', 'Set-Cookie': f'sid={sid}; Path=/; HttpOnly'})
+        else:
+            self._login_page('<div class="error" role="alert">Invalid email or password.</div>')
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20, help='successful logins to time')
+    args = parser.parse_args()
+
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    client = HttpLoginClient()
+
+    cases = {
+        'valid credentials': {'url': f"{base}/login", 'username': USERNAME, 'password': PASSWORD},
+        'wrong password': {'url': f"{base}/login", 'username': USERNAME, 'password': 'nope'},
+        'rate limited': {'url': f"{base}/login", 'username': THROTTLED_USERNAME, 'password': PASSWORD},
+        'javascript page': {'url': f"{base}/spa", 'username': USERNAME, 'password': PASSWORD}
+    }
+    for name, site in cases.items():
+        try:
+            result = client.login(site)
+            outcome = result.outcome
+            print(f"{name:18} {outcome.status:8} {outcome.reason:24} "
+                  f"cookies={[c['name'] for c in result.cookies]} final={result.final_url}")
+        except JavaScriptRequired as e:
+            print(f"{name:18} fallback {e.reason}")
+
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        client.login(cases['valid credentials'])
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"{args.repeat} logins: median {statistics.median(times):.2f} ms, "
+          f"max {max(times):.2f} ms")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
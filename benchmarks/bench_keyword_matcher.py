@@ -0,0 +1,109 @@
+"""מדידת מהירות מזהה מילות המפתח מול הלולאה הישנה על טקסטים ארוכים של תוויות והקשר"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from field_scoring import FieldScore, FieldSnapshot, LoginFieldScorer
+
+# טקסטים ארוכים טיפוסיים של תוויות, placeholder וטקסט סביבתי
+SAMPLE_TEXTS = [
+    'הזן את כתובת הדואר האלקטרוני או את מספר הטלפון הנייד שלך כדי להתחבר לחשבון האישי באתר',
+    'please enter the email address or mobile phone number associated with your customer account '
+    'to continue. if you forgot your password use the reset link below or contact support.',
+    'יש להזין סיסמה בת 8 תווים לפחות הכוללת אותיות ומספרים. לאחר שלוש טעויות יישלח קוד אימות לנייד',
+    'login-form__input login-form__input--username js-user-identifier form-control input-lg',
+    'Welcome back! Sign in with your member ID or username. New here? Create an account in minutes '
+    'and get access to exclusive offers, order history and saved addresses. ' * 3,
+]
+
+def naive_calculate_keyword_score(keyword: str, value: str) -> float:
+    """חישוב הניקוד הקודם, עם המרה לאותיות קטנות בכל השוואה"""
+    score = 0.0
+    if keyword.lower() == value.lower():
+        score += 3.0
+    elif keyword.lower() in value.lower():
+        if value.lower().startswith(keyword.lower()):
+            score += 2.0
+        else:
+            score += 1.0
+        ratio = len(keyword) / len(value)
+        score += ratio * 0.5
+    return score
+
+def naive_keyword_score(scorer: LoginFieldScorer, value_lower: str):
+    """המימוש הקודם: לולאה על כל מילות המפתח עם lower() ותבניות לא מהודרות"""
+    username_score = 0.0
+    password_score = 0.0
+    for lang in ['he', 'en']:
+        for keyword in scorer.USERNAME_KEYWORDS[lang]:
+            if keyword.lower() in value_lower:
+                username_score += naive_calculate_keyword_score(keyword, value_lower)
+        for keyword in scorer.PASSWORD_KEYWORDS[lang]:
+            if keyword.lower() in value_lower:
+                password_score += naive_calculate_keyword_score(keyword, value_lower)
+    for pattern in scorer.USERNAME_KEYWORDS['patterns']:
+        if re.search(pattern, value_lower):
+            username_score += 1
+    for pattern in scorer.PASSWORD_KEYWORDS['patterns']:
+        if re.search(pattern, value_lower):
+            password_score += 1
+    return username_score, password_score
+
+def matcher_keyword_score(scorer: LoginFieldScorer, value_lower: str):
+    """המימוש החדש: מילים שהומרו מראש ותבניות מהודרות עם סינון מוקדם"""
+    matcher = scorer.KEYWORD_MATCHER
+    hits = matcher.find(value_lower)
+    username_score = 0.0
+    password_score = 0.0
+    for keyword in hits['username']:
+        username_score += scorer._calculate_keyword_score(keyword, value_lower)
+    for keyword in hits['password']:
+        password_score += scorer._calculate_keyword_score(keyword, value_lower)
+    username_score += matcher.count_searches(matcher.username_searchers, value_lower)
+    password_score += matcher.count_searches(matcher.password_searchers, value_lower)
+    return username_score, password_score
+
+def check_text_content_scores(scorer: LoginFieldScorer, texts):
+    """וידוא שניקוד ההקשר של המנוע זהה לחישוב הישן"""
+    for text in texts:
+        field_snapshot = FieldSnapshot(0, 'input', {}, True, True,
+                                       {'x': 0, 'y': 0, 'width': 0, 'height': 0})
+        username_score = FieldScore(field_snapshot)
+        password_score = FieldScore(field_snapshot)
+        scorer._analyze_text_content(text, username_score, password_score, weight=1)
+        
+        expected_username = 0.0
+        expected_password = 0.0
+        for lang in ['he', 'en']:
+            expected_username += 2 * sum(kw.lower() in text for kw in scorer.USERNAME_KEYWORDS[lang])
+            expected_password += 2 * sum(kw.lower() in text for kw in scorer.PASSWORD_KEYWORDS[lang])
+        expected_username += sum(bool(re.search(p, text)) for p in scorer.USERNAME_KEYWORDS['patterns'])
+        expected_password += sum(bool(re.search(p, text)) for p in scorer.PASSWORD_KEYWORDS['patterns'])
+        
+        assert username_score.context_score == expected_username, text
+        assert password_score.context_score == expected_password, text
+
+def main():
+    scorer = LoginFieldScorer()
+    texts = [text.lower() for text in SAMPLE_TEXTS]
+    
+    for text in texts:
+        assert naive_keyword_score(scorer, text) == matcher_keyword_score(scorer, text), text
+    check_text_content_scores(scorer, texts)
+    
+    for label, repeat, number in [('label/context', 1, 2000), ('long context', 20, 200)]:
+        sample = [text * repeat for text in texts]
+        naive_time = timeit.timeit(lambda: [naive_keyword_score(scorer, t) for t in sample], number=number)
+        matcher_time = timeit.timeit(lambda: [matcher_keyword_score(scorer, t) for t in sample], number=number)
+        
+        per_call = number * len(sample)
+        print(f"{label}: {len(sample)} texts, average length {sum(map(len, sample)) / len(sample):.0f} chars")
+        print(f"  naive loop:      {naive_time / per_call * 1e6:9.2f} us/text")
+        print(f"  keyword matcher: {matcher_time / per_call * 1e6:9.2f} us/text")
+        print(f"  speedup:         {naive_time / matcher_time:9.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""השוואת הניקוד ההיוריסטי לניקוד הוקטורי על תמונות מצב מתויגות, ואימון משקלים מהאוסף"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import numpy as np
+
+from field_scoring import LoginFieldScorer
+from vector_scoring import (
+    FIELD_TYPES, VectorFieldScorer, fit_weights, labeled_rows, load_labeled_snapshot
+)
+
+
+def load_corpus(directory: str) -> list:
+    """טעינת כל תמונות המצב המתויגות (נשמרות ע"י bench_field_finder.py --save-snapshots)"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        snapshot, labels = load_labeled_snapshot(path)
+        corpus.append((os.path.basename(path), snapshot, labels))
+    return corpus
+
+
+def evaluate(scorer: LoginFieldScorer, corpus: list, repeat: int) -> dict:
+    """זמן ניקוד ודיוק לכל סוג שדה, בניקוד המלא (ללא הזיהוי המהיר)"""
+    latencies = []
+    correct = 0
+    total = 0
+    for _, snapshot, labels in corpus:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = scorer.score_page(snapshot, fast_path=False)
+            times.append((time.perf_counter() - start) * 1000)
+        latencies.append(statistics.median(times))
+
+        chosen = {'username': result.username, 'password': result.password}
+        for field_type in FIELD_TYPES:
+            detected = chosen[field_type].element.index if chosen[field_type] else None
+            correct += detected == labels.get(field_type)
+            total += 1
+
+    return {
+        'accuracy': correct / total if total else None,
+        'latency_ms_median': statistics.median(latencies),
+        'latency_ms_total': sum(latencies)
+    }
+
+
+def fit_corpus(corpus: list, threshold: float) -> VectorFieldScorer:
+    """אימון משקלים על כל האוסף"""
+    extractor = VectorFieldScorer()
+    rows = [labeled_rows(extractor, snapshot, labels) for _, snapshot, labels in corpus]
+    features = np.vstack([f for f, _ in rows])
+    targets = np.vstack([t for _, t in rows])
+    return VectorFieldScorer(fit_weights(features, targets), threshold)
+
+
+def cross_validate(corpus: list, threshold: float) -> float:
+    """דיוק באימון על כל הדפים חוץ מאחד ובדיקה עליו (האוסף קטן - מונע אופטימיות יתר)"""
+    correct = 0
+    total = 0
+    for i in range(len(corpus)):
+        scorer = fit_corpus(corpus[:i] + corpus[i + 1:], threshold)
+        result = evaluate(scorer, [corpus[i]], repeat=1)
+        correct += result['accuracy'] * len(FIELD_TYPES)
+        total += len(FIELD_TYPES)
+    return correct / total if total else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('snapshots', help='directory of labeled snapshots')
+    parser.add_argument('--repeat', type=int, default=20, help='scoring runs per page')
+    parser.add_argument('--fit', help='train weights on the corpus and save them to this file')
+    parser.add_argument('--weights', help='trained weights file to compare')
+    parser.add_argument('--threshold', type=float, default=0.0,
+                        help='candidate threshold (logit) for trained weights')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.snapshots)
+    if not corpus:
+        sys.exit(f"no snapshots in {args.snapshots}")
+
+    scorers = {
+        'heuristic': LoginFieldScorer(),
+        'vector (heuristic weights)': VectorFieldScorer()
+    }
+    if args.fit:
+        trained = fit_corpus(corpus, args.threshold)
+        trained.save(args.fit)
+        scorers['vector (trained)'] = trained
+        print(f"weights saved to {args.fit}, "
+              f"leave-one-out accuracy: {cross_validate(corpus, args.threshold)}")
+    elif args.weights:
+        scorers['vector (trained)'] = VectorFieldScorer.from_file(args.weights)
+
+    print(f"{len(corpus)} pages, {sum(len(s.fields) for _, s, _ in corpus)} fields")
+    print(f"{'scorer':28} {'accuracy':>9} {'median ms':>10} {'total ms':>9}")
+    for name, scorer in scorers.items():
+        result = evaluate(scorer, corpus, args.repeat)
+        print(f"{name:28} {result['accuracy']:9.3f} {result['latency_ms_median']:10.3f} "
+              f"{result['latency_ms_total']:9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""פענוח פרטי התחברות לפי דרישה, עם מטמון קטן ומוגבל בזמן לערכים המפוענחים"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+# השדות שנשמרים מוצפנים ברשומת האתר
+ENCRYPTED_FIELDS = ('username', 'password')
+
+
+class PlaintextCache:
+    """LRU לערכים מפוענחים לפי הטקסט המוצפן; כל ערך נמחק לכל המאוחר ttl שניות אחרי הפענוח"""
+
+    def __init__(self, decrypt: Callable[[str], str], max_entries: int = 16, ttl: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        self.decrypt = decrypt
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.decryptions = 0
+        self._entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> str:
+        """הערך המפוענח - מהמטמון אם עדיין בתוקף, אחרת פענוח והוספה"""
+        if not token:
+            return ''
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(token)
+                return entry[0]
+
+        # הפענוח מחוץ לנעילה - פענוח של אתר אחד לא מעכב שליפה של אחר
+        plaintext = self.decrypt(token)
+        with self._lock:
+            self.decryptions += 1
+            # מטמון כבוי: הערך המפוענח לא נשמר בכלל
+            if self.ttl <= 0:
+                return plaintext
+            self._entries[token] = (plaintext, now + self.ttl)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return plaintext
+
+    def purge_expired(self) -> int:
+        """מחיקת הערכים שפג תוקפם; מחזיר כמה נמחקו"""
+        now = self.clock()
+        with self._lock:
+            expired = [token for token, (_, expires) in self._entries.items() if expires <= now]
+            for token in expired:
+                del self._entries[token]
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def reveal(site_data: Dict, cache: PlaintextCache) -> Dict:
+    """עותק של רשומת האתר עם פרטי ההתחברות המפוענחים (הרשומה עצמה נשארת מוצפנת)"""
+    revealed = dict(site_data)
+    for field_name in ENCRYPTED_FIELDS:
+        revealed[field_name] = cache.get(site_data.get(field_name, ''))
+    return revealed
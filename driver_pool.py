@@ -0,0 +1,513 @@
+"""מאגר דפדפנים חמים: כל התחברות נפתחת בלשונית חדשה של דפדפן קיים במקום הפעלת Chrome חדש.
+המאגר הוא גם רשם הדפדפנים: זיכרון וזמן פעילות לכל דפדפן, מגבלות, סגירת דפדפנים לא פעילים וניקוי ביציאה"""
+import atexit
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+
+from driver_profiler import profile_stage
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def default_chrome_options() -> webdriver.ChromeOptions:
+    """אפשרויות Chrome של מנהל ההתחברויות"""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # ניווט חוזר עם סיום בניית ה-DOM, בלי לחכות לתמונות ולמשאבים - ההמתנה לשדות נעשית בתוך הדף
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def headless_chrome_options() -> webdriver.ChromeOptions:
+    """אפשרויות Chrome לבדיקות רקע - בלי חלון"""
+    options = default_chrome_options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,900")
+    return options
+
+
+def driver_pid(driver) -> Optional[int]:
+    """מזהה התהליך של chromedriver (תהליכי Chrome הם צאצאים שלו)"""
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    """מיפוי תהליך-אב לילדיו מתוך /proc (כש-psutil לא מותקן)"""
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # שם התהליך בסוגריים עלול להכיל רווחים - השדות נספרים אחרי הסוגר האחרון
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+
+def process_tree(pid: int) -> List[int]:
+    """התהליך וכל הצאצאים שלו"""
+    if psutil:
+        try:
+            process = psutil.Process(pid)
+            return [pid] + [child.pid for child in process.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir('/proc'):
+        return [pid]
+    children = _proc_children()
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def process_tree_rss(pid: Optional[int]) -> Optional[int]:
+    """זיכרון פיזי (בתים) של chromedriver וכל תהליכי Chrome שלו; None כשאין דרך למדוד"""
+    if pid is None:
+        return None
+    total = 0
+    if psutil:
+        for child in process_tree(pid):
+            try:
+                total += psutil.Process(child).memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    if not os.path.isdir('/proc'):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    for child in process_tree(pid):
+        try:
+            with open(f'/proc/{child}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+
+def _process_name(pid: int) -> str:
+    if psutil:
+        try:
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return ''
+    try:
+        with open(f'/proc/{pid}/comm') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def process_start_time(pid: int) -> Optional[float]:
+    """זמן ההפעלה של התהליך (שניות מ-epoch), או None אם לא ידוע"""
+    if psutil:
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError, StopIteration):
+        return None
+
+
+def _is_same_driver_process(pid: int, started: Optional[float]) -> bool:
+    """האם המזהה עדיין של ה-chromedriver שהתוכנה הפעילה (ולא תהליך אחר שקיבל מזהה ממוחזר)"""
+    if _process_name(pid).lower() not in ('chromedriver', 'chromedriver.exe'):
+        return False
+    if started is None:
+        return True
+    current = process_start_time(pid)
+    return current is not None and abs(current - started) < 2
+
+
+def kill_orphans(pid_file: str) -> int:
+    """סגירת תהליכי דפדפן שנשארו מהפעלה קודמת שלא הסתיימה כראוי; מחזיר כמה נסגרו"""
+    try:
+        with open(pid_file, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    killed = 0
+    for record in records:
+        # קובץ בפורמט הישן: מזהה בלבד, בלי זמן הפעלה
+        pid, started = (record, None) if isinstance(record, int) else (record.get('pid'), record.get('started'))
+        # אחרי הפעלה מחדש של המחשב המזהה עלול להיות של Chrome של המשתמש - נסגר רק אותו chromedriver
+        if not isinstance(pid, int) or not _is_same_driver_process(pid, started):
+            continue
+        for child in reversed(process_tree(pid)):
+            try:
+                os.kill(child, signal.SIGTERM)
+                killed += 1
+            except OSError:
+                pass
+    return killed
+
+
+@dataclass
+class PooledDriver:
+    """דפדפן במאגר יחד עם נתוני השימוש שלו"""
+    driver: object
+    created: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    busy: bool = False
+    # דפדפן שהוצא משימוש לא מקבל התחברויות חדשות, אבל הלשוניות שבו נשארות פתוחות
+    retired: bool = False
+    pid: Optional[int] = None
+    # זמן ההפעלה של chromedriver - לזיהוי מזהה תהליך ממוחזר בניקוי אחרי קריסה
+    pid_started: Optional[float] = None
+    # פעילות אחרונה: השאלה להתחברות, או שינוי בלשוניות הפתוחות (המשתמש פתח או סגר לשונית)
+    last_activity: float = field(default_factory=time.monotonic)
+    handles: Tuple[str, ...] = ()
+    rss: Optional[int] = None
+
+
+class DriverPool:
+    """מאגר מוגבל של דפדפני Chrome עם בדיקות תקינות, חימום מראש ומחזור"""
+
+    def __init__(self, max_size: int = 2, warm_count: int = 1, max_uses: int = 25,
+                 driver_factory: Optional[Callable[[], object]] = None,
+                 max_browsers: int = 6, max_rss_mb: int = 0, idle_timeout: float = 0,
+                 check_interval: float = 30, pid_file: Optional[str] = None):
+        self.max_size = max_size
+        self.warm_count = warm_count
+        self.max_uses = max_uses
+        self.driver_factory = driver_factory or (lambda: webdriver.Chrome(options=default_chrome_options()))
+        # מגבלות על כל הדפדפנים הפתוחים, כולל אלה שהוצאו משימוש ועדיין מחזיקים לשוניות (0 = ללא מגבלה)
+        self.max_browsers = max_browsers
+        self.max_rss_mb = max_rss_mb
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        # קובץ מזהי התהליכים - לניקוי דפדפנים שנשארו אחרי קריסה
+        self.pid_file = pid_file
+        self.logger = logging.getLogger(__name__)
+        self._entries: List[PooledDriver] = []
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        atexit.register(self.shutdown)
+
+    def warm_up(self):
+        """הפעלת דפדפנים ברקע עד למספר הדפדפנים החמים הרצוי"""
+        with self._condition:
+            missing = self.warm_count - self._idle_count() - self._starting
+            missing = min(missing, self.max_size - self._active_count() - self._starting)
+            self._starting += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._start_driver, daemon=True).start()
+
+    @contextmanager
+    def lease(self, timeout: float = 120, profiler=None):
+        """השאלת דפדפן בלעדית להתחברות אחת, בלשונית חדשה"""
+        # ההמתנה לדפדפן, הפעלתו (אם אין חם) ופתיחת הלשונית נמדדות כשלב אחד
+        with profile_stage(profiler, 'driver_start'):
+            entry = self._acquire(timeout)
+        try:
+            with profile_stage(profiler, 'driver_start'):
+                self._open_tab(entry)
+            yield entry.driver
+        finally:
+            self._release(entry)
+
+    def shutdown(self):
+        """סגירת כל הדפדפנים במאגר"""
+        self._stop_event.set()
+        with self._condition:
+            self._closed = True
+            entries = list(self._entries)
+            self._entries = []
+            self._condition.notify_all()
+        for entry in entries:
+            self._quit(entry)
+        self._write_pid_file()
+
+    def stats(self) -> dict:
+        with self._condition:
+            rss = [e.rss for e in self._entries if e.rss is not None]
+            return {
+                'browsers': len(self._entries),
+                'busy': sum(e.busy for e in self._entries),
+                'retired': sum(e.retired for e in self._entries),
+                'starting': self._starting,
+                'rss_mb': round(sum(rss) / 2 ** 20, 1) if rss else None
+            }
+
+    def browsers(self) -> List[dict]:
+        """פרטי כל דפדפן פתוח (לתצוגה): זיכרון, לשוניות, שימושים וזמן מהפעילות האחרונה"""
+        now = time.monotonic()
+        with self._condition:
+            return [{
+                'pid': e.pid,
+                'uses': e.uses,
+                'busy': e.busy,
+                'retired': e.retired,
+                'tabs': len(e.handles),
+                'rss_mb': round(e.rss / 2 ** 20, 1) if e.rss is not None else None,
+                'idle_seconds': round(now - e.last_activity)
+            } for e in self._entries]
+
+    def start_reaper(self):
+        """הפעלת בדיקה תקופתית ברקע: זיכרון, פעילות, סגירת דפדפנים לא פעילים ואכיפת המגבלות"""
+        if self._reaper and self._reaper.is_alive():
+            return
+        self._stop_event.clear()
+        self._reaper = threading.Thread(target=self._reaper_loop, daemon=True)
+        self._reaper.start()
+
+    def reap(self) -> int:
+        """סבב בדיקה אחד; מחזיר את מספר הדפדפנים שנסגרו"""
+        now = time.monotonic()
+        with self._condition:
+            idle = [e for e in self._entries if not e.busy]
+
+        # בדיקות מול הדפדפן מחוץ לנעילה
+        dead = []
+        for entry in idle:
+            try:
+                handles = tuple(entry.driver.window_handles)
+            except Exception:
+                handles = ()
+            if not handles:
+                dead.append(entry)
+                continue
+            if handles != entry.handles:
+                entry.handles = handles
+                entry.last_activity = now
+            entry.rss = process_tree_rss(entry.pid)
+
+        with self._condition:
+            to_close = [e for e in dead if e in self._entries]
+            candidates = sorted(
+                (e for e in self._entries if not e.busy and e not in to_close),
+                key=lambda e: e.last_activity
+            )
+            if self.idle_timeout:
+                expired = [e for e in candidates if now - e.last_activity >= self.idle_timeout]
+                to_close += expired
+                candidates = [e for e in candidates if e not in expired]
+
+            # מגבלות: קודם נסגרים הדפדפנים שהפעילות האחרונה בהם ישנה ביותר (לעולם לא דפדפן בשימוש)
+            remaining = [e for e in self._entries if e not in to_close]
+            while candidates and self._over_limits(remaining):
+                entry = candidates.pop(0)
+                to_close.append(entry)
+                remaining.remove(entry)
+
+            for entry in to_close:
+                self._entries.remove(entry)
+            if to_close:
+                self._condition.notify_all()
+
+        for entry in to_close:
+            self._quit(entry)
+        if to_close:
+            self.logger.info(f"נסגרו {len(to_close)} דפדפנים (לא פעילים, סגורים או מעבר למגבלה)")
+            self._write_pid_file()
+        return len(to_close)
+
+    def _over_limits(self, entries: List[PooledDriver]) -> bool:
+        if self.max_browsers and len(entries) > self.max_browsers:
+            return True
+        if self.max_rss_mb:
+            rss = sum(e.rss or 0 for e in entries)
+            return rss > self.max_rss_mb * 2 ** 20
+        return False
+
+    def _reaper_loop(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                self.logger.error(f"שגיאה בבדיקת הדפדפנים הפתוחים: {str(e)}")
+
+    def _acquire(self, timeout: float) -> PooledDriver:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise Exception("מאגר הדפדפנים נסגר")
+                entry = next((e for e in self._entries if not e.busy and not e.retired), None)
+                if entry:
+                    entry.busy = True
+                elif self._active_count() + self._starting < self.max_size:
+                    # אין דפדפן פנוי ויש מקום - הפעלה של דפדפן חדש עבור הבקשה הזו
+                    self._starting += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Exception("לא התפנה דפדפן במאגר בזמן")
+                    self._condition.wait(remaining)
+                    continue
+
+            if entry is None:
+                entry = self._create_entry(busy=True)
+                if entry is None:
+                    raise Exception("הפעלת הדפדפן נכשלה")
+
+            # בדיקת תקינות מחוץ לנעילה (המשתמש עלול לסגור את הדפדפן בכל רגע)
+            if self._is_healthy(entry):
+                entry.uses += 1
+                entry.last_activity = time.monotonic()
+                return entry
+            self._discard(entry)
+
+    def _release(self, entry: PooledDriver):
+        try:
+            entry.handles = tuple(entry.driver.window_handles)
+        except Exception:
+            pass
+        finally:
+            # הדפדפן משתחרר גם כשהפקודה נקטעה (למשל בעטיפת ביטול שנשארה) - אחרת המקום במאגר אובד
+            entry.last_activity = time.monotonic()
+            with self._condition:
+                entry.busy = False
+                if entry.uses >= self.max_uses:
+                    # מחזור: הדפדפן נשאר פתוח עם הלשוניות שלו, והתחברויות חדשות יקבלו דפדפן חדש
+                    entry.retired = True
+                    self.logger.info(f"דפדפן הוצא משימוש אחרי {entry.uses} התחברויות")
+                self._condition.notify_all()
+            self._prune_retired()
+            with self._condition:
+                over_limits = self._over_limits(self._entries)
+        if over_limits:
+            # דפדפן שהוצא משימוש הוסיף לשוניות - אכיפת המגבלה מיד ולא רק בסבב הבא
+            threading.Thread(target=self.reap, daemon=True).start()
+        self.warm_up()
+
+    def _open_tab(self, entry: PooledDriver):
+        """מעבר ללשונית חדשה; בשימוש הראשון - הלשונית הריקה שנפתחה עם הדפדפן"""
+        driver = entry.driver
+        handles = driver.window_handles
+        driver.switch_to.window(handles[-1])
+        if entry.uses == 1 and len(handles) == 1 and driver.current_url in ('about:blank', 'data:,'):
+            return
+        driver.switch_to.new_window('tab')
+
+    def _is_healthy(self, entry: PooledDriver) -> bool:
+        try:
+            return bool(entry.driver.window_handles)
+        except Exception:
+            return False
+
+    def _start_driver(self):
+        self._create_entry(busy=False)
+
+    def _create_entry(self, busy: bool) -> Optional[PooledDriver]:
+        """הפעלת דפדפן (מחוץ לנעילה - לוקח שניות) והוספתו למאגר"""
+        start = time.perf_counter()
+        try:
+            driver = self.driver_factory()
+        except Exception as e:
+            self.logger.error(f"שגיאה בהפעלת דפדפן: {str(e)}")
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+            return None
+
+        pid = driver_pid(driver)
+        entry = PooledDriver(
+            driver, busy=busy, pid=pid, pid_started=process_start_time(pid) if pid is not None else None
+        )
+        with self._condition:
+            self._starting -= 1
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._entries.append(entry)
+                self._condition.notify_all()
+        if closed:
+            self._quit(entry)
+            return None
+
+        self.logger.info(f"דפדפן חדש הופעל במאגר תוך {time.perf_counter() - start:.2f} שניות")
+        self._write_pid_file()
+        return entry
+
+    def _discard(self, entry: PooledDriver):
+        """הוצאת דפדפן שאינו תקין מהמאגר וסגירתו"""
+        self.logger.info("דפדפן לא תקין הוצא מהמאגר")
+        with self._condition:
+            if entry in self._entries:
+                self._entries.remove(entry)
+            self._condition.notify_all()
+        self._quit(entry)
+
+    def _prune_retired(self):
+        """הסרת דפדפנים שהוצאו משימוש והמשתמש כבר סגר"""
+        with self._condition:
+            retired = [e for e in self._entries if e.retired and not e.busy]
+        # בדיקת התקינות מחוץ לנעילה - דפדפן תקוע לא מעכב את שאר המאגר
+        closed = [e for e in retired if not self._is_healthy(e)]
+        if not closed:
+            return
+        with self._condition:
+            closed = [e for e in closed if e in self._entries]
+            for entry in closed:
+                self._entries.remove(entry)
+            self._condition.notify_all()
+        for entry in closed:
+            threading.Thread(target=self._quit, args=(entry,), daemon=True).start()
+
+    def _quit(self, entry: PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            self.logger.debug(f"שגיאה בסגירת דפדפן: {str(e)}")
+            # דפדפן שלא נסגר כראוי (למשל chromedriver שנתקע) - סגירת התהליכים ישירות
+            if entry.pid is not None:
+                for pid in reversed(process_tree(entry.pid)):
+                    try:
+                        os.kill(pid, signal.SIGTERM)
+                    except OSError:
+                        pass
+
+    def _write_pid_file(self):
+        """עדכון קובץ מזהי התהליכים של הדפדפנים הפתוחים"""
+        if not self.pid_file:
+            return
+        with self._condition:
+            records = [{'pid': e.pid, 'started': e.pid_started} for e in self._entries if e.pid is not None]
+        try:
+            if records:
+                with open(self.pid_file, 'w', encoding='utf-8') as f:
+                    json.dump(records, f)
+            elif os.path.exists(self.pid_file):
+                os.remove(self.pid_file)
+        except OSError as e:
+            self.logger.debug(f"שגיאה בעדכון קובץ מזהי התהליכים: {str(e)}")
+
+    def _idle_count(self) -> int:
+        return sum(1 for e in self._entries if not e.busy and not e.retired)
+
+    def _active_count(self) -> int:
+        return sum(1 for e in self._entries if not e.retired)
@@ -0,0 +1,141 @@
+"""מדידת פקודות WebDriver וזמני שלבים בתהליך ההתחברות (הפעלה לפי בחירה)"""
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class StageProfile:
+    """נתוני שלב בודד: זמן כולל, מספר כניסות ופקודות מרוחקות"""
+    wall_time: float = 0.0
+    calls: int = 0
+    command_time: float = 0.0
+    commands: Counter = field(default_factory=Counter)
+
+    @property
+    def command_count(self) -> int:
+        return sum(self.commands.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'wall_ms': round(self.wall_time * 1000, 3),
+            'calls': self.calls,
+            'command_count': self.command_count,
+            'command_ms': round(self.command_time * 1000, 3),
+            'commands': dict(self.commands)
+        }
+
+
+class DriverProfiler:
+    """עוטף את driver.execute כדי לספור ולתזמן כל פקודה מרוחקת לפי שלב הזיהוי הנוכחי"""
+
+    # שלבים מוכרים לפי סדר התהליך; פקודות מחוץ לשלב נרשמות תחת 'other'
+    STAGES = [
+        'driver_start', 'http_fetch', 'http_submit', 'cookie_handoff', 'session_restore', 'blocking',
+        'navigation', 'session_check', 'recipe', 'detection', 'cached_lookup', 'readiness', 'collect', 'fast_path', 'prune',
+        'basic_attributes', 'context', 'position', 'relationships', 'features', 'vector_score',
+        'selector_generation', 'resolve', 'fill', 'submit', 'verify', 'session_save'
+    ]
+    OTHER_STAGE = 'other'
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.logger = logging.getLogger(__name__)
+        self.stages: Dict[str, StageProfile] = {}
+        self._stack: List[str] = []
+        self._drivers = []
+        self._started = time.perf_counter()
+
+    def attach(self, driver) -> 'DriverProfiler':
+        """התחלת מדידה על הדרייבר (כל פקודות האלמנטים עוברות דרך driver.execute)"""
+        original_execute = driver.execute
+
+        def profiled_execute(driver_command, params=None):
+            stage = self._stack[-1] if self._stack else self.OTHER_STAGE
+            start = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                profile = self._stage_profile(stage)
+                profile.command_time += time.perf_counter() - start
+                profile.commands[driver_command] += 1
+
+        # עטיפה קודמת (למשל בדיקת ביטול) מוחזרת למקומה בהסרה
+        self._drivers.append((driver, driver.__dict__.get('execute')))
+        driver.execute = profiled_execute
+        return self
+
+    def detach(self):
+        """הסרת העטיפה מכל הדרייברים"""
+        for driver, previous in reversed(self._drivers):
+            if previous is not None:
+                driver.execute = previous
+                continue
+            try:
+                del driver.execute
+            except AttributeError:
+                pass
+        self._drivers = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """סימון שלב - פקודות בתוכו משויכות אליו והזמן שלו נצבר"""
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            profile = self._stage_profile(name)
+            profile.wall_time += time.perf_counter() - start
+            profile.calls += 1
+
+    def _stage_profile(self, name: str) -> StageProfile:
+        if name not in self.stages:
+            self.stages[name] = StageProfile()
+        return self.stages[name]
+
+    def stage_times(self) -> Dict[str, float]:
+        """הזמן הכולל של כל שלב במילישניות (להיסטוריית הזמנים)"""
+        return {name: profile.wall_time * 1000 for name, profile in self.stages.items()}
+
+    @property
+    def total_commands(self) -> int:
+        return sum(profile.command_count for profile in self.stages.values())
+
+    def to_dict(self) -> Dict:
+        """פרופיל ההתחברות כמבנה הניתן לשמירה כ-JSON"""
+        order = self.STAGES + [self.OTHER_STAGE]
+        names = sorted(self.stages, key=lambda n: order.index(n) if n in order else len(order))
+        return {
+            'label': self.label,
+            'elapsed_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'total_commands': self.total_commands,
+            'stages': {name: self.stages[name].to_dict() for name in names}
+        }
+
+    def export_json(self, path: str):
+        """שמירת הפרופיל לקובץ JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    def log_summary(self):
+        """כתיבת סיכום הפרופיל ללוג"""
+        data = self.to_dict()
+        parts = [
+            f"{name}: {stage['wall_ms']:.1f}ms/{stage['command_count']} פקודות"
+            for name, stage in data['stages'].items()
+        ]
+        self.logger.info(
+            f"פרופיל התחברות {self.label}: {data['elapsed_ms']:.1f}ms, "
+            f"{data['total_commands']} פקודות - " + ", ".join(parts)
+        )
+
+
+def profile_stage(profiler: Optional[DriverProfiler], name: str):
+    """שלב מדידה אם הופעלה מדידה, אחרת הקשר ריק"""
+    return profiler.stage(name) if profiler else nullcontext()
@@ -0,0 +1,846 @@
+"""מנוע ניקוד שדות התחברות שעובד על תמונות מצב סריאליות של הדף, ללא תלות בדפדפן"""
+import json
+import math
+import re
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from driver_profiler import profile_stage
+
+# מאפיינים שנאספים לכל שדה בתמונת המצב (בדפדפן ובפענוח HTML)
+SNAPSHOT_ATTRIBUTES = [
+    'name', 'id', 'class', 'aria-label', 'placeholder', 'data-testid',
+    'role', 'autocomplete', 'maxlength', 'aria-describedby'
+]
+
+# סוגי שדות שנאספים גם כשאינם בתוך טופס
+STANDALONE_INPUT_TYPES = ['text', 'email', 'tel', 'password', 'number']
+
+
+@dataclass
+class FieldScore:
+    """מחלקה לחישוב וניהול ציוני התאמה של שדות"""
+    element: 'FieldSnapshot'
+    base_score: float = 0
+    context_score: float = 0
+    position_score: float = 0
+    relation_score: float = 0
+    
+    @property
+    def total_score(self) -> float:
+        return self.base_score + self.context_score + self.position_score + self.relation_score
+
+def _rect_center(rect: Dict[str, float]) -> Tuple[float, float]:
+    """חישוב נקודת המרכז של מלבן"""
+    return rect['x'] + rect['width'] / 2, rect['y'] + rect['height'] / 2
+
+@dataclass
+class FieldSnapshot:
+    """תמונת מצב של שדה קלט בודד כפי שנאסף מהדף"""
+    index: int
+    tag_name: str
+    attributes: Dict[str, str]
+    displayed: bool
+    enabled: bool
+    rect: Dict[str, float]
+    form_index: Optional[int] = None
+    form_input_index: int = -1
+    label_texts: List[str] = field(default_factory=list)
+    described_texts: List[str] = field(default_factory=list)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attributes.get(name)
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return _rect_center(self.rect)
+
+@dataclass
+class FormSnapshot:
+    """תמונת מצב של טופס בדף"""
+    index: int
+    method: str
+    action: str
+    has_submit: bool
+    input_types: List[str]
+    rect: Dict[str, float]
+
+@dataclass
+class TextSnapshot:
+    """אלמנט טקסט גלוי בדף יחד עם המיקום שלו"""
+    text: str
+    rect: Dict[str, float]
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return _rect_center(self.rect)
+
+@dataclass
+class PageSnapshot:
+    """תמונת מצב מלאה של הדף - כל מה שדרוש לניקוד השדות ללא פניות נוספות לדפדפן"""
+    url: str
+    viewport_height: float
+    fields: List[FieldSnapshot]
+    forms: List[FormSnapshot]
+    texts: List[TextSnapshot]
+    # הפניות לאלמנטים החיים לפי אינדקס השדה (לשלבי יצירת המזהים והמילוי) - לא נשמרות בסריאליזציה
+    elements: List[Any] = field(default_factory=list, repr=False, compare=False)
+    _text_indexes: Dict[float, 'TextGridIndex'] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict, elements: Optional[List[Any]] = None) -> 'PageSnapshot':
+        """בניית תמונת מצב מהמבנה שהוחזר מהדפדפן"""
+        return cls(
+            url=data.get('url', ''),
+            viewport_height=data.get('viewport_height') or 0,
+            fields=[FieldSnapshot(**item) for item in data.get('fields', [])],
+            forms=[FormSnapshot(**item) for item in data.get('forms', [])],
+            texts=[TextSnapshot(**item) for item in data.get('texts', [])],
+            elements=list(elements or [])
+        )
+
+    def to_dict(self) -> Dict:
+        """המרת תמונת המצב למבנה הניתן לשמירה כ-JSON (ללא האלמנטים החיים)"""
+        return {
+            'url': self.url,
+            'viewport_height': self.viewport_height,
+            'fields': [asdict(item) for item in self.fields],
+            'forms': [asdict(item) for item in self.forms],
+            'texts': [asdict(item) for item in self.texts]
+        }
+
+    def text_index(self, cell_size: float = 150) -> 'TextGridIndex':
+        """אינדקס מרחבי של הטקסטים בדף - נבנה פעם אחת ונשמר לשאילתות הבאות"""
+        if cell_size not in self._text_indexes:
+            self._text_indexes[cell_size] = TextGridIndex(self.texts, cell_size)
+        return self._text_indexes[cell_size]
+
+    def form_of(self, field_snapshot: FieldSnapshot) -> Optional[FormSnapshot]:
+        """החזרת הטופס שהשדה שייך אליו"""
+        if field_snapshot.form_index is None:
+            return None
+        return self.forms[field_snapshot.form_index]
+
+    def element_of(self, field_snapshot: FieldSnapshot) -> Optional[Any]:
+        """החזרת האלמנט החי שמתאים לשדה"""
+        if field_snapshot.index < len(self.elements):
+            return self.elements[field_snapshot.index]
+        return None
+
+class TextGridIndex:
+    """אינדקס רשת מרחבי למציאת טקסטים לפי מרחק ממרכז נתון"""
+
+    def __init__(self, texts: List[TextSnapshot], cell_size: float = 150):
+        self.texts = texts
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.centers = [text.center for text in texts]
+        
+        for i, (x, y) in enumerate(self.centers):
+            self.cells.setdefault(self._cell_of(x, y), []).append(i)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def query(self, center: Tuple[float, float], max_distance: float) -> List[TextSnapshot]:
+        """החזרת כל הטקסטים שמרכזם במרחק של עד max_distance מהנקודה, בסדר הופעתם בדף"""
+        x, y = center
+        reach = int(math.ceil(max_distance / self.cell_size))
+        cell_x, cell_y = self._cell_of(x, y)
+        
+        matches = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for i in self.cells.get((cell_x + dx, cell_y + dy), ()):
+                    text_x, text_y = self.centers[i]
+                    
+                    # חישוב מרחק אוקלידי
+                    distance = ((text_x - x) ** 2 + (text_y - y) ** 2) ** 0.5
+                    if distance <= max_distance:
+                        matches.append(i)
+        
+        return [self.texts[i] for i in sorted(matches)]
+
+def load_snapshot(path: str) -> PageSnapshot:
+    """טעינת תמונת מצב שמורה מקובץ JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return PageSnapshot.from_dict(json.load(f))
+
+def save_snapshot(snapshot: PageSnapshot, path: str):
+    """שמירת תמונת מצב לקובץ JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot.to_dict(), f, indent=4, ensure_ascii=False)
+
+class KeywordMatcher:
+    """מזהה מילות מפתח ותבניות של משתמש וסיסמה שנבנה פעם אחת לכל מחלקה"""
+
+    LANGUAGES = ['he', 'en']
+    QUANTIFIERS = '*+?{'
+
+    def __init__(self, username_keywords: Dict[str, List[str]],
+                 password_keywords: Dict[str, List[str]]):
+        # מילות המפתח באותיות קטנות, בסדר ההגדרה שלהן
+        self.username_terms = tuple(
+            kw.lower() for lang in self.LANGUAGES for kw in username_keywords[lang]
+        )
+        self.password_terms = tuple(
+            kw.lower() for lang in self.LANGUAGES for kw in password_keywords[lang]
+        )
+        
+        # תבניות מהודרות מראש - התאמה מההתחלה (match) וחיפוש בכל הטקסט (search)
+        self.username_patterns = [re.compile(p) for p in username_keywords['patterns']]
+        self.password_patterns = [re.compile(p) for p in password_keywords['patterns']]
+        self.username_searchers = [self._make_searcher(p) for p in username_keywords['patterns']]
+        self.password_searchers = [self._make_searcher(p) for p in password_keywords['patterns']]
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """מחזיר את מילות המפתח שמופיעות בטקסט (שכבר הומר לאותיות קטנות) לפי סוג השדה"""
+        return {
+            'username': [term for term in self.username_terms if term in text],
+            'password': [term for term in self.password_terms if term in text]
+        }
+
+    def count_matches(self, patterns: List[re.Pattern], text: str) -> int:
+        """ספירת התבניות שמתאימות לתחילת הטקסט (re.match)"""
+        return sum(1 for pattern in patterns if pattern.match(text))
+
+    def count_searches(self, searchers: List, text: str) -> int:
+        """ספירת התבניות שנמצאות במקום כלשהו בטקסט (re.search)"""
+        return sum(1 for searcher in searchers if searcher(text))
+
+    @classmethod
+    def _make_searcher(cls, pattern: str):
+        """בניית פונקציית חיפוש זולה השקולה ל-re.search עבור התבנית"""
+        compiled = re.compile(pattern)
+        
+        # תבנית מעוגנת להתחלה: search שקול ל-match וחוסך ניסיון בכל מיקום בטקסט
+        if pattern.startswith('^'):
+            return compiled.match
+        
+        # תווים שחייבים להופיע בכל התאמה - בדיקה מהירה לפני הרצת הביטוי
+        required = cls._required_literals(pattern)
+        if required:
+            return lambda text: all(char in text for char in required) and compiled.search(text)
+        return compiled.search
+
+    @classmethod
+    def _required_literals(cls, pattern: str) -> List[str]:
+        """איתור תווים מילוליים שאינם אופציונליים בתבנית פשוטה (ללא קבוצות וחלופות)"""
+        literals = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char in '(|':
+                return []
+            if char == '\\':
+                i += 2
+                continue
+            if char == '[':
+                i = pattern.index(']', i + 2) + 1
+                continue
+            if char == '{':
+                i = pattern.index('}', i) + 1
+                continue
+            optional = i + 1 < len(pattern) and pattern[i + 1] in cls.QUANTIFIERS
+            if char not in '.^$' + cls.QUANTIFIERS and not optional:
+                literals.append(char)
+            i += 1
+        return literals
+
+@dataclass
+class FieldCluster:
+    """קבוצת שדות מועמדים - טופס או שדות קרובים ללא טופס"""
+    fields: List[FieldSnapshot]
+    form: Optional[FormSnapshot] = None
+    score: int = 0
+
+@dataclass
+class ScoringResult:
+    """תוצאת ניקוד של דף: דירוג המועמדים וזוג השדות שנבחר"""
+    username_candidates: List[FieldScore]
+    password_candidates: List[FieldScore]
+    username: Optional[FieldScore] = None
+    password: Optional[FieldScore] = None
+    # שכבת הזיהוי שענתה: autocomplete / single_form / full
+    tier: str = 'full'
+
+    @property
+    def found(self) -> bool:
+        return self.username is not None and self.password is not None
+
+class LoginFieldScorer:
+    """מנוע ניקוד טהור שמדרג שדות משתמש וסיסמה מתוך תמונת מצב של הדף"""
+    
+    # מילות מפתח מורחבות לזיהוי שדות משתמש/אימייל
+    USERNAME_KEYWORDS = {
+        'he': [
+            'דואר אלקטרוני', 'אימייל', 'דוא"ל', 'שם משתמש', 'מזהה',
+            'טלפון', 'נייד', 'ת.ז', 'תעודת זהות', 'שם פרטי',
+            'מספר לקוח', 'מספר חבר', 'שם החשבון'
+        ],
+        'en': [
+            'email', 'mail', 'username', 'user', 'login', 'phone',
+            'mobile', 'account', 'id', 'identity', 'member',
+            'customer', 'client', 'access', 'identifier'
+        ],
+        'patterns': [
+            r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',  # תבנית אימייל
+            r'^\d{10}$',  # תבנית טלפון
+            r'^\d{9}$',   # תבנית ת.ז
+            r'^[a-zA-Z0-9_-]{3,20}$'  # תבנית שם משתמש כללית
+        ]
+    }
+    
+    # מילות מפתח מורחבות לזיהוי שדות סיסמה
+    PASSWORD_KEYWORDS = {
+        'he': [
+            'סיסמה', 'סיסמא', 'קוד גישה', 'קוד סודי', 'קוד אימות',
+            'מפתח גישה', 'קוד אבטחה', 'קוד משתמש'
+        ],
+        'en': [
+            'password', 'pass', 'pwd', 'secret', 'security code',
+            'access code', 'pin', 'passcode', 'auth code',
+            'verification code', 'secure key'
+        ],
+        'patterns': [
+            r'^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$',  # סיסמה חזקה
+            r'^\d{4,8}$'  # PIN או קוד גישה מספרי
+        ]
+    }
+
+    # מזהה מילות מפתח ותבניות שנבנה פעם אחת למחלקה
+    KEYWORD_MATCHER = KeywordMatcher(USERNAME_KEYWORDS, PASSWORD_KEYWORDS)
+
+    # שכבות הזיהוי לפי סדר הפעלתן
+    TIER_AUTOCOMPLETE = 'autocomplete'
+    TIER_SINGLE_FORM = 'single_form'
+    TIER_FULL = 'full'
+
+    # סוגי שדות שיכולים לשמש כשדה משתמש בזיהוי המהיר
+    USERNAME_INPUT_TYPES = ['text', 'email', 'tel']
+
+    # סינון מוקדם: מספר הקבוצות המובילות שנשארות לניקוד מלא, ומרחק לקיבוץ שדות ללא טופס
+    MAX_CANDIDATE_CLUSTERS = 2
+    CLUSTER_DISTANCE = 300
+
+    def __init__(self):
+        """אתחול מנוע הניקוד"""
+        self.logger = logging.getLogger(__name__)
+        # מונה תשובות לפי שכבה - למעקב אחר שיעור הפגיעה של הזיהוי המהיר
+        self.tier_counts = Counter()
+
+    def score_page(self, snapshot: PageSnapshot, fast_path: bool = True,
+                   prune: bool = True, profiler=None) -> ScoringResult:
+        """מדרג את שדות הדף - קודם לפי סימנים חד-משמעיים ורק אם צריך בניקוד המלא"""
+        result = None
+        if fast_path:
+            with profile_stage(profiler, 'fast_path'):
+                result = self._detect_fast_path(snapshot)
+        if result is None:
+            candidates = None
+            if prune:
+                with profile_stage(profiler, 'prune'):
+                    candidates = self._select_candidate_fields(snapshot)
+            result = self._score_all_fields(snapshot, profiler, candidates)
+        
+        self.tier_counts[result.tier] += 1
+        self.logger.debug(f"זיהוי השדות הסתיים בשכבה: {result.tier}")
+        return result
+
+    def _detect_fast_path(self, snapshot: PageSnapshot) -> Optional[ScoringResult]:
+        """זיהוי מהיר לפי autocomplete או טופס יחיד עם שדה סיסמה יחיד; None כשאין הכרעה"""
+        usable = [f for f in snapshot.fields if f.displayed and f.enabled]
+        
+        # סימן 1: autocomplete="username" ו-autocomplete="current-password"
+        auto_usernames = [f for f in usable if 'username' in self._autocomplete_tokens(f)]
+        auto_passwords = [f for f in usable if 'current-password' in self._autocomplete_tokens(f)]
+        auto_pair = None
+        if len(auto_usernames) == 1 and len(auto_passwords) == 1:
+            auto_pair = (auto_usernames[0], auto_passwords[0])
+        
+        # סימן 2: שדה סיסמה יחיד בתוך טופס, עם שדה משתמש יחיד לפניו
+        form_pair = None
+        passwords = [f for f in usable if f.get_attribute('type') == 'password']
+        if len(passwords) == 1 and passwords[0].form_index is not None:
+            password_field = passwords[0]
+            usernames = [
+                f for f in usable
+                if f.form_index == password_field.form_index
+                and f.get_attribute('type') in self.USERNAME_INPUT_TYPES
+            ]
+            if len(usernames) == 1 and \
+               0 <= usernames[0].form_input_index < password_field.form_input_index:
+                form_pair = (usernames[0], password_field)
+        
+        # סתירה בין הסימנים - מעבר לניקוד המלא
+        if auto_usernames and form_pair and form_pair[0] not in auto_usernames:
+            return None
+        if auto_passwords and form_pair and form_pair[1] not in auto_passwords:
+            return None
+        
+        if auto_pair:
+            pair, tier = auto_pair, self.TIER_AUTOCOMPLETE
+        elif form_pair:
+            pair, tier = form_pair, self.TIER_SINGLE_FORM
+        else:
+            return None
+        
+        username_field, password_field = pair
+        if username_field is password_field or \
+           not self._validate_field_combination(username_field, password_field):
+            return None
+        
+        username_score = FieldScore(username_field)
+        password_score = FieldScore(password_field)
+        return ScoringResult(
+            username_candidates=[username_score],
+            password_candidates=[password_score],
+            username=username_score,
+            password=password_score,
+            tier=tier
+        )
+
+    def _autocomplete_tokens(self, element: FieldSnapshot) -> List[str]:
+        """פירוק ערך autocomplete לאסימונים"""
+        return (element.get_attribute('autocomplete') or '').lower().split()
+
+    def _select_candidate_fields(self, snapshot: PageSnapshot) -> List[FieldSnapshot]:
+        """מעבר זול: דירוג טפסים וקבוצות שדות ללא טופס, והשארת השדות בקבוצות המובילות בלבד"""
+        usable = [f for f in snapshot.fields if f.displayed and f.enabled]
+        clusters = self._cluster_fields(snapshot, usable)
+        if len(clusters) <= self.MAX_CANDIDATE_CLUSTERS:
+            return usable
+        
+        ranked = sorted(clusters, key=lambda c: c.score, reverse=True)
+        cutoff = ranked[self.MAX_CANDIDATE_CLUSTERS - 1].score
+        kept = {f.index for cluster in ranked if cluster.score >= cutoff for f in cluster.fields}
+        
+        self.logger.debug(
+            f"סינון מוקדם: {len(kept)} מתוך {len(usable)} שדות ב-"
+            f"{sum(c.score >= cutoff for c in ranked)} מתוך {len(clusters)} קבוצות"
+        )
+        return [f for f in usable if f.index in kept]
+
+    def _cluster_fields(self, snapshot: PageSnapshot,
+                        fields: List[FieldSnapshot]) -> List[FieldCluster]:
+        """קיבוץ השדות לפי טופס, ושדות ללא טופס לפי קרבה"""
+        by_form: Dict[int, List[FieldSnapshot]] = {}
+        formless = []
+        for field_snapshot in fields:
+            if field_snapshot.form_index is None:
+                formless.append(field_snapshot)
+            else:
+                by_form.setdefault(field_snapshot.form_index, []).append(field_snapshot)
+        
+        clusters = [
+            FieldCluster(members, snapshot.forms[form_index])
+            for form_index, members in by_form.items()
+        ]
+        clusters.extend(FieldCluster(members) for members in self._group_by_distance(formless))
+        
+        for cluster in clusters:
+            cluster.score = self._cluster_score(cluster)
+        return clusters
+
+    def _group_by_distance(self, fields: List[FieldSnapshot]) -> List[List[FieldSnapshot]]:
+        """איחוד שדות שהמרחק ביניהם עד CLUSTER_DISTANCE לקבוצות"""
+        groups: List[List[FieldSnapshot]] = []
+        for field_snapshot in fields:
+            near = [
+                group for group in groups
+                if any(self._field_distance(field_snapshot, other) <= self.CLUSTER_DISTANCE
+                       for other in group)
+            ]
+            merged = [field_snapshot]
+            for group in near:
+                merged.extend(group)
+                groups.remove(group)
+            groups.append(sorted(merged, key=lambda f: f.index))
+        return groups
+
+    def _field_distance(self, first: FieldSnapshot, second: FieldSnapshot) -> float:
+        """מרחק בין הפינות העליונות של שני שדות (כמו בוידוא שילוב השדות)"""
+        return ((first.rect['x'] - second.rect['x']) ** 2 +
+                (first.rect['y'] - second.rect['y']) ** 2) ** 0.5
+
+    def _cluster_score(self, cluster: FieldCluster) -> int:
+        """ניקוד זול של סבירות ההתחברות בקבוצה"""
+        types = [f.get_attribute('type') for f in cluster.fields]
+        score = 0
+        
+        # שדה סיסמה גלוי הוא הסימן החזק ביותר
+        if 'password' in types:
+            score += 3
+        
+        if cluster.form:
+            score += self._form_signal_score(cluster.form)
+        elif 'password' in types and any(t in self.USERNAME_INPUT_TYPES for t in types):
+            # אותו שילוב שדות שנבדק בטפסים
+            score += 2
+        
+        return score
+
+    def _score_all_fields(self, snapshot: PageSnapshot, profiler=None,
+                          candidates: Optional[List[FieldSnapshot]] = None) -> ScoringResult:
+        """מנקד את שדות תמונת המצב (או רק את המועמדים שנבחרו) ומחזיר את הדירוג והזוג הנבחר"""
+        username_candidates = []
+        password_candidates = []
+        
+        for field_snapshot in (snapshot.fields if candidates is None else candidates):
+            try:
+                if not field_snapshot.displayed or not field_snapshot.enabled:
+                    continue
+                    
+                username_score = FieldScore(field_snapshot)
+                password_score = FieldScore(field_snapshot)
+                
+                # ניתוח מקיף של כל שדה
+                with profile_stage(profiler, 'basic_attributes'):
+                    self._analyze_basic_attributes(field_snapshot, username_score, password_score)
+                with profile_stage(profiler, 'context'):
+                    self._analyze_surrounding_context(field_snapshot, snapshot, username_score, password_score)
+                with profile_stage(profiler, 'position'):
+                    self._analyze_field_position(field_snapshot, snapshot, username_score, password_score)
+                with profile_stage(profiler, 'relationships'):
+                    self._analyze_field_relationships(field_snapshot, snapshot, username_score, password_score)
+                
+                # הוספת המועמדים המתאימים לרשימות
+                if username_score.total_score > 3:  # סף מינימלי
+                    username_candidates.append(username_score)
+                if password_score.total_score > 3:  # סף מינימלי
+                    password_candidates.append(password_score)
+                    
+            except Exception as e:
+                self.logger.debug(f"שגיאה בניתוח שדה: {str(e)}")
+                continue
+        
+        result = ScoringResult(
+            username_candidates=self._rank_candidates(username_candidates),
+            password_candidates=self._rank_candidates(password_candidates),
+            tier=self.TIER_FULL
+        )
+        
+        # בחירת השדות הטובים ביותר ווידוא תקינות השילוב
+        best_username = self._select_best_candidate(result.username_candidates)
+        best_password = self._select_best_candidate(result.password_candidates)
+        if best_username and best_password:
+            if self._validate_field_combination(best_username.element, best_password.element):
+                result.username = best_username
+                result.password = best_password
+        
+        return result
+
+    def _analyze_basic_attributes(self, element: FieldSnapshot, 
+                                username_score: FieldScore, 
+                                password_score: FieldScore):
+        """מנתח את המאפיינים הבסיסיים של השדה"""
+        try:
+            # בדיקת type
+            input_type = element.get_attribute('type')
+            if input_type == 'password':
+                password_score.base_score += 5
+            elif input_type in ['email', 'tel']:
+                username_score.base_score += 3
+            
+            # בדיקת מאפיינים נוספים
+            attributes = ['name', 'id', 'class', 'aria-label', 'placeholder', 
+                        'data-testid', 'role']
+            
+            value_lower = None
+            for attr in attributes:
+                value = element.get_attribute(attr)
+                if not value:
+                    continue
+                
+                value_lower = value.lower()
+                
+                # בדיקה מול מילות מפתח בעברית ואנגלית
+                hits = self.KEYWORD_MATCHER.find(value_lower)
+                for keyword in hits['username']:
+                    username_score.base_score += self._calculate_keyword_score(
+                        keyword, value_lower
+                    )
+                
+                for keyword in hits['password']:
+                    password_score.base_score += self._calculate_keyword_score(
+                        keyword, value_lower
+                    )
+            
+            # שדה בלי אף מאפיין מזהה: בגרסה המקורית הבדיקה נעצרה כאן (value_lower לא הוגדר),
+            # ולכן הוא לא מקבל את תוספות התבניות, autocomplete ו-maxlength - הניקוד נשמר כמו שהיה
+            if value_lower is None:
+                return
+            
+            # בדיקת תבניות (על הערך האחרון שנמצא)
+            matcher = self.KEYWORD_MATCHER
+            username_score.base_score += 2 * matcher.count_matches(matcher.username_patterns, value_lower)
+            password_score.base_score += 2 * matcher.count_matches(matcher.password_patterns, value_lower)
+            
+            # בדיקת autocomplete
+            autocomplete = element.get_attribute('autocomplete')
+            if autocomplete:
+                if any(x in autocomplete.lower() for x in ['username', 'email']):
+                    username_score.base_score += 2
+                elif 'current-password' in autocomplete.lower():
+                    password_score.base_score += 2
+            
+            # בדיקת maxlength
+            maxlength = element.get_attribute('maxlength')
+            if maxlength:
+                try:
+                    maxlen = int(maxlength)
+                    if 20 <= maxlen <= 128:  # טווח טיפוסי לסיסמאות
+                        password_score.base_score += 1
+                    elif 3 <= maxlen <= 50:   # טווח טיפוסי לשמות משתמש
+                        username_score.base_score += 1
+                except ValueError:
+                    pass
+            
+        except Exception as e:
+            self.logger.debug(f"שגיאה בניתוח מאפיינים בסיסיים: {str(e)}")
+    def _analyze_surrounding_context(self, element: FieldSnapshot,
+                                   snapshot: PageSnapshot,
+                                   username_score: FieldScore,
+                                   password_score: FieldScore):
+        """מנתח את ההקשר סביב השדה וטקסטים קשורים"""
+        try:
+            # בדיקת תוויות (labels) מקושרות
+            for label_text in element.label_texts:
+                self._analyze_text_content(
+                    label_text.lower(), 
+                    username_score,
+                    password_score,
+                    weight=3  # משקל גבוה לתוויות מקושרות
+                )
+
+            # בדיקת טקסט בסביבה הקרובה
+            surrounding_elements = self._get_surrounding_elements(element, snapshot, max_distance=150)
+            for elem in surrounding_elements:
+                self._analyze_text_content(
+                    elem.text.lower(),
+                    username_score,
+                    password_score,
+                    weight=1  # משקל נמוך יותר לטקסט סביבתי
+                )
+
+            # בדיקת aria-describedby
+            for desc_text in element.described_texts:
+                self._analyze_text_content(
+                    desc_text.lower(),
+                    username_score,
+                    password_score,
+                    weight=2
+                )
+
+        except Exception as e:
+            self.logger.debug(f"שגיאה בניתוח הקשר: {str(e)}")
+
+    def _analyze_field_position(self, element: FieldSnapshot,
+                              snapshot: PageSnapshot,
+                              username_score: FieldScore,
+                              password_score: FieldScore):
+        """מנתח את מיקום השדה בדף ויחסיו עם שדות אחרים"""
+        try:
+            # בדיקת מיקום אנכי בדף
+            viewport_height = snapshot.viewport_height
+            element_position = element.rect['y']
+            
+            # שדות בחלק העליון של הדף מקבלים ניקוד גבוה יותר
+            if element_position < viewport_height / 3:
+                username_score.position_score += 2
+                password_score.position_score += 2
+            elif element_position < viewport_height / 2:
+                username_score.position_score += 1
+                password_score.position_score += 1
+
+            # בדיקת סדר השדות
+            form = self._find_parent_form(element, snapshot)
+            if form and element.form_input_index >= 0:
+                input_types = form.input_types
+                current_index = element.form_input_index
+                
+                # בדיקת השדה הקודם
+                if current_index > 0:
+                    if input_types[current_index - 1] != 'password':
+                        username_score.position_score += 1
+                
+                # בדיקת השדה הבא
+                if current_index < len(input_types) - 1:
+                    if input_types[current_index + 1] == 'password':
+                        username_score.position_score += 2
+                    elif element.get_attribute('type') == 'password':
+                        password_score.position_score += 2
+
+            # בדיקת נראות
+            if element.displayed:
+                username_score.position_score += 1
+                password_score.position_score += 1
+
+        except Exception as e:
+            self.logger.debug(f"שגיאה בניתוח מיקום: {str(e)}")
+
+    def _analyze_field_relationships(self, element: FieldSnapshot,
+                                   snapshot: PageSnapshot,
+                                   username_score: FieldScore,
+                                   password_score: FieldScore):
+        """מנתח את הקשרים בין השדות ומאפייני הטופס"""
+        try:
+            form = self._find_parent_form(element, snapshot)
+            if form:
+                relation_score = self._form_signal_score(form)
+                username_score.relation_score += relation_score
+                password_score.relation_score += relation_score
+
+        except Exception as e:
+            self.logger.debug(f"שגיאה בניתוח קשרים: {str(e)}")
+    def _form_signal_score(self, form: FormSnapshot) -> int:
+        """ניקוד סימני ההתחברות של טופס: כפתור שליחה, שילוב השדות, method ו-action"""
+        score = 0
+        
+        # בדיקת נוכחות כפתור שליחה
+        if form.has_submit:
+            score += 1
+
+        # בדיקת שדות נוספים בטופס
+        has_text_input = 'text' in form.input_types
+        has_email_input = 'email' in form.input_types
+        has_password = 'password' in form.input_types
+
+        # ניקוד על בסיס שילובי השדות
+        if has_password and (has_text_input or has_email_input):
+            score += 2
+
+        # בדיקת מאפייני הטופס
+        if form.method == 'post':
+            score += 1
+
+        # בדיקת action של הטופס
+        if form.action:
+            login_keywords = ['login', 'signin', 'auth', 'התחבר']
+            if any(keyword in form.action.lower() for keyword in login_keywords):
+                score += 1
+        
+        return score
+
+    def _get_surrounding_elements(self, element: FieldSnapshot, snapshot: PageSnapshot,
+                                max_distance: int = 150) -> List[TextSnapshot]:
+        """מוצא טקסטים בסביבת השדה הנתון"""
+        surrounding = []
+        try:
+            # שאילתה מקומית באינדקס המרחבי שנבנה פעם אחת לכל הדף
+            surrounding = snapshot.text_index(max_distance).query(element.center, max_distance)
+
+        except Exception as e:
+            self.logger.debug(f"שגיאה במציאת אלמנטים סביבתיים: {str(e)}")
+
+        return surrounding
+
+    def _analyze_text_content(self, text: str, 
+                            username_score: FieldScore,
+                            password_score: FieldScore,
+                            weight: float = 1.0):
+        """מנתח תוכן טקסטואלי ומעדכן את הניקוד בהתאם"""
+        if not text:
+            return
+
+        text = text.lower()
+        
+        matcher = self.KEYWORD_MATCHER
+        
+        # בדיקת מילות מפתח בשתי השפות
+        hits = matcher.find(text)
+        username_score.context_score += weight * 2 * len(hits['username'])
+        password_score.context_score += weight * 2 * len(hits['password'])
+
+        # בדיקת תבניות
+        username_score.context_score += weight * matcher.count_searches(matcher.username_searchers, text)
+        password_score.context_score += weight * matcher.count_searches(matcher.password_searchers, text)
+
+    def _rank_candidates(self, candidates: List[FieldScore]) -> List[FieldScore]:
+        """מיון המועמדים לפי הציון הכולל שלהם"""
+        return sorted(
+            candidates,
+            key=lambda x: x.total_score,
+            reverse=True
+        )
+
+    def _select_best_candidate(self, candidates: List[FieldScore]) -> Optional[FieldScore]:
+        """בחירת המועמד הטוב ביותר מתוך רשימת המועמדים"""
+        if not candidates:
+            return None
+        
+        return self._rank_candidates(candidates)[0]
+
+    def _validate_field_combination(self, username_field: FieldSnapshot, 
+                                  password_field: FieldSnapshot) -> bool:
+        """וידוא שהשילוב של שדות ההתחברות הגיוני"""
+        try:
+            # בדיקה שהשדות נמצאים באותו טופס
+            if username_field.form_index is not None and \
+               username_field.form_index == password_field.form_index:
+                return True
+            
+            # אם השדות לא באותו טופס, בדיקת מרחק מקסימלי ביניהם
+            username_rect = username_field.rect
+            password_rect = password_field.rect
+            
+            distance = ((username_rect['x'] - password_rect['x']) ** 2 + 
+                       (username_rect['y'] - password_rect['y']) ** 2) ** 0.5
+            
+            return distance <= 300  # מרחק מקסימלי סביר בפיקסלים
+            
+        except Exception as e:
+            self.logger.debug(f"שגיאה בוידוא שילוב השדות: {str(e)}")
+            return False
+
+    def _find_parent_form(self, element: FieldSnapshot,
+                          snapshot: PageSnapshot) -> Optional[FormSnapshot]:
+        """מציאת טופס ההורה של אלמנט"""
+        return snapshot.form_of(element)
+
+    def _calculate_keyword_score(self, keyword: str, value: str) -> float:
+        """חישוב ניקוד התאמה למילת מפתח"""
+        score = 0.0
+        keyword_lower = keyword.lower()
+        value_lower = value.lower()
+        
+        # התאמה מדויקת
+        if keyword_lower == value_lower:
+            score += 3.0
+        
+        # התאמה חלקית
+        elif keyword_lower in value_lower:
+            # ניקוד גבוה יותר אם מילת המפתח בהתחלה
+            if value_lower.startswith(keyword_lower):
+                score += 2.0
+            else:
+                score += 1.0
+            
+            # ניקוד נוסף בהתאם לאורך היחסי
+            ratio = len(keyword) / len(value)
+            score += ratio * 0.5
+        
+        return score
+
+
+def _score_snapshot_dict(data: Dict) -> ScoringResult:
+    """ניקוד תמונת מצב סריאלית (פונקציה ברמת המודול לשימוש בתהליכי עבודה)"""
+    return LoginFieldScorer().score_page(PageSnapshot.from_dict(data))
+
+def rank_snapshots(snapshots: Iterable[PageSnapshot],
+                   max_workers: Optional[int] = None) -> List[ScoringResult]:
+    """ניקוד מספר תמונות מצב במקביל במאגר תהליכים"""
+    snapshots = list(snapshots)
+    if max_workers == 1 or len(snapshots) < 2:
+        scorer = LoginFieldScorer()
+        return [scorer.score_page(snapshot) for snapshot in snapshots]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_score_snapshot_dict, [s.to_dict() for s in snapshots]))
+
+        
\ No newline at end of file
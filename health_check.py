@@ -0,0 +1,135 @@
+"""בדיקת תקינות תקופתית של פרטי ההתחברות השמורים: תזמון, השהיה אחרי כישלונות ושמירת המצב"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+# מצבי תקינות
+HEALTH_OK = 'ok'            # ההתחברות הצליחה
+HEALTH_BROKEN = 'broken'    # האתר דחה את פרטי ההתחברות
+HEALTH_UNKNOWN = 'unknown'  # הטופס נשלח אך לא ניתן לוודא את התוצאה
+HEALTH_ERROR = 'error'      # הבדיקה עצמה נכשלה (שדות לא נמצאו, שגיאת רשת, ...)
+
+
+@dataclass
+class SiteHealth:
+    """מצב הבדיקה האחרונה של אתר"""
+    status: str = ''
+    reason: str = ''
+    last_checked: float = 0.0
+    # משך ההתחברות בבדיקה האחרונה, בשניות
+    elapsed: float = 0.0
+    # כישלונות רצופים - קובעים את ההשהיה עד לבדיקה הבאה
+    failures: int = 0
+    next_check: float = 0.0
+
+    @property
+    def flagged(self) -> bool:
+        """האם לסמן את האתר ברשימה: פרטים שנדחו, או בדיקה שלא מצליחה כמה פעמים ברצף"""
+        return self.status == HEALTH_BROKEN or (self.status in (HEALTH_ERROR, HEALTH_UNKNOWN) and self.failures >= 2)
+
+
+class HealthScheduler:
+    """מחליט אילו אתרים לבדוק עכשיו ושומר את תוצאות הבדיקות בקובץ JSON"""
+
+    def __init__(self, path: str, interval_hours: float = 24, retry_minutes: float = 60,
+                 max_backoff_hours: float = 7 * 24):
+        self.path = path
+        self.interval = interval_hours * 3600
+        self.retry_delay = retry_minutes * 60
+        self.max_backoff = max_backoff_hours * 3600
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.health: Dict[str, SiteHealth] = self._load()
+
+    def get(self, site_name: str) -> Optional[SiteHealth]:
+        return self.health.get(site_name)
+
+    def due_sites(self, site_names: Iterable[str], limit: int, exclude: Iterable[str] = (),
+                  now: Optional[float] = None) -> List[str]:
+        """האתרים שהגיע זמן בדיקתם, מהממתין הארוך ביותר (אתרים שלא נבדקו מעולם קודם)"""
+        now = now or time.time()
+        exclude = set(exclude)
+        with self._lock:
+            due = [
+                name for name in site_names
+                if name not in exclude and self.health.get(name, SiteHealth()).next_check <= now
+            ]
+            due.sort(key=lambda name: self.health.get(name, SiteHealth()).next_check)
+        return due[:max(limit, 0)]
+
+    def record(self, site_name: str, status: str, reason: str = '', elapsed: float = 0.0,
+               now: Optional[float] = None) -> SiteHealth:
+        """עדכון המצב אחרי בדיקה (או התחברות רגילה) וקביעת מועד הבדיקה הבאה"""
+        now = now or time.time()
+        with self._lock:
+            health = self.health.setdefault(site_name, SiteHealth())
+            health.failures = 0 if status == HEALTH_OK else health.failures + 1
+            health.status, health.reason = status, reason
+            health.last_checked, health.elapsed = now, round(elapsed, 3)
+            health.next_check = now + self._delay(status, health.failures)
+        self._save()
+        return health
+
+    def _delay(self, status: str, failures: int) -> float:
+        if status == HEALTH_OK:
+            return self.interval
+        # פרטים שנדחו: לא לנסות שוב בקצב רגיל - ניסיונות חוזרים עלולים לנעול את החשבון
+        base = self.interval if status == HEALTH_BROKEN else self.retry_delay
+        return min(base * 2 ** (failures - 1), self.max_backoff)
+
+    def check_now(self, site_names: Iterable[str]):
+        """הקדמת הבדיקה של האתרים לסבב הבא"""
+        with self._lock:
+            for name in site_names:
+                self.health.setdefault(name, SiteHealth()).next_check = 0.0
+        self._save()
+
+    def forget(self, site_name: str):
+        with self._lock:
+            self.health.pop(site_name, None)
+        self._save()
+
+    def _load(self) -> Dict[str, SiteHealth]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {name: SiteHealth(**data) for name, data in json.load(f).items()}
+        except Exception as e:
+            self.logger.error(f"שגיאה בטעינת מצב בדיקות התקינות: {str(e)}")
+            return {}
+
+    def _save(self):
+        with self._lock:
+            data = {name: asdict(health) for name, health in self.health.items()}
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+            except OSError as e:
+                self.logger.error(f"שגיאה בשמירת מצב בדיקות התקינות: {str(e)}")
+
+
+def describe_health(health: Optional[SiteHealth]) -> str:
+    """תיאור קצר של הבדיקה האחרונה לתצוגה"""
+    if not health or not health.status:
+        return "לא נבדק עדיין"
+    labels = {
+        HEALTH_OK: "פרטי ההתחברות תקינים",
+        HEALTH_BROKEN: "פרטי ההתחברות נדחו",
+        HEALTH_UNKNOWN: "לא ניתן לוודא את ההתחברות",
+        HEALTH_ERROR: "הבדיקה נכשלה"
+    }
+    text = f"{labels.get(health.status, health.status)}"
+    if health.reason:
+        text += f" ({health.reason})"
+    checked = time.strftime('%d/%m/%Y %H:%M', time.localtime(health.last_checked))
+    text += f"\nנבדק: {checked}, {health.elapsed:.1f} שניות"
+    if health.failures:
+        text += f", {health.failures} כישלונות ברצף"
+    if health.next_check:
+        text += f"\nהבדיקה הבאה: {time.strftime('%d/%m/%Y %H:%M', time.localtime(health.next_check))}"
+    return text
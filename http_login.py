@@ -0,0 +1,472 @@
+"""התחברות ללא דפדפן לאתרים עם טופס HTML פשוט: הורדת הדף, זיהוי השדות בניקוד הרגיל ושליחה ב-HTTP"""
+import logging
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from driver_profiler import profile_stage
+from field_scoring import (
+    SNAPSHOT_ATTRIBUTES, STANDALONE_INPUT_TYPES, LoginFieldScorer, PageSnapshot, ScoringResult
+)
+from login_verification import (
+    OUTCOME_FAILED, OUTCOME_SUCCESS, OUTCOME_UNKNOWN, LoginOutcome, LoginVerifier
+)
+
+# פריסה מדומה: אין מנוע פריסה, אז כל אלמנט בשורה משלו לפי סדר המסמך
+ROW_HEIGHT = 40
+FIELD_WIDTH = 300
+FIELD_HEIGHT = 30
+VIEWPORT_HEIGHT = 800
+
+# תגיות שהטקסט שבהן לא מוצג בדף
+HIDDEN_TEXT_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'title'}
+
+# אלמנטים בלי תגית סגירה
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# אזורי הודעת שגיאה - אותם מזהים שהבדיקה בדפדפן מחפשת (PAGE_STATE_SCRIPT)
+BANNER_CLASS_WORDS = ('error', 'alert', 'danger', 'invalid')
+
+# סוגי כפתורים ושדות שלא נשלחים עם הטופס (מלבד כפתור השליחה שנלחץ)
+NON_VALUE_INPUT_TYPES = {'submit', 'button', 'image', 'reset', 'file'}
+
+
+class JavaScriptRequired(Exception):
+    """הטופס לא ניתן לשליחה ב-HTTP בלבד - יש לעבור לדפדפן"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"נדרש JavaScript ({reason})")
+        self.reason = reason
+
+
+@dataclass
+class ParsedForm:
+    """טופס מתוך ה-HTML עם כל הפקדים שלו לפי הסדר (לבניית הבקשה)"""
+    index: int
+    method: str
+    action: str
+    attributes: Dict[str, str]
+    controls: List[Dict] = field(default_factory=list)
+    first_row: int = 0
+    last_row: int = 0
+
+
+@dataclass
+class HttpLoginResult:
+    """תוצאת התחברות ב-HTTP"""
+    outcome: LoginOutcome
+    final_url: str
+    # העוגיות בפורמט של Network.setCookies - להעברה לדפדפן או לשמירה
+    cookies: List[Dict] = field(default_factory=list)
+    fetch_seconds: float = 0.0
+    submit_seconds: float = 0.0
+
+
+def _is_hidden(attrs: Dict[str, str]) -> bool:
+    style = (attrs.get('style') or '').replace(' ', '').lower()
+    return 'hidden' in attrs or 'display:none' in style or 'visibility:hidden' in style
+
+
+def _is_banner(attrs: Dict[str, str]) -> bool:
+    """אזור התראה: role=alert, aria-live, או קלאס/מזהה של שגיאה"""
+    if (attrs.get('role') or '').lower() == 'alert':
+        return True
+    if (attrs.get('aria-live') or '').lower() in ('assertive', 'polite'):
+        return True
+    classes = (attrs.get('class') or '').lower()
+    return any(word in classes for word in BANNER_CLASS_WORDS) or 'error' in (attrs.get('id') or '').lower()
+
+
+class LoginPageParser(HTMLParser):
+    """מפרק HTML לתמונת מצב של הדף - אותו מבנה שהדפדפן מחזיר, עם מיקומים לפי סדר המסמך"""
+
+    def __init__(self, url: str):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.forms: List[ParsedForm] = []
+        self.fields: List[Dict] = []
+        self.texts: List[Tuple[str, int]] = []
+        self.noscript_texts: List[str] = []
+        # הטקסט של כל אזור התראה גלוי (כמו innerText בדפדפן)
+        self.banner_texts: List[str] = []
+        self._open: List[Dict] = []
+        self._row = 0
+        self._form: Optional[ParsedForm] = None
+        self._form_inputs: Dict[int, int] = {}
+        self._skip: List[str] = []
+        self._labels: List[Dict] = []
+        self._label: Optional[Dict] = None
+        self._select: Optional[Dict] = None
+        self._textarea: Optional[Dict] = None
+
+    def handle_starttag(self, tag: str, attrs_list):
+        attrs = {name: value if value is not None else '' for name, value in attrs_list}
+
+        if tag in HIDDEN_TEXT_TAGS:
+            self._skip.append(tag)
+            return
+        if self._skip:
+            return
+
+        if tag not in VOID_TAGS:
+            hidden = _is_hidden(attrs) or bool(self._open and self._open[-1]['hidden'])
+            self._open.append({
+                'tag': tag, 'hidden': hidden, 'banner': [] if not hidden and _is_banner(attrs) else None
+            })
+
+        if tag == 'form':
+            self._form = ParsedForm(
+                index=len(self.forms),
+                method=(attrs.get('method') or 'get').lower(),
+                action=urljoin(self.url, attrs.get('action') or ''),
+                attributes=attrs,
+                first_row=self._row
+            )
+            self.forms.append(self._form)
+            self._form_inputs[self._form.index] = 0
+
+        elif tag == 'label':
+            self._label = {'for': attrs.get('for'), 'text': [], 'fields': []}
+            self._labels.append(self._label)
+
+        elif tag == 'input':
+            self._add_input(attrs)
+
+        elif tag == 'button' and self._form:
+            self._form.controls.append({
+                'tag': 'button', 'type': (attrs.get('type') or 'submit').lower(),
+                'name': attrs.get('name'), 'value': attrs.get('value', ''),
+                'disabled': 'disabled' in attrs
+            })
+
+        elif tag == 'select' and self._form:
+            self._select = {
+                'tag': 'select', 'type': 'select', 'name': attrs.get('name'), 'value': None,
+                'disabled': 'disabled' in attrs
+            }
+            self._form.controls.append(self._select)
+
+        elif tag == 'option' and self._select is not None:
+            # ערך ברירת המחדל: האפשרות המסומנת, אחרת הראשונה
+            if self._select['value'] is None or 'selected' in attrs:
+                self._select['value'] = attrs.get('value', '')
+
+        elif tag == 'textarea' and self._form:
+            self._textarea = {
+                'tag': 'textarea', 'type': 'textarea', 'name': attrs.get('name'), 'value': '',
+                'disabled': 'disabled' in attrs
+            }
+            self._form.controls.append(self._textarea)
+
+    def handle_endtag(self, tag: str):
+        if self._skip:
+            if tag == self._skip[-1]:
+                self._skip.pop()
+            return
+        if any(element['tag'] == tag for element in self._open):
+            # HTML לא תקין: סגירה של אלמנט פנימי שלא נסגר נעשית יחד עם האלמנט שמעליו
+            while True:
+                element = self._open.pop()
+                self._close_banner(element)
+                if element['tag'] == tag:
+                    break
+        if tag == 'form' and self._form:
+            self._form.last_row = self._row
+            self._form = None
+        elif tag == 'label':
+            self._label = None
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'textarea':
+            self._textarea = None
+
+    def handle_data(self, data: str):
+        text = data.strip()
+        if not text:
+            return
+        if self._skip:
+            if self._skip[-1] == 'noscript':
+                self.noscript_texts.append(text)
+            return
+        if self._textarea is not None:
+            self._textarea['value'] += data
+            return
+        if self._label is not None:
+            self._label['text'].append(text)
+        for element in self._open:
+            if element['banner'] is not None:
+                element['banner'].append(text)
+        self.texts.append((text, self._row))
+        self._row += 1
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._close_banner(self._open.pop())
+
+    def _close_banner(self, element: Dict):
+        if element['banner']:
+            self.banner_texts.append(' '.join(element['banner']))
+
+    def _add_input(self, attrs: Dict[str, str]):
+        input_type = (attrs.get('type') or 'text').lower()
+        form = self._form
+        control = {
+            'tag': 'input', 'type': input_type, 'name': attrs.get('name'),
+            'value': attrs.get('value', 'on' if input_type in ('checkbox', 'radio') else ''),
+            'checked': 'checked' in attrs, 'disabled': 'disabled' in attrs
+        }
+
+        form_input_index = -1
+        if form:
+            form.controls.append(control)
+            form_input_index = self._form_inputs[form.index]
+            self._form_inputs[form.index] += 1
+        elif input_type not in STANDALONE_INPUT_TYPES:
+            return
+
+        attributes = {name: attrs[name] for name in SNAPSHOT_ATTRIBUTES if name in attrs}
+        attributes['type'] = input_type
+        index = len(self.fields)
+        control['field_index'] = index
+        self.fields.append({
+            'index': index,
+            'tag_name': 'input',
+            'attributes': attributes,
+            'displayed': input_type != 'hidden' and not _is_hidden(attrs),
+            'enabled': 'disabled' not in attrs,
+            'rect': self._rect(self._row),
+            'form_index': form.index if form else None,
+            'form_input_index': form_input_index,
+            'label_texts': [],
+            'described_texts': [],
+            '_id': attrs.get('id')
+        })
+        if self._label is not None:
+            self._label['fields'].append(index)
+        self._row += 1
+
+    def _rect(self, row: int, width: float = FIELD_WIDTH) -> Dict[str, float]:
+        return {'x': 0, 'y': row * ROW_HEIGHT, 'width': width, 'height': FIELD_HEIGHT}
+
+    def snapshot(self) -> PageSnapshot:
+        """תמונת המצב לניקוד - כמו זו שנאספת בדפדפן"""
+        by_id = {f['_id']: f for f in self.fields if f['_id']}
+        for label in self._labels:
+            text = ' '.join(label['text'])
+            if not text:
+                continue
+            targets = [self.fields[i] for i in label['fields']]
+            if label['for'] in by_id:
+                targets.append(by_id[label['for']])
+            for target in targets:
+                target['label_texts'].append(text)
+
+        fields = [{k: v for k, v in f.items() if k != '_id'} for f in self.fields]
+        forms = []
+        for form in self.forms:
+            rows = max(form.last_row - form.first_row, 1)
+            rect = {'x': 0, 'y': form.first_row * ROW_HEIGHT, 'width': FIELD_WIDTH,
+                    'height': rows * ROW_HEIGHT}
+            forms.append({
+                'index': form.index,
+                'method': form.method,
+                'action': form.action,
+                'has_submit': any(c['type'] in ('submit', 'image') for c in form.controls),
+                'input_types': [c['type'] for c in form.controls if c['tag'] == 'input'],
+                'rect': rect
+            })
+        texts = [{'text': text, 'rect': self._rect(row, width=len(text) * 8)} for text, row in self.texts]
+
+        return PageSnapshot.from_dict({
+            'url': self.url,
+            'viewport_height': VIEWPORT_HEIGHT,
+            'fields': fields,
+            'forms': forms,
+            'texts': texts
+        })
+
+
+def parse_login_page(html: str, url: str) -> LoginPageParser:
+    parser = LoginPageParser(url)
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def build_form_data(form: ParsedForm, values: Dict[int, str]) -> List[Tuple[str, str]]:
+    """נתוני הטופס כפי שהדפדפן היה שולח: שדות נסתרים (כמו אסימון CSRF), ערכי ברירת מחדל והערכים שמולאו"""
+    data = []
+    submitter_added = False
+    for control in form.controls:
+        name = control.get('name')
+        if not name or control.get('disabled'):
+            continue
+        control_type = control['type']
+        if control_type in ('checkbox', 'radio'):
+            if control['checked']:
+                data.append((name, control['value']))
+        elif control_type in ('submit', 'image') or (control['tag'] == 'button' and control_type == 'submit'):
+            # רק כפתור השליחה הראשון נחשב לכפתור שנלחץ
+            if not submitter_added:
+                data.append((name, control['value']))
+                submitter_added = True
+        elif control_type in NON_VALUE_INPUT_TYPES or control['tag'] == 'button':
+            continue
+        else:
+            value = values.get(control.get('field_index'), control.get('value') or '')
+            data.append((name, value))
+    return data
+
+
+def javascript_reason(parser: LoginPageParser, result: ScoringResult) -> Optional[str]:
+    """הסיבה שבגללה הטופס דורש דפדפן, או None אם אפשר לשלוח אותו ב-HTTP"""
+    if not any(f['attributes']['type'] == 'password' for f in parser.fields):
+        # דף שהטופס שלו נבנה ב-JavaScript
+        return 'no_password_field'
+    if not result.found:
+        return 'fields_not_found'
+    if any('javascript' in text.lower() for text in parser.noscript_texts):
+        # הדף מודיע שבלי JavaScript הוא לא עובד ("enable JavaScript") - כנראה גם השליחה
+        return 'noscript_required'
+
+    username, password = result.username.element, result.password.element
+    if password.form_index is None or username.form_index != password.form_index:
+        return 'no_form'
+    form = parser.forms[password.form_index]
+    if form.method != 'post':
+        # טופס בלי method (בדרך כלל נשלח ב-JavaScript) או GET - הסיסמה הייתה נשלחת בכתובת
+        return 'get_form'
+    if form.action.lower().startswith('javascript:'):
+        return 'javascript_action'
+    if form.attributes.get('onsubmit') is not None:
+        # טיפול בשליחה בתוך הדף (למשל הצפנת הסיסמה לפני השליחה)
+        return 'form_onsubmit'
+    if not username.get_attribute('name') or not password.get_attribute('name'):
+        return 'unnamed_field'
+    return None
+
+
+def export_cookies(jar) -> List[Dict]:
+    """המרת העוגיות של requests לפורמט של Network.setCookies"""
+    cookies = []
+    for cookie in jar:
+        cookies.append({
+            'name': cookie.name,
+            'value': cookie.value or '',
+            'domain': cookie.domain,
+            'path': cookie.path or '/',
+            'secure': bool(cookie.secure),
+            'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+            'expires': cookie.expires if cookie.expires else -1
+        })
+    return cookies
+
+
+class HttpLoginClient:
+    """התחברות ב-HTTP עם מאגר חיבורים משותף; כל התחברות מקבלת סשן ועוגיות משלה"""
+
+    USER_AGENT = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    )
+
+    def __init__(self, scorer: Optional[LoginFieldScorer] = None, timeout: float = 15,
+                 pool_size: int = 10):
+        self.scorer = scorer or LoginFieldScorer()
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        # מתאם אחד לכל הסשנים - חיבורי keep-alive נשמרים בין התחברויות לאותו שרת
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        session.headers['User-Agent'] = self.USER_AGENT
+        return session
+
+    def close(self):
+        self.adapter.close()
+
+    def login(self, site_data: Dict, scorer: Optional[LoginFieldScorer] = None, profiler=None,
+              checkpoint: Optional[Callable[[str], None]] = None) -> HttpLoginResult:
+        """הורדת דף ההתחברות, זיהוי השדות, שליחת הטופס ובדיקת התוצאה; JavaScriptRequired כשצריך דפדפן"""
+        scorer = scorer or self.scorer
+        session = self.new_session()
+        try:
+            if checkpoint:
+                checkpoint("טוען את דף ההתחברות ב-HTTP...")
+            start = time.perf_counter()
+            with profile_stage(profiler, 'http_fetch'):
+                response = session.get(site_data['url'], timeout=self.timeout)
+                response.raise_for_status()
+                page = parse_login_page(response.text, response.url)
+                result = scorer.score_page(page.snapshot(), profiler=profiler)
+            fetch_seconds = time.perf_counter() - start
+
+            reason = javascript_reason(page, result)
+            if reason:
+                raise JavaScriptRequired(reason)
+
+            form = page.forms[result.password.element.form_index]
+            data = build_form_data(form, {
+                result.username.element.index: site_data['username'],
+                result.password.element.index: site_data['password']
+            })
+
+            if checkpoint:
+                checkpoint("שולח את טופס ההתחברות ב-HTTP...")
+            cookies_before = {cookie.name for cookie in session.cookies}
+            start = time.perf_counter()
+            with profile_stage(profiler, 'http_submit'):
+                # רק טופס POST מגיע לכאן (javascript_reason) - הפרטים לא נשלחים אף פעם בכתובת
+                response = session.post(form.action, data=data, timeout=self.timeout,
+                                        headers={'Referer': response.url})
+            submit_seconds = time.perf_counter() - start
+
+            new_cookies = [c.name for c in session.cookies if c.name not in cookies_before]
+            outcome = self._classify(response, form.action, new_cookies, submit_seconds)
+            self.logger.info(
+                f"התחברות HTTP לאתר {site_data.get('site_name', '')}: {outcome.status} "
+                f"({outcome.reason}), הורדה {fetch_seconds:.2f} שניות, שליחה {submit_seconds:.2f} שניות"
+            )
+            return HttpLoginResult(
+                outcome, response.url, export_cookies(session.cookies), fetch_seconds, submit_seconds
+            )
+        finally:
+            session.close()
+
+    def _classify(self, response, form_url: str, new_cookies: List[str],
+                  elapsed: float) -> LoginOutcome:
+        """אותם סימנים כמו בבדיקה בדפדפן: הודעת שגיאה, היעלמות שדה הסיסמה, מעבר כתובת ועוגיות"""
+        url = response.url
+        if response.status_code == 401:
+            return LoginOutcome(OUTCOME_FAILED, 'http_401', elapsed, url)
+        if response.status_code >= 400:
+            # CSRF, חומת אש, הגבלת קצב או שגיאת שרת - לא מעיד על פרטים שגויים, ההכרעה נשארת לדפדפן
+            return LoginOutcome(OUTCOME_UNKNOWN, f'http_{response.status_code}', elapsed, url)
+
+        page = parse_login_page(response.text, url)
+        password_visible = any(
+            f['attributes']['type'] == 'password' and f['displayed'] for f in page.fields
+        )
+        if password_visible:
+            # רק אזורי התראה גלויים - טקסט עזרה או תבנית מוסתרת עם "נסה שוב" לא מעידים על כישלון
+            for text in page.banner_texts:
+                lower = text.lower()
+                if len(text) <= 300 and any(phrase in lower for phrase in LoginVerifier.ERROR_PHRASES):
+                    return LoginOutcome(OUTCOME_FAILED, 'error_banner', elapsed, url, text)
+            if new_cookies:
+                return LoginOutcome(OUTCOME_UNKNOWN, 'new_cookies', elapsed, url)
+            # בלי הודעת שגיאה הטופס עלול לדרוש JavaScript - ההכרעה נשארת לדפדפן
+            return LoginOutcome(OUTCOME_UNKNOWN, 'password_field_still_visible', elapsed, url)
+
+        if url != form_url:
+            return LoginOutcome(OUTCOME_SUCCESS, 'url_changed', elapsed, url)
+        return LoginOutcome(OUTCOME_SUCCESS, 'password_field_gone', elapsed, url)
@@ -0,0 +1,193 @@
+"""מתכוני התחברות הצהרתיים: רשימת צעדים עם המתנות מבוססות אירועים במקום השהיות קבועות"""
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from driver_profiler import profile_stage
+
+# סוגי הצעדים
+STEP_WAIT_FOR = 'wait_for'            # המתנה לאלמנט גלוי
+STEP_FILL = 'fill'                    # מילוי שדה בערך (תומך ב-{username} / {password})
+STEP_CLICK = 'click'                  # לחיצה על אלמנט כשהוא לחיץ
+STEP_WAIT_NAVIGATION = 'wait_navigation'  # המתנה למעבר לכתובת אחרת מאז הלחיצה האחרונה
+STEP_WAIT_GONE = 'wait_gone'          # המתנה להיעלמות אלמנט
+STEP_WAIT_CONDITION = 'wait_condition'  # המתנה לביטוי JavaScript שמחזיר ערך אמת
+
+# האלמנט הגלוי הראשון שמתאים למזהה, בקריאה אחת לדפדפן
+VISIBLE_ELEMENT_SCRIPT = r"""
+const selector = arguments[0];
+const enabled = arguments[1];
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+return Array.from(document.querySelectorAll(selector))
+    .find((el) => isVisible(el) && (!enabled || !el.disabled)) || null;
+"""
+
+STEP_TYPES = [
+    STEP_WAIT_FOR, STEP_FILL, STEP_CLICK, STEP_WAIT_NAVIGATION, STEP_WAIT_GONE, STEP_WAIT_CONDITION
+]
+
+
+@dataclass
+class RecipeStep:
+    """צעד בודד במתכון"""
+    action: str
+    selector: str = ''
+    value: str = ''
+    timeout: float = 10
+    # צעד אופציונלי לא מכשיל את המתכון אם לא התקיים בזמן (למשל מסך "להישאר מחובר?")
+    optional: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RecipeStep':
+        step = cls(**data)
+        if step.action not in STEP_TYPES:
+            raise ValueError(f"סוג צעד לא מוכר: {step.action}")
+        return step
+
+
+@dataclass
+class LoginRecipe:
+    """מתכון התחברות: הדומיינים שהוא חל עליהם ורשימת הצעדים"""
+    name: str
+    domains: List[str]
+    steps: List[RecipeStep] = field(default_factory=list)
+
+    def matches(self, url: str) -> bool:
+        host = (urlparse(url).hostname or '').lower()
+        return any(host == domain or host.endswith('.' + domain) for domain in self.domains)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LoginRecipe':
+        return cls(
+            name=data.get('name', ''),
+            domains=data.get('domains', []),
+            steps=[RecipeStep.from_dict(step) for step in data.get('steps', [])]
+        )
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# מתכונים מובנים לספקים נפוצים
+BUILTIN_RECIPES = [
+    LoginRecipe('google', ['google.com', 'gmail.com'], [
+        RecipeStep(STEP_WAIT_FOR, 'input[type="email"]', timeout=15),
+        RecipeStep(STEP_FILL, 'input[type="email"]', '{username}'),
+        RecipeStep(STEP_CLICK, '#identifierNext button, div#identifierNext button'),
+        RecipeStep(STEP_WAIT_FOR, 'input[type="password"]', timeout=15),
+        RecipeStep(STEP_FILL, 'input[type="password"]', '{password}'),
+        RecipeStep(STEP_CLICK, '#passwordNext button, div#passwordNext button'),
+        RecipeStep(STEP_WAIT_NAVIGATION, timeout=15)
+    ]),
+    LoginRecipe('microsoft', ['login.live.com', 'login.microsoftonline.com'], [
+        RecipeStep(STEP_WAIT_FOR, 'input[name="loginfmt"]', timeout=15),
+        RecipeStep(STEP_FILL, 'input[name="loginfmt"]', '{username}'),
+        RecipeStep(STEP_CLICK, '#idSIButton9'),
+        RecipeStep(STEP_WAIT_FOR, 'input[name="passwd"]', timeout=15),
+        RecipeStep(STEP_FILL, 'input[name="passwd"]', '{password}'),
+        RecipeStep(STEP_CLICK, '#idSIButton9'),
+        RecipeStep(STEP_WAIT_GONE, 'input[name="passwd"]', timeout=15),
+        # מסך "להישאר מחובר?" - לא תמיד מופיע
+        RecipeStep(STEP_CLICK, '#idSIButton9, #acceptButton', timeout=5, optional=True)
+    ])
+]
+
+
+def find_recipe(site_data: Dict) -> Optional[LoginRecipe]:
+    """המתכון של האתר: מתכון שהוגדר ברשומת האתר, אחרת מתכון מובנה לפי הדומיין"""
+    custom = site_data.get('recipe')
+    if custom:
+        if isinstance(custom, list):
+            custom = {'name': site_data.get('site_name', ''), 'steps': custom}
+        return LoginRecipe.from_dict(custom)
+
+    # כתובת הגישה המוכרת של Gmail מפנה לדף ההתחברות של Google
+    for recipe in BUILTIN_RECIPES:
+        if recipe.matches(site_data.get('url', '')):
+            return recipe
+    return None
+
+
+class RecipeRunner:
+    """מריץ מתכון על דרייבר - כל צעד ממתין לאירוע שלו עם מגבלת זמן משלו"""
+
+    POLL_FREQUENCY = 0.1
+
+    def __init__(self, driver, profiler=None):
+        self.driver = driver
+        self.profiler = profiler
+        self.logger = logging.getLogger(__name__)
+        self._url_before_click = None
+        self.step_times: List[float] = []
+
+    def run(self, recipe: LoginRecipe, values: Dict[str, str]):
+        """הרצת כל צעדי המתכון לפי הסדר"""
+        self._url_before_click = self.driver.current_url
+        self.step_times = []
+
+        with profile_stage(self.profiler, 'recipe'):
+            for number, step in enumerate(recipe.steps, 1):
+                start = time.perf_counter()
+                try:
+                    self._run_step(step, values)
+                except TimeoutException:
+                    if not step.optional:
+                        raise Exception(
+                            f"מתכון {recipe.name}: צעד {number} ({step.action} {step.selector}) "
+                            f"לא הושלם תוך {step.timeout} שניות"
+                        )
+                    self.logger.debug(f"מתכון {recipe.name}: צעד אופציונלי {number} דולג")
+                finally:
+                    self.step_times.append(time.perf_counter() - start)
+
+        self.logger.info(
+            f"מתכון {recipe.name} הושלם ב-{sum(self.step_times):.2f} שניות: " +
+            ", ".join(f"{t:.2f}" for t in self.step_times)
+        )
+
+    def _run_step(self, step: RecipeStep, values: Dict[str, str]):
+        wait = WebDriverWait(
+            self.driver, step.timeout,
+            poll_frequency=self.POLL_FREQUENCY,
+            ignored_exceptions=[StaleElementReferenceException]
+        )
+
+        if step.action == STEP_WAIT_FOR:
+            wait.until(lambda d: self._visible_element(step.selector))
+
+        elif step.action == STEP_FILL:
+            element = wait.until(lambda d: self._visible_element(step.selector, enabled=True))
+            element.clear()
+            element.send_keys(step.value.format(**values))
+
+        elif step.action == STEP_CLICK:
+            element = wait.until(lambda d: self._visible_element(step.selector, enabled=True))
+            self._url_before_click = self.driver.current_url
+            try:
+                element.click()
+            except Exception:
+                # אלמנט מכוסה (שכבת אנימציה וכדומה) - לחיצה דרך JavaScript
+                self.driver.execute_script("arguments[0].click();", element)
+
+        elif step.action == STEP_WAIT_NAVIGATION:
+            wait.until(lambda d: d.current_url != self._url_before_click and
+                       d.execute_script("return document.readyState") == 'complete')
+
+        elif step.action == STEP_WAIT_GONE:
+            wait.until(lambda d: self._visible_element(step.selector) is None)
+
+        elif step.action == STEP_WAIT_CONDITION:
+            wait.until(lambda d: d.execute_script(f"return !!({step.value});"))
+
+    def _visible_element(self, selector: str, enabled: bool = False):
+        """האלמנט הגלוי הראשון שמתאים למזהה (דפים רבים מחזיקים עותקים מוסתרים של השדות)"""
+        return self.driver.execute_script(VISIBLE_ELEMENT_SCRIPT, selector, enabled)
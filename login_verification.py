@@ -0,0 +1,221 @@
+"""שליחת טופס ההתחברות ובדיקה אם ההתחברות הצליחה, עם מדידת הזמן עד לתוצאה"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+
+# מצב הדף בקריאה אחת: כתובת, האם יש שדה סיסמה גלוי, והודעת שגיאה גלויה אם יש
+PAGE_STATE_SCRIPT = r"""
+const errorPhrases = arguments[0];
+
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+
+const passwordVisible = Array.from(document.querySelectorAll('input[type="password"]')).some(isVisible);
+
+// הודעות שגיאה: אזורי התראה וקלאסים מקובלים של שגיאה
+const banners = Array.from(document.querySelectorAll(
+    '[role="alert"], [aria-live="assertive"], [aria-live="polite"], ' +
+    '[class*="error" i], [class*="alert" i], [class*="danger" i], [class*="invalid" i], [id*="error" i]'
+)).filter(isVisible);
+
+let error = null;
+for (const banner of banners) {
+    const text = (banner.innerText || '').trim();
+    if (!text || text.length > 300) continue;
+    const lower = text.toLowerCase();
+    if (errorPhrases.some((phrase) => lower.includes(phrase))) {
+        error = text;
+        break;
+    }
+}
+
+return {url: location.href, password_visible: passwordVisible, error: error};
+"""
+
+# שליחת הטופס של שדה הסיסמה: כפתור שליחה גלוי בטופס, אחרת requestSubmit
+SUBMIT_FORM_SCRIPT = r"""
+const password = arguments[0];
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const form = password.form || password.closest('form');
+if (!form) return false;
+
+const button = Array.from(form.querySelectorAll(
+    'button[type="submit"], input[type="submit"], button:not([type])'
+)).find((el) => isVisible(el) && !el.disabled);
+if (button) {
+    button.click();
+    return true;
+}
+if (form.requestSubmit) {
+    form.requestSubmit();
+    return true;
+}
+return false;
+"""
+
+# תוצאות אפשריות
+OUTCOME_SUCCESS = 'success'
+OUTCOME_FAILED = 'failed'
+OUTCOME_UNKNOWN = 'unknown'
+
+# התחברויות במקביל כותבות לאותו קובץ היסטוריה
+_record_lock = threading.Lock()
+
+
+@dataclass
+class LoginOutcome:
+    """תוצאת בדיקת ההתחברות"""
+    status: str
+    reason: str
+    # שניות מרגע השליחה ועד לזיהוי התוצאה
+    elapsed: float
+    url: str = ''
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == OUTCOME_SUCCESS
+
+
+class LoginVerifier:
+    """זיהוי הצלחה או כישלון אחרי שליחה: שינוי כתובת, היעלמות שדה הסיסמה, עוגיות חדשות או הודעת שגיאה"""
+
+    # ביטויים מוכרים בהודעות שגיאת התחברות
+    ERROR_PHRASES = [
+        'incorrect', 'invalid', 'wrong password', 'wrong username', 'not recognized',
+        'login failed', 'sign in failed', 'authentication failed', "couldn't find your",
+        'does not match', "doesn't match", 'try again',
+        'שגוי', 'שגויה', 'שגויים', 'אינם נכונים', 'אינו נכון', 'אינה נכונה',
+        'ההתחברות נכשלה', 'לא הצלחנו', 'נסה שוב', 'נסו שוב'
+    ]
+
+    POLL_FREQUENCY = 0.2
+
+    def __init__(self, driver, timeout: float = 15):
+        self.driver = driver
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._baseline: Dict = {}
+        self._started = None
+
+    def capture_baseline(self):
+        """שמירת המצב לפני השליחה - כתובת ושמות העוגיות הקיימות"""
+        self._baseline = {
+            'url': self.driver.current_url,
+            'cookies': self._cookie_names()
+        }
+        self._started = time.perf_counter()
+
+    def submit(self, password_element) -> bool:
+        """שליחת הטופס של שדה הסיסמה; אם אין טופס - Enter בשדה"""
+        self._started = time.perf_counter()
+        try:
+            if self.driver.execute_script(SUBMIT_FORM_SCRIPT, password_element):
+                return True
+        except Exception as e:
+            self.logger.debug(f"שגיאה בשליחת הטופס בתוך הדף: {str(e)}")
+        try:
+            password_element.send_keys(Keys.ENTER)
+            return True
+        except Exception as e:
+            self.logger.debug(f"שגיאה בשליחה באמצעות Enter: {str(e)}")
+            return False
+
+    def wait_for_outcome(self) -> LoginOutcome:
+        """המתנה לסימן חד-משמעי להצלחה או לכישלון, עד למגבלת הזמן"""
+        if self._started is None:
+            self._started = time.perf_counter()
+        state = {}
+
+        def decided(driver):
+            try:
+                state.update(self._page_state())
+            except Exception:
+                # הדף באמצע ניווט - ננסה שוב בסבב הבא
+                return False
+            # הודעת שגיאה, או ששדה הסיסמה נעלם (גם בלי שינוי כתובת - אפליקציות עמוד יחיד)
+            if state.get('error') or not state.get('password_visible'):
+                return True
+            # מעבר לכתובת אחרת עם עוגיות חדשות, גם אם בדף החדש יש שדה סיסמה
+            return state.get('url') != self._baseline.get('url') and bool(self._new_cookies())
+
+        try:
+            WebDriverWait(self.driver, self.timeout, poll_frequency=self.POLL_FREQUENCY).until(decided)
+        except TimeoutException:
+            pass
+        except Exception as e:
+            self.logger.debug(f"שגיאה בבדיקת מצב הדף: {str(e)}")
+
+        outcome = self._classify(state)
+        self.logger.info(
+            f"תוצאת התחברות: {outcome.status} ({outcome.reason}) אחרי {outcome.elapsed:.2f} שניות"
+        )
+        return outcome
+
+    def _classify(self, state: Dict) -> LoginOutcome:
+        elapsed = time.perf_counter() - self._started
+        url = state.get('url', '')
+
+        if state.get('error'):
+            return LoginOutcome(OUTCOME_FAILED, 'error_banner', elapsed, url, state['error'])
+
+        if not state:
+            return LoginOutcome(OUTCOME_UNKNOWN, 'no_state', elapsed, url)
+
+        url_changed = url != self._baseline.get('url')
+        if not state.get('password_visible'):
+            if url_changed:
+                return LoginOutcome(OUTCOME_SUCCESS, 'url_changed', elapsed, url)
+            return LoginOutcome(OUTCOME_SUCCESS, 'password_field_gone', elapsed, url)
+
+        new_cookies = self._new_cookies()
+        if url_changed and new_cookies:
+            return LoginOutcome(OUTCOME_SUCCESS, 'url_and_cookies', elapsed, url)
+        if new_cookies:
+            # עוגיות חדשות אבל הטופס עדיין מוצג (למשל אימות דו-שלבי) - לא ודאי
+            return LoginOutcome(OUTCOME_UNKNOWN, 'new_cookies', elapsed, url)
+
+        # הטופס עדיין מוצג בלי הודעת שגיאה (אתר איטי, CAPTCHA, אימות נוסף) - אין ראיה שהפרטים נדחו
+        return LoginOutcome(OUTCOME_UNKNOWN, 'password_field_still_visible', elapsed, url)
+
+    def _page_state(self) -> Dict:
+        return self.driver.execute_script(PAGE_STATE_SCRIPT, self.ERROR_PHRASES) or {}
+
+    def _cookie_names(self) -> List[str]:
+        try:
+            return [cookie['name'] for cookie in self.driver.get_cookies()]
+        except Exception:
+            return []
+
+    def _new_cookies(self) -> List[str]:
+        before = set(self._baseline.get('cookies', []))
+        return [name for name in self._cookie_names() if name not in before]
+
+
+def record_outcome(path: str, site_name: str, outcome: LoginOutcome, total_seconds: float,
+                   extra: Optional[Dict] = None):
+    """הוספת תוצאת ההתחברות לקובץ היסטוריה (שורת JSON לכל התחברות)"""
+    entry = {
+        'site': site_name,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'total_seconds': round(total_seconds, 3),
+        **asdict(outcome),
+        **(extra or {})
+    }
+    entry['elapsed'] = round(entry['elapsed'], 3)
+    with _record_lock, open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
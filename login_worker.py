@@ -0,0 +1,217 @@
+"""הרצת התחברויות ברקע: תור עבודות, אותות התקדמות ותוצאה לממשק, וביטול עבודה פעילה"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# מצבי עבודה
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+_job_ids = itertools.count(1)
+
+
+class LoginCancelled(BaseException):
+    """ההתחברות בוטלה על ידי המשתמש (BaseException - כדי שלא ייבלע ב-except Exception הרחבים)"""
+
+
+@dataclass
+class LoginResult:
+    """תוצאת עבודת התחברות שהסתיימה"""
+    outcome: Any = None
+    # מזהי שדות שזוהו ויש לשמור ברשומת האתר (נשמרים בתהליכון הממשק)
+    login_fields: Optional[Dict[str, Dict[str, str]]] = None
+    elapsed: float = 0.0
+    # בדיקת הסשן השמור, אם בוצעה
+    session: Any = None
+    # משקל הדף, חסימת המשאבים והחיסכון
+    network: Optional[Dict] = None
+
+
+@dataclass
+class LoginJob:
+    """עבודת התחברות לאתר אחד בתור"""
+    site_name: str
+    site_data: Dict
+    # הגדרות שנקראו בתהליכון הממשק בעת ההוספה לתור
+    options: Dict = field(default_factory=dict)
+    job_id: int = field(default_factory=lambda: next(_job_ids))
+    status: str = JOB_QUEUED
+    message: str = ''
+    result: Optional[LoginResult] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _progress: Optional[Callable[['LoginJob', str], None]] = field(default=None, repr=False)
+    _drivers: List[Any] = field(default_factory=list, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def active(self) -> bool:
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """שניות מתחילת הביצוע ועד לסיום (או עד עכשיו אם העבודה עדיין רצה)"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def checkpoint(self, message: Optional[str] = None):
+        """נקודת בדיקה בין שלבים: עצירה אם בוטל, ודיווח התקדמות"""
+        if self.cancelled:
+            raise LoginCancelled()
+        if message:
+            self.message = message
+            if self._progress:
+                self._progress(self, message)
+
+    def attach(self, driver) -> 'LoginJob':
+        """ביטול גם באמצע המתנה: כל פקודה לדפדפן בודקת קודם אם העבודה בוטלה"""
+        original_execute = driver.execute
+
+        def cancellable_execute(driver_command, params=None):
+            if self.cancelled:
+                raise LoginCancelled()
+            return original_execute(driver_command, params)
+
+        # עטיפה קודמת מוחזרת למקומה בהסרה
+        self._drivers.append((driver, driver.__dict__.get('execute')))
+        driver.execute = cancellable_execute
+        return self
+
+    def detach(self):
+        for driver, previous in reversed(self._drivers):
+            if previous is not None:
+                driver.execute = previous
+                continue
+            try:
+                del driver.execute
+            except AttributeError:
+                pass
+        self._drivers = []
+
+
+class LoginWorker(QThread):
+    """תהליכון רקע שמחלק עבודות התחברות מהתור, עד max_parallel עבודות במקביל"""
+
+    job_started = pyqtSignal(object)
+    job_progress = pyqtSignal(object, str)
+    job_succeeded = pyqtSignal(object, object)
+    job_failed = pyqtSignal(object, str)
+    job_cancelled = pyqtSignal(object)
+
+    def __init__(self, run_job: Callable[[LoginJob], LoginResult], parent=None,
+                 max_parallel: int = 1):
+        super().__init__(parent)
+        self.run_job = run_job
+        # מספר ההתחברויות שרצות בו-זמנית (כל אחת בדפדפן משלה מהמאגר)
+        self.max_parallel = max_parallel
+        self.logger = logging.getLogger(__name__)
+        self.jobs: Dict[int, LoginJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._queue: 'queue.Queue[Optional[LoginJob]]' = queue.Queue()
+        self._slots = threading.Condition()
+        self._running = 0
+
+    def submit(self, site_name: str, site_data: Dict, options: Optional[Dict] = None) -> LoginJob:
+        """הוספת התחברות לתור"""
+        job = LoginJob(site_name, site_data, options or {})
+        job._progress = self.job_progress.emit
+        with self._jobs_lock:
+            self.jobs[job.job_id] = job
+        self._queue.put(job)
+        if not self.isRunning():
+            self.start()
+        return job
+
+    def cancel(self, job_id: Optional[int] = None):
+        """ביטול עבודה אחת, או של כל העבודות הפעילות"""
+        for job in self.active_jobs():
+            if job_id is None or job.job_id == job_id:
+                job.cancel()
+
+    def active_jobs(self) -> List[LoginJob]:
+        with self._jobs_lock:
+            return [job for job in self.jobs.values() if job.active]
+
+    def stop(self, timeout_ms: int = 5000):
+        """ביטול הכול וסיום התהליכון"""
+        self.cancel()
+        self._queue.put(None)
+        self.wait(timeout_ms)
+
+    def run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            self._acquire_slot()
+            threading.Thread(target=self._run_in_slot, args=(job,), daemon=True).start()
+
+        # המתנה לסיום העבודות שכבר רצות
+        with self._slots:
+            while self._running:
+                self._slots.wait()
+
+    def _acquire_slot(self):
+        """המתנה עד שיש מקום לעבודה נוספת (המגבלה נקראת מחדש - ניתן לשנות אותה בזמן ריצה)"""
+        with self._slots:
+            while self._running >= max(self.max_parallel, 1):
+                self._slots.wait()
+            self._running += 1
+
+    def _run_in_slot(self, job: LoginJob):
+        try:
+            self._run(job)
+        finally:
+            # ניקוי עבודות שהסתיימו - נשמרות רק הפעילות
+            with self._jobs_lock:
+                self.jobs = {job_id: j for job_id, j in self.jobs.items() if j.active}
+            with self._slots:
+                self._running -= 1
+                self._slots.notify_all()
+
+    def _run(self, job: LoginJob):
+        if job.cancelled:
+            job.status = JOB_CANCELLED
+            self.job_cancelled.emit(job)
+            return
+
+        job.status = JOB_RUNNING
+        job.started_at = time.perf_counter()
+        self.job_started.emit(job)
+        try:
+            job.result = self.run_job(job)
+            job.finished_at = time.perf_counter()
+            job.status = JOB_SUCCEEDED
+            self.job_succeeded.emit(job, job.result)
+        except LoginCancelled:
+            job.finished_at = time.perf_counter()
+            job.status = JOB_CANCELLED
+            self.job_cancelled.emit(job)
+        except Exception as e:
+            job.finished_at = time.perf_counter()
+            if job.cancelled:
+                # פקודה שנקטעה בגלל הביטול עלולה להגיע עטופה בשגיאה אחרת
+                job.status = JOB_CANCELLED
+                self.job_cancelled.emit(job)
+            else:
+                self.logger.error(f"שגיאה בהתחברות לאתר {job.site_name}: {str(e)}")
+                job.status = JOB_FAILED
+                job.message = str(e)
+                self.job_failed.emit(job, str(e))
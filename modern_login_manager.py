@@ -3,25 +3,44 @@ import os
 import sys
 import re
 import logging
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional
 import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QListWidget, QMessageBox,
-    QDialog, QFormLayout, QTabWidget, QMenu, QSystemTrayIcon, QGroupBox, QCheckBox, QFileDialog
+    QDialog, QFormLayout, QTabWidget, QMenu, QSystemTrayIcon, QGroupBox, QCheckBox, QFileDialog,
+    QComboBox, QSpinBox, QListWidgetItem, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer
 from PyQt6.QtGui import QAction, QIcon, QClipboard
-from PyQt6.QtCore import QThread, pyqtSignal
 from cryptography.fernet import Fernet
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.remote.webelement import WebElement
+from credential_cache import ENCRYPTED_FIELDS, PlaintextCache, reveal
+from driver_pool import DriverPool, headless_chrome_options, kill_orphans
+from driver_profiler import DriverProfiler, profile_stage
+from health_check import (
+    HEALTH_BROKEN, HEALTH_ERROR, HEALTH_OK, HEALTH_UNKNOWN, HealthScheduler, describe_health
+)
+from http_login import HttpLoginClient, HttpLoginResult, JavaScriptRequired
+from field_scoring import (
+    SNAPSHOT_ATTRIBUTES, STANDALONE_INPUT_TYPES, FieldSnapshot, LoginFieldScorer, PageSnapshot, ScoringResult
+)
+from login_recipes import STEP_FILL, STEP_WAIT_FOR, LoginRecipe, RecipeRunner, find_recipe
+from login_verification import OUTCOME_FAILED, OUTCOME_SUCCESS, OUTCOME_UNKNOWN, LoginOutcome, LoginVerifier, record_outcome
+from login_worker import JOB_RUNNING, LoginCancelled, LoginJob, LoginResult, LoginWorker
+from resource_blocking import (
+    SITE_BLOCKING_DEFAULT, SITE_BLOCKING_FULL, SITE_BLOCKING_OFF, ResourceBlocker, describe_network,
+    estimate_savings, site_categories
+)
+from session_store import SessionStore
+from timing_history import SUMMARY_STAGES, TimingHistory, daily_trend, slowest_sites, stage_stats
+from vector_scoring import create_scorer, numpy_available
 
 # הגדרת Logger
 logging.basicConfig(
@@ -30,114 +49,445 @@ logging.basicConfig(
     filename='login_manager.log'
 )
 
-@dataclass
+# סקריפט לאיסוף תמונת מצב של הדף בקריאה אחת לדפדפן:
+# שדות קלט מועמדים, טפסים וטקסטים גלויים עם המיקום שלהם
+PAGE_SNAPSHOT_SCRIPT = r"""
+const attributeNames = arguments[0];
+const standaloneTypes = arguments[1];
+
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const rectOf = (el) => {
+    const r = el.getBoundingClientRect();
+    return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+};
+const textOf = (el) => (el.innerText || '').trim();
+
+const forms = Array.from(document.querySelectorAll('form'));
+const formInputs = forms.map((form) => Array.from(form.querySelectorAll('input')));
+const formsData = forms.map((form, i) => {
+    let action = form.getAttribute('action') || '';
+    try {
+        action = new URL(action, document.baseURI).href;
+    } catch (e) {}
+    return {
+        index: i,
+        method: (form.getAttribute('method') || 'get').toLowerCase(),
+        action: action,
+        has_submit: form.querySelector('button[type="submit"], input[type="submit"]') !== null,
+        input_types: formInputs[i].map((input) => input.type),
+        rect: rectOf(form)
+    };
+});
+
+const labelsOf = (el) => {
+    if (el.labels) return Array.from(el.labels);
+    if (!el.id) return [];
+    return Array.from(document.querySelectorAll('label')).filter((label) => label.htmlFor === el.id);
+};
+const describedBy = (el) => (el.getAttribute('aria-describedby') || '')
+    .split(/\s+/)
+    .map((id) => id && document.getElementById(id))
+    .filter((desc) => desc);
+
+const fields = [];
+const elements = [];
+document.querySelectorAll('input, [contenteditable="true"]').forEach((el) => {
+    const isInput = el.tagName.toLowerCase() === 'input';
+    const form = el.closest('form');
+    if (isInput && !form && !standaloneTypes.includes(el.type)) return;
+
+    const attributes = {};
+    attributeNames.forEach((name) => {
+        const value = el.getAttribute(name);
+        if (value !== null) attributes[name] = value;
+    });
+    if (isInput) attributes.type = el.type;
+
+    const formIndex = form ? forms.indexOf(form) : -1;
+    fields.push({
+        index: fields.length,
+        tag_name: el.tagName.toLowerCase(),
+        attributes: attributes,
+        displayed: isVisible(el),
+        enabled: !el.matches(':disabled'),
+        rect: rectOf(el),
+        form_index: formIndex >= 0 ? formIndex : null,
+        form_input_index: formIndex >= 0 ? formInputs[formIndex].indexOf(el) : -1,
+        label_texts: labelsOf(el).map(textOf).filter((text) => text),
+        described_texts: describedBy(el).map(textOf).filter((text) => text)
+    });
+    elements.push(el);
+});
+
+const texts = [];
+const textNodes = document.evaluate(
+    '//*[text()][not(self::script)][not(self::style)]',
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+for (let i = 0; i < textNodes.snapshotLength; i++) {
+    const el = textNodes.snapshotItem(i);
+    if (!isVisible(el)) continue;
+    const text = textOf(el);
+    if (!text) continue;
+    texts.push({text: text, rect: rectOf(el)});
+}
+
+return {
+    url: window.location.href,
+    viewport_height: window.innerHeight,
+    fields: fields,
+    forms: formsData,
+    texts: texts,
+    elements: elements
+};
+"""
+
+# סקריפט לאיתור שדות לפי מזהים שמורים בקריאה אחת - מחזיר את האלמנט השמיש הראשון לכל קבוצת מזהים
+RESOLVE_SELECTORS_SCRIPT = r"""
+const selectorSets = arguments[0];
+const selectorOrder = arguments[1];
+
+const isUsable = (el) => {
+    if (!el || !el.getClientRects().length || el.matches(':disabled')) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden';
+};
+const quote = (value) => '"' + value.replace(/["\\]/g, '\\$&') + '"';
+const candidatesFor = (type, value) => {
+    switch (type) {
+        case 'id':
+            return [document.getElementById(value)];
+        case 'name':
+            return Array.from(document.getElementsByName(value));
+        case 'css':
+            return Array.from(document.querySelectorAll(value));
+        case 'xpath': {
+            const result = document.evaluate(
+                value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+        }
+        case 'data-testid':
+        case 'aria-label':
+            return Array.from(document.querySelectorAll('[' + type + '=' + quote(value) + ']'));
+        default:
+            return [];
+    }
+};
+
+return selectorSets.map((selectors) => {
+    if (!selectors) return null;
+    for (const type of selectorOrder) {
+        if (!selectors[type]) continue;
+        try {
+            const match = candidatesFor(type, selectors[type]).find(isUsable);
+            if (match) return match;
+        } catch (e) {}
+    }
+    return null;
+});
+"""
+
+# סקריפט ליצירת מזהים לאלמנטים בקריאה אחת: ה-CSS selector וה-XPath היחסי הקצרים ביותר
+# שמאתרים כל אלמנט באופן ייחודי, עם בדיקה מול המסמך החי
+UNIQUE_SELECTORS_SCRIPT = r"""
+const elements = arguments[0];
+const maxAnchorDepth = arguments[1];
+
+const cssMatches = (selector, el) => {
+    try {
+        const found = document.querySelectorAll(selector);
+        return found.length === 1 && found[0] === el;
+    } catch (e) {
+        return false;
+    }
+};
+const xpathMatches = (xpath, el) => {
+    try {
+        const result = document.evaluate(
+            xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        return result.snapshotLength === 1 && result.snapshotItem(0) === el;
+    } catch (e) {
+        return false;
+    }
+};
+const cssQuote = (value) => '"' + value.replace(/\\/g, '\\\\').replace(/"/g, '\\"') + '"';
+const xpathQuote = (value) => {
+    if (!value.includes("'")) return "'" + value + "'";
+    if (!value.includes('"')) return '"' + value + '"';
+    return 'concat(' + value.split("'").map((part) => "'" + part + "'").join(`, "'", `) + ')';
+};
+const tagOf = (el) => el.tagName.toLowerCase();
+const shortestFirst = (items) => items.sort((a, b) => a.length - b.length);
+
+// מאפיינים יציבים יחסית, לפי סדר עדיפות
+const STABLE_ATTRIBUTES = ['id', 'name', 'data-testid', 'aria-label', 'autocomplete', 'placeholder', 'type'];
+
+const nthOfType = (el) => {
+    let index = 1;
+    for (let sibling = el.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+        if (sibling.tagName === el.tagName) index++;
+    }
+    return index;
+};
+
+const cssCandidates = (el) => {
+    const tag = tagOf(el);
+    const candidates = [];
+    if (el.id) candidates.push('#' + CSS.escape(el.id));
+    const present = STABLE_ATTRIBUTES.filter((attr) => attr !== 'id' && el.getAttribute(attr));
+    for (const attr of present) {
+        candidates.push(tag + '[' + attr + '=' + cssQuote(el.getAttribute(attr)) + ']');
+    }
+    for (let i = 0; i < present.length; i++) {
+        for (let j = i + 1; j < present.length; j++) {
+            candidates.push(
+                tag + '[' + present[i] + '=' + cssQuote(el.getAttribute(present[i])) + ']' +
+                '[' + present[j] + '=' + cssQuote(el.getAttribute(present[j])) + ']'
+            );
+        }
+    }
+    for (const className of el.classList) candidates.push(tag + '.' + CSS.escape(className));
+    return shortestFirst(candidates);
+};
+
+// חלק מקומי לשרשרת: מזהה id ייחודי, אחרת תגית ומיקום בין האחים מאותו סוג
+const cssStep = (el) => {
+    if (el.id && cssMatches('#' + CSS.escape(el.id), el)) return {selector: '#' + CSS.escape(el.id), anchor: true};
+    return {selector: tagOf(el) + ':nth-of-type(' + nthOfType(el) + ')', anchor: false};
+};
+
+const uniqueCss = (el) => {
+    const direct = cssCandidates(el).find((selector) => cssMatches(selector, el));
+    if (direct) return direct;
+
+    // שרשרת הורים קצרה ככל האפשר עד לעוגן ייחודי (שרשרת עד השורש תמיד ייחודית)
+    const parts = [cssStep(el).selector];
+    let current = el;
+    while (current.parentElement) {
+        current = current.parentElement;
+        const step = cssStep(current);
+        parts.unshift(step.selector);
+        const selector = parts.join(' > ');
+        if (cssMatches(selector, el)) return selector;
+        if (step.anchor) break;
+    }
+    return null;
+};
+
+const xpathCandidates = (el) => {
+    const tag = tagOf(el);
+    const candidates = [];
+    const present = STABLE_ATTRIBUTES.filter((attr) => el.getAttribute(attr));
+    for (const attr of present) {
+        candidates.push('//' + tag + '[@' + attr + '=' + xpathQuote(el.getAttribute(attr)) + ']');
+    }
+    for (let i = 0; i < present.length; i++) {
+        for (let j = i + 1; j < present.length; j++) {
+            candidates.push(
+                '//' + tag + '[@' + present[i] + '=' + xpathQuote(el.getAttribute(present[i])) + ']' +
+                '[@' + present[j] + '=' + xpathQuote(el.getAttribute(present[j])) + ']'
+            );
+        }
+    }
+    // תווית מקושרת
+    for (const label of el.labels || []) {
+        const text = (label.textContent || '').trim();
+        if (text && el.id) {
+            candidates.push('//' + tag + '[@id=//label[normalize-space()=' + xpathQuote(text) + ']/@for]');
+        }
+    }
+    return shortestFirst(candidates);
+};
+
+const uniqueXpath = (el) => {
+    const direct = xpathCandidates(el).find((xpath) => xpathMatches(xpath, el));
+    if (direct) return direct;
+
+    // מיקום יחסי לאב הקרוב ביותר שיש לו id ייחודי
+    const tag = tagOf(el);
+    for (let current = el.parentElement, depth = 0; current && depth < maxAnchorDepth;
+         current = current.parentElement, depth++) {
+        if (!current.id) continue;
+        const base = '//*[@id=' + xpathQuote(current.id) + ']';
+        if (!xpathMatches(base, current)) continue;
+        const inAnchor = Array.from(current.getElementsByTagName(el.tagName));
+        const xpath = '(' + base + '//' + tag + ')[' + (inAnchor.indexOf(el) + 1) + ']';
+        if (xpathMatches(xpath, el)) return xpath;
+    }
 
+    const all = Array.from(document.getElementsByTagName(el.tagName));
+    const xpath = '(//' + tag + ')[' + (all.indexOf(el) + 1) + ']';
+    return xpathMatches(xpath, el) ? xpath : null;
+};
+
+return elements.map((el) => el ? {css: uniqueCss(el), xpath: uniqueXpath(el)} : null);
+"""
+
+# סקריפט למילוי שדות בקריאה אחת: הצבת הערך דרך ה-setter המקורי (כדי שגם React וכדומה
+# יזהו את השינוי) ושליחת אירועי input/change. מחזיר לכל שדה אם הערך נקלט
+FILL_FIELDS_SCRIPT = r"""
+const elements = arguments[0];
+const values = arguments[1];
+
+const setValue = (el, value) => {
+    el.focus();
+    if (el.isContentEditable) {
+        el.textContent = value;
+    } else {
+        const proto = el instanceof HTMLTextAreaElement
+            ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+        setter.call(el, value);
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+    return el.isContentEditable ? el.textContent === value : el.value === value;
+};
+
+return elements.map((el, i) => {
+    try {
+        return setValue(el, values[i]);
+    } catch (e) {
+        return false;
+    }
+});
+"""
+
+# סקריפט אסינכרוני שממתין בתוך הדף עד שאפשר להתחיל בזיהוי: שדה סיסמה גלוי הופיע,
+# או שקבוצת השדות הגלויים לא השתנתה במשך חלון שקט (ואם אין שדות - שה-DOM כולו נרגע)
+PAGE_READY_SCRIPT = r"""
+const quietMs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const start = performance.now();
+let lastChange = start;
+let lastMutation = start;
+let lastSignature = null;
+let finished = false;
+let observer = null;
+let interval = null;
+
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const visibleInputs = () => Array.from(
+    document.querySelectorAll('input, [contenteditable="true"]')
+).filter((el) => el.type !== 'hidden' && isVisible(el));
+
+const finish = (reason, count) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(interval);
+    done({reason: reason, elapsed_ms: performance.now() - start, inputs: count});
+};
+
+const check = () => {
+    if (finished) return;
+    const now = performance.now();
+    const inputs = document.body ? visibleInputs() : [];
+    if (inputs.some((el) => el.type === 'password')) return finish('password', inputs.length);
+
+    const signature = inputs.map((el) => [el.tagName, el.type, el.name, el.id].join(':')).join('|');
+    if (signature !== lastSignature) {
+        lastSignature = signature;
+        lastChange = now;
+    }
 
-            
-class FieldScore:
-    """מחלקה לחישוב וניהול ציוני התאמה של שדות"""
-    element: WebElement
-    base_score: float = 0
-    context_score: float = 0
-    position_score: float = 0
-    relation_score: float = 0
-    
-    @property
-    def total_score(self) -> float:
-        return self.base_score + self.context_score + self.position_score + self.relation_score
+    if (inputs.length && document.readyState !== 'loading' && now - lastChange >= quietMs) {
+        return finish('stable', inputs.length);
+    }
+    if (!inputs.length && document.readyState === 'complete' && now - lastMutation >= quietMs) {
+        return finish('settled', 0);
+    }
+    if (now - start >= timeoutMs) finish('timeout', inputs.length);
+};
+
+observer = new MutationObserver(() => {
+    lastMutation = performance.now();
+    check();
+});
+observer.observe(document, {
+    childList: true, subtree: true, attributes: true,
+    attributeFilter: ['style', 'class', 'hidden', 'type', 'disabled']
+});
+interval = setInterval(check, Math.max(20, Math.min(100, quietMs / 3)));
+check();
+"""
 
 class SmartLoginFieldsFinder:
     """מחלקה חכמה משופרת לזיהוי שדות התחברות"""
     
-    # מילות מפתח מורחבות לזיהוי שדות משתמש/אימייל
-    USERNAME_KEYWORDS = {
-        'he': [
-            'דואר אלקטרוני', 'אימייל', 'דוא"ל', 'שם משתמש', 'מזהה',
-            'טלפון', 'נייד', 'ת.ז', 'תעודת זהות', 'שם פרטי',
-            'מספר לקוח', 'מספר חבר', 'שם החשבון'
-        ],
-        'en': [
-            'email', 'mail', 'username', 'user', 'login', 'phone',
-            'mobile', 'account', 'id', 'identity', 'member',
-            'customer', 'client', 'access', 'identifier'
-        ],
-        'patterns': [
-            r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',  # תבנית אימייל
-            r'^\d{10}$',  # תבנית טלפון
-            r'^\d{9}$',   # תבנית ת.ז
-            r'^[a-zA-Z0-9_-]{3,20}$'  # תבנית שם משתמש כללית
-        ]
-    }
-    
-    # מילות מפתח מורחבות לזיהוי שדות סיסמה
-    PASSWORD_KEYWORDS = {
-        'he': [
-            'סיסמה', 'סיסמא', 'קוד גישה', 'קוד סודי', 'קוד אימות',
-            'מפתח גישה', 'קוד אבטחה', 'קוד משתמש'
-        ],
-        'en': [
-            'password', 'pass', 'pwd', 'secret', 'security code',
-            'access code', 'pin', 'passcode', 'auth code',
-            'verification code', 'secure key'
-        ],
-        'patterns': [
-            r'^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$',  # סיסמה חזקה
-            r'^\d{4,8}$'  # PIN או קוד גישה מספרי
-        ]
-    }
+    # מאפיינים שנאספים לכל שדה בתמונת המצב
+    SNAPSHOT_ATTRIBUTES = SNAPSHOT_ATTRIBUTES
+
+    # סוגי שדות שנאספים גם כשאינם בתוך טופס
+    STANDALONE_INPUT_TYPES = STANDALONE_INPUT_TYPES
+
+    # סדר העדיפות של סוגי המזהים באיתור שדה לפי מזהים שמורים
+    SELECTOR_ORDER = ['id', 'name', 'css', 'xpath', 'data-testid', 'aria-label']
+
+    # אופני מילוי: הקלדה תו אחר תו, או הצבת הערך ושליחת אירועים בתוך הדף
+    FILL_TYPING = 'typing'
+    FILL_EVENTS = 'events'
+
+    # עומק מרבי בחיפוש אב עם id לעיגון XPath יחסי
+    XPATH_ANCHOR_DEPTH = 5
 
-    def __init__(self, driver):
+    # מוכנות הדף: חלון שקט של קבוצת השדות ומגבלת המתנה כוללת
+    READY_QUIET_MS = 300
+    READY_TIMEOUT = 10
+
+    def __init__(self, driver, scorer: Optional[LoginFieldScorer] = None,
+                 profiler: Optional[DriverProfiler] = None):
         """אתחול המאתר החכם"""
         self.driver = driver
+        self.profiler = profiler
         self.logger = logging.getLogger(__name__)
         self.wait = WebDriverWait(self.driver, 10)
-    def find_login_fields(self) -> Dict[str, Tuple[str, WebElement]]:
-        """מוצא את שדות ההתחברות בדף בצורה חכמה ומתקדמת"""
+        self.scorer = scorer or LoginFieldScorer()
+        self.last_result: Optional[ScoringResult] = None
+    def find_login_fields(self, snapshot: Optional[PageSnapshot] = None,
+                          ready: bool = False) -> Dict[str, Dict[str, str]]:
+        """מוצא את שדות ההתחברות בדף בצורה חכמה ומתקדמת (ready - הקורא כבר המתין למוכנות הדף)"""
         try:
-            # המתנה לטעינת הדף
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # 1. איסוף כל השדות הפוטנציאליים
-            input_elements = self._collect_potential_fields()
-            
-            # 2. ניתוח וניקוד ראשוני של השדות
-            username_candidates = []
-            password_candidates = []
-            
-            for element in input_elements:
-                try:
-                    if not element.is_displayed() or not element.is_enabled():
-                        continue
-                        
-                    username_score = FieldScore(element)
-                    password_score = FieldScore(element)
-                    
-                    # ניתוח מקיף של כל שדה
-                    self._analyze_basic_attributes(element, username_score, password_score)
-                    self._analyze_surrounding_context(element, username_score, password_score)
-                    self._analyze_field_position(element, username_score, password_score)
-                    self._analyze_field_relationships(element, username_score, password_score)
-                    
-                    # הוספת המועמדים המתאימים לרשימות
-                    if username_score.total_score > 3:  # סף מינימלי
-                        username_candidates.append(username_score)
-                    if password_score.total_score > 3:  # סף מינימלי
-                        password_candidates.append(password_score)
-                        
-                except Exception as e:
-                    self.logger.debug(f"שגיאה בניתוח שדה: {str(e)}")
-                    continue
+            if snapshot is None:
+                if not ready:
+                    with profile_stage(self.profiler, 'readiness'):
+                        # המתנה עד שהדף מוכן לזיהוי (ולא זמן קבוע)
+                        self.wait_until_ready()
+                
+                with profile_stage(self.profiler, 'collect'):
+                    # 1. איסוף כל השדות הפוטנציאליים בקריאה אחת
+                    snapshot = self.take_snapshot()
             
-            # 3. בחירת השדות הטובים ביותר
-            best_username = self._select_best_candidate(username_candidates)
-            best_password = self._select_best_candidate(password_candidates)
+            # 2. ניקוד ובחירת השדות במנוע הניקוד (זיהוי מהיר ואז ניקוד מלא לפי הצורך)
+            result = self.scorer.score_page(snapshot, profiler=self.profiler)
+            self.last_result = result
+            self.logger.info(f"שכבת הזיהוי שענתה: {result.tier}")
             
-            # 4. וידוא תקינות השילוב
-            if best_username and best_password:
-                if self._validate_field_combination(best_username.element, best_password.element):
+            # 3. יצירת מזהים לשדות שנבחרו
+            if result.found:
+                with profile_stage(self.profiler, 'selector_generation'):
+                    fields = [result.username.element, result.password.element]
+                    unique_selectors = self._create_unique_selectors(
+                        [snapshot.element_of(f) for f in fields]
+                    )
                     return {
-                        'username': self._get_smart_selectors(best_username.element),
-                        'password': self._get_smart_selectors(best_password.element)
+                        field_type: self._get_smart_selectors(f, generated)
+                        for field_type, f, generated in zip(('username', 'password'), fields, unique_selectors)
                     }
             
             return {}
@@ -146,480 +496,164 @@ class SmartLoginFieldsFinder:
             self.logger.error(f"שגיאה בזיהוי שדות ההתחברות: {str(e)}")
             raise
 
-    def _collect_potential_fields(self) -> List[WebElement]:
-        """אוסף את כל שדות הקלט הפוטנציאליים מהדף"""
-        potential_fields = []
-        
-        try:
-            # חיפוש בתוך טפסים
-            forms = self.driver.find_elements(By.TAG_NAME, 'form')
-            for form in forms:
-                form_fields = form.find_elements(By.TAG_NAME, 'input')
-                potential_fields.extend(form_fields)
-            
-            # חיפוש שדות נוספים מחוץ לטפסים
-            all_inputs = self.driver.find_elements(By.TAG_NAME, 'input')
-            for input_el in all_inputs:
-                if input_el not in potential_fields:
-                    input_type = input_el.get_attribute('type')
-                    if input_type in ['text', 'email', 'tel', 'password', 'number']:
-                        potential_fields.append(input_el)
-            
-            # חיפוש שדות contenteditable
-            editable_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, 
-                '[contenteditable="true"]'
-            )
-            potential_fields.extend(editable_elements)
-            
-        except Exception as e:
-            self.logger.error(f"שגיאה באיסוף שדות: {str(e)}")
-        
-        return list(set(potential_fields))  # הסרת כפילויות
-
-    def _analyze_basic_attributes(self, element: WebElement, 
-                                username_score: FieldScore, 
-                                password_score: FieldScore):
-        """מנתח את המאפיינים הבסיסיים של השדה"""
-        try:
-            # בדיקת type
-            input_type = element.get_attribute('type')
-            if input_type == 'password':
-                password_score.base_score += 5
-            elif input_type in ['email', 'tel']:
-                username_score.base_score += 3
-            
-            # בדיקת מאפיינים נוספים
-            attributes = ['name', 'id', 'class', 'aria-label', 'placeholder', 
-                        'data-testid', 'role']
-            
-            for attr in attributes:
-                value = element.get_attribute(attr)
-                if not value:
-                    continue
-                
-                value_lower = value.lower()
-                
-                # בדיקה מול מילות מפתח בעברית ואנגלית
-                for lang in ['he', 'en']:
-                    for keyword in self.USERNAME_KEYWORDS[lang]:
-                        if keyword.lower() in value_lower:
-                            username_score.base_score += self._calculate_keyword_score(
-                                keyword, value_lower
-                            )
-                    
-                    for keyword in self.PASSWORD_KEYWORDS[lang]:
-                        if keyword.lower() in value_lower:
-                            password_score.base_score += self._calculate_keyword_score(
-                                keyword, value_lower
-                            )
-            
-            # בדיקת תבניות
-            for pattern in self.USERNAME_KEYWORDS['patterns']:
-                if re.match(pattern, value_lower):
-                    username_score.base_score += 2
-            
-            for pattern in self.PASSWORD_KEYWORDS['patterns']:
-                if re.match(pattern, value_lower):
-                    password_score.base_score += 2
-            
-            # בדיקת autocomplete
-            autocomplete = element.get_attribute('autocomplete')
-            if autocomplete:
-                if any(x in autocomplete.lower() for x in ['username', 'email']):
-                    username_score.base_score += 2
-                elif 'current-password' in autocomplete.lower():
-                    password_score.base_score += 2
-            
-            # בדיקת maxlength
-            maxlength = element.get_attribute('maxlength')
-            if maxlength:
-                try:
-                    maxlen = int(maxlength)
-                    if 20 <= maxlen <= 128:  # טווח טיפוסי לסיסמאות
-                        password_score.base_score += 1
-                    elif 3 <= maxlen <= 50:   # טווח טיפוסי לשמות משתמש
-                        username_score.base_score += 1
-                except ValueError:
-                    pass
-            
-        except Exception as e:
-            self.logger.debug(f"שגיאה בניתוח מאפיינים בסיסיים: {str(e)}")
-    def _analyze_surrounding_context(self, element: WebElement,
-                                   username_score: FieldScore,
-                                   password_score: FieldScore):
-        """מנתח את ההקשר סביב השדה וטקסטים קשורים"""
+    def wait_until_ready(self, timeout: Optional[float] = None,
+                         quiet_ms: Optional[int] = None) -> Dict:
+        """ממתין בתוך הדף לשינויי DOM עד ששדה סיסמה מופיע או שקבוצת השדות נרגעת"""
+        timeout = timeout or self.READY_TIMEOUT
+        quiet_ms = quiet_ms or self.READY_QUIET_MS
+        # הדפדפן משותף (מאגר) - מגבלת הסקריפט הקודמת מוחזרת בסיום
         try:
-            # בדיקת תוויות (labels) מקושרות
-            element_id = element.get_attribute('id')
-            if element_id:
-                labels = self.driver.find_elements(
-                    By.CSS_SELECTOR, 
-                    f'label[for="{element_id}"]'
-                )
-                
-                for label in labels:
-                    label_text = label.text.lower()
-                    self._analyze_text_content(
-                        label_text, 
-                        username_score,
-                        password_score,
-                        weight=3  # משקל גבוה לתוויות מקושרות
-                    )
-
-            # בדיקת טקסט בסביבה הקרובה
-            surrounding_elements = self._get_surrounding_elements(element, max_distance=150)
-            for elem in surrounding_elements:
-                if elem != element:
-                    elem_text = elem.text.lower()
-                    self._analyze_text_content(
-                        elem_text,
-                        username_score,
-                        password_score,
-                        weight=1  # משקל נמוך יותר לטקסט סביבתי
-                    )
-
-            # בדיקת aria-describedby
-            described_by = element.get_attribute('aria-describedby')
-            if described_by:
-                desc_elements = self.driver.find_elements(
-                    By.ID, 
-                    described_by
-                )
-                for desc in desc_elements:
-                    desc_text = desc.text.lower()
-                    self._analyze_text_content(
-                        desc_text,
-                        username_score,
-                        password_score,
-                        weight=2
-                    )
-
-        except Exception as e:
-            self.logger.debug(f"שגיאה בניתוח הקשר: {str(e)}")
-
-    def _analyze_field_position(self, element: WebElement,
-                              username_score: FieldScore,
-                              password_score: FieldScore):
-        """מנתח את מיקום השדה בדף ויחסיו עם שדות אחרים"""
+            previous_timeout = self.driver.timeouts.script
+        except Exception:
+            previous_timeout = None
         try:
-            # בדיקת מיקום אנכי בדף
-            viewport_height = self.driver.execute_script(
-                'return window.innerHeight'
+            # מגבלת הסקריפט בדפדפן גבוהה מהמגבלה הפנימית כדי שהסקריפט תמיד יחזיר תשובה
+            self.driver.set_script_timeout(timeout + 5)
+            state = self.driver.execute_async_script(PAGE_READY_SCRIPT, quiet_ms, timeout * 1000)
+            self.logger.debug(
+                f"הדף מוכן לזיהוי ({state['reason']}) אחרי {state['elapsed_ms']:.0f}ms, "
+                f"{state['inputs']} שדות גלויים"
             )
-            element_position = element.location['y']
-            
-            # שדות בחלק העליון של הדף מקבלים ניקוד גבוה יותר
-            if element_position < viewport_height / 3:
-                username_score.position_score += 2
-                password_score.position_score += 2
-            elif element_position < viewport_height / 2:
-                username_score.position_score += 1
-                password_score.position_score += 1
-
-            # בדיקת סדר השדות
-            form = self._find_parent_form(element)
-            if form:
-                inputs = form.find_elements(By.TAG_NAME, 'input')
-                try:
-                    current_index = inputs.index(element)
-                    
-                    # בדיקת השדה הקודם
-                    if current_index > 0:
-                        prev_input = inputs[current_index - 1]
-                        if prev_input.get_attribute('type') != 'password':
-                            username_score.position_score += 1
-                    
-                    # בדיקת השדה הבא
-                    if current_index < len(inputs) - 1:
-                        next_input = inputs[current_index + 1]
-                        if next_input.get_attribute('type') == 'password':
-                            username_score.position_score += 2
-                        elif element.get_attribute('type') == 'password':
-                            password_score.position_score += 2
-                
-                except ValueError:
-                    pass
-
-            # בדיקת נראות
-            if element.is_displayed():
-                username_score.position_score += 1
-                password_score.position_score += 1
-
+            return state
         except Exception as e:
-            self.logger.debug(f"שגיאה בניתוח מיקום: {str(e)}")
-
-    def _analyze_field_relationships(self, element: WebElement,
-                                   username_score: FieldScore,
-                                   password_score: FieldScore):
-        """מנתח את הקשרים בין השדות ומאפייני הטופס"""
-        try:
-            form = self._find_parent_form(element)
-            if form:
-                # בדיקת נוכחות כפתור שליחה
-                submit_buttons = form.find_elements(
-                    By.XPATH,
-                    './/button[@type="submit"] | .//input[@type="submit"]'
-                )
-                if submit_buttons:
-                    username_score.relation_score += 1
-                    password_score.relation_score += 1
-
-                # בדיקת שדות נוספים בטופס
-                inputs = form.find_elements(By.TAG_NAME, 'input')
-                has_text_input = False
-                has_email_input = False
-                has_password = False
-
-                for input_el in inputs:
-                    input_type = input_el.get_attribute('type')
-                    if input_type == 'text':
-                        has_text_input = True
-                    elif input_type == 'email':
-                        has_email_input = True
-                    elif input_type == 'password':
-                        has_password = True
-
-                # ניקוד על בסיס שילובי השדות
-                if has_password and (has_text_input or has_email_input):
-                    username_score.relation_score += 2
-                    password_score.relation_score += 2
-
-                # בדיקת מאפייני הטופס
-                form_method = form.get_attribute('method')
-                if form_method and form_method.lower() == 'post':
-                    username_score.relation_score += 1
-                    password_score.relation_score += 1
-
-                # בדיקת action של הטופס
-                form_action = form.get_attribute('action')
-                if form_action:
-                    login_keywords = ['login', 'signin', 'auth', 'התחבר']
-                    if any(keyword in form_action.lower() for keyword in login_keywords):
-                        username_score.relation_score += 1
-                        password_score.relation_score += 1
+            # גיבוי: ההמתנה הקודמת לגוף הדף
+            self.logger.debug(f"שגיאה בהמתנה למוכנות הדף: {str(e)}")
+            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            return {'reason': 'body', 'elapsed_ms': None, 'inputs': None}
+        finally:
+            if previous_timeout is not None:
+                try:
+                    self.driver.set_script_timeout(previous_timeout)
+                except Exception as e:
+                    self.logger.debug(f"שגיאה בהחזרת מגבלת הסקריפט: {str(e)}")
+
+    def take_snapshot(self) -> PageSnapshot:
+        """אוסף את כל שדות הקלט הפוטנציאליים, הטפסים והטקסטים בדף בקריאה אחת"""
+        result = self.driver.execute_script(
+            PAGE_SNAPSHOT_SCRIPT,
+            self.SNAPSHOT_ATTRIBUTES,
+            self.STANDALONE_INPUT_TYPES
+        )
+        elements = result.pop('elements', [])
+        snapshot = PageSnapshot.from_dict(result, elements)
+        self.logger.debug(
+            f"נאספה תמונת מצב: {len(snapshot.fields)} שדות, "
+            f"{len(snapshot.forms)} טפסים, {len(snapshot.texts)} טקסטים"
+        )
+        return snapshot
 
-        except Exception as e:
-            self.logger.debug(f"שגיאה בניתוח קשרים: {str(e)}")
-    def _get_surrounding_elements(self, element: WebElement, 
-                                max_distance: int = 150) -> List[WebElement]:
-        """מוצא אלמנטים בסביבת השדה הנתון"""
-        surrounding = []
+    def resolve_selectors(self, selector_sets: List[Dict[str, str]]) -> List[Optional[WebElement]]:
+        """מאתר את האלמנט הראשון שמתאים לכל קבוצת מזהים בקריאה אחת לדפדפן"""
         try:
-            element_rect = element.rect
-            element_center = {
-                'x': element_rect['x'] + element_rect['width'] / 2,
-                'y': element_rect['y'] + element_rect['height'] / 2
-            }
-
-            # חיפוש אלמנטים בסביבה
-            potential_elements = self.driver.find_elements(
-                By.XPATH,
-                './/*[text()][not(self::script)][not(self::style)]'
+            return self.driver.execute_script(
+                RESOLVE_SELECTORS_SCRIPT,
+                selector_sets,
+                self.SELECTOR_ORDER
             )
-
-            for elem in potential_elements:
-                try:
-                    if not elem.is_displayed():
-                        continue
-
-                    elem_rect = elem.rect
-                    elem_center = {
-                        'x': elem_rect['x'] + elem_rect['width'] / 2,
-                        'y': elem_rect['y'] + elem_rect['height'] / 2
-                    }
-
-                    # חישוב מרחק אוקלידי
-                    distance = ((elem_center['x'] - element_center['x']) ** 2 + 
-                              (elem_center['y'] - element_center['y']) ** 2) ** 0.5
-
-                    if distance <= max_distance:
-                        surrounding.append(elem)
-
-                except Exception:
-                    continue
-
         except Exception as e:
-            self.logger.debug(f"שגיאה במציאת אלמנטים סביבתיים: {str(e)}")
+            self.logger.debug(f"שגיאה באיתור שדות לפי מזהים: {str(e)}")
+            return [None] * len(selector_sets)
 
-        return surrounding
+    def find_cached_fields(self, cached_fields: Dict[str, Dict[str, str]]) -> Optional[Dict[str, WebElement]]:
+        """בדיקה זולה שהמזהים השמורים עדיין מאתרים שדות שמישים בדף"""
+        if not all(isinstance(cached_fields.get(key), dict) and cached_fields[key]
+                   for key in ('username', 'password')):
+            return None
+        
+        username_element, password_element = self.resolve_selectors(
+            [cached_fields['username'], cached_fields['password']]
+        )
+        if username_element is None or password_element is None or \
+           username_element == password_element:
+            self.logger.info("המזהים השמורים לא איתרו שדות שמישים בדף")
+            return None
+        
+        return {'username': username_element, 'password': password_element}
 
-    def _analyze_text_content(self, text: str, 
-                            username_score: FieldScore,
-                            password_score: FieldScore,
-                            weight: float = 1.0):
-        """מנתח תוכן טקסטואלי ומעדכן את הניקוד בהתאם"""
-        if not text:
-            return
+    def resolve_login_fields(self, login_fields: Dict[str, Dict[str, str]]) -> Optional[Dict[str, WebElement]]:
+        """איתור שני השדות לפי כל המזהים שלהם בקריאה אחת לדפדפן"""
+        username_element, password_element = self.resolve_selectors(
+            [login_fields.get('username'), login_fields.get('password')]
+        )
+        if username_element is None or password_element is None:
+            return None
+        return {'username': username_element, 'password': password_element}
 
-        text = text.lower()
+    def fill_fields(self, elements: Dict[str, WebElement], values: Dict[str, str],
+                    mode: str = FILL_TYPING) -> set:
+        """מילוי השדות - בהקלדה או בהצבת ערך בקריאה אחת - ומחזיר את השדות שמולאו"""
+        filled = set()
+        field_types = list(elements)
         
-        # בדיקת מילות מפתח בשתי השפות
-        for lang in ['he', 'en']:
-            # בדיקת מילות מפתח לשם משתמש
-            for keyword in self.USERNAME_KEYWORDS[lang]:
-                if keyword.lower() in text:
-                    username_score.context_score += weight * 2
-                    
-            # בדיקת מילות מפתח לסיסמה
-            for keyword in self.PASSWORD_KEYWORDS[lang]:
-                if keyword.lower() in text:
-                    password_score.context_score += weight * 2
-
-        # בדיקת תבניות
-        for pattern in self.USERNAME_KEYWORDS['patterns']:
-            if re.search(pattern, text):
-                username_score.context_score += weight
+        if mode == self.FILL_EVENTS:
+            try:
+                results = self.driver.execute_script(
+                    FILL_FIELDS_SCRIPT,
+                    [elements[t] for t in field_types],
+                    [values[t] for t in field_types]
+                )
+                filled = {t for t, ok in zip(field_types, results) if ok}
+            except Exception as e:
+                self.logger.debug(f"שגיאה במילוי שדות בתוך הדף: {str(e)}")
+            
+            if filled != set(field_types):
+                self.logger.info("הצבת הערך לא נקלטה בכל השדות - עובר להקלדה")
+        
+        # הקלדה (ברירת המחדל, וגיבוי לשדות שלא נקלטו)
+        for field_type in field_types:
+            if field_type in filled:
+                continue
+            try:
+                elements[field_type].clear()
+                elements[field_type].send_keys(values[field_type])
+                filled.add(field_type)
+            except Exception as e:
+                self.logger.debug(f"שגיאה בהקלדה לשדה {field_type}: {str(e)}")
         
-        for pattern in self.PASSWORD_KEYWORDS['patterns']:
-            if re.search(pattern, text):
-                password_score.context_score += weight
+        return filled
 
-    def _get_smart_selectors(self, element: WebElement) -> Dict[str, str]:
+    def _get_smart_selectors(self, element: FieldSnapshot,
+                             generated: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """יוצר מזהים חכמים לאלמנט"""
         selectors = {}
         
         try:
-            # איסוף מזהים בסיסיים
+            # איסוף מזהים בסיסיים מתוך תמונת המצב
             for attr in ['id', 'name', 'class', 'type']:
                 value = element.get_attribute(attr)
                 if value:
                     selectors[attr] = value
 
-            # יצירת CSS Selector
-            css_selector = self._create_css_selector(element)
-            if css_selector:
-                selectors['css'] = css_selector
-
-            # יצירת XPath יחסי
-            xpath = self._create_relative_xpath(element)
-            if xpath:
-                selectors['xpath'] = xpath
-
             # הוספת מזהים נוספים אם קיימים
             for attr in ['data-testid', 'aria-label']:
                 value = element.get_attribute(attr)
                 if value:
                     selectors[attr] = value
 
+            # CSS Selector ו-XPath יחסי ייחודיים שנוצרו בדפדפן
+            for key in ['css', 'xpath']:
+                if generated and generated.get(key):
+                    selectors[key] = generated[key]
+
         except Exception as e:
             self.logger.debug(f"שגיאה ביצירת מזהים: {str(e)}")
 
         return selectors
 
-    def _create_css_selector(self, element: WebElement) -> Optional[str]:
-        """יוצר CSS Selector ייחודי לאלמנט"""
+    def _create_unique_selectors(self, elements: List[Optional[WebElement]]) -> List[Optional[Dict[str, str]]]:
+        """יוצר CSS Selector ו-XPath יחסי ייחודיים וקצרים לכל האלמנטים בקריאה אחת"""
+        if not any(elements):
+            return [None] * len(elements)
         try:
-            # ניסיון ליצור סלקטור מינימלי
-            for attr in ['id', 'name', 'data-testid']:
-                value = element.get_attribute(attr)
-                if value:
-                    return f'[{attr}="{value}"]'
-
-            # יצירת סלקטור מורכב יותר
-            selectors = []
-            current = element
-
-            for _ in range(3):  # הגבלת עומק ל-3 רמות
-                tag_name = current.tag_name
-                
-                # הוספת מחלקות
-                classes = current.get_attribute('class')
-                if classes:
-                    class_names = classes.split()
-                    class_selector = '.'.join(class_names)
-                    selectors.insert(0, f"{tag_name}.{class_selector}")
-                else:
-                    selectors.insert(0, tag_name)
-
-                # מעבר להורה
-                parent = current.find_element(By.XPATH, '..')
-                if parent == current:
-                    break
-                current = parent
-
-            return ' > '.join(selectors)
-
-        except Exception:
-            return None
-
-    def _select_best_candidate(self, candidates: List[FieldScore]) -> Optional[FieldScore]:
-        """בחירת המועמד הטוב ביותר מתוך רשימת המועמדים"""
-        if not candidates:
-            return None
-        
-        # מיון המועמדים לפי הציון הכולל שלהם
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda x: x.total_score,
-            reverse=True
-        )
-        
-        return sorted_candidates[0]
-
-    def _validate_field_combination(self, username_field: WebElement, 
-                                  password_field: WebElement) -> bool:
-        """וידוא שהשילוב של שדות ההתחברות הגיוני"""
-        try:
-            # בדיקה שהשדות נמצאים באותו טופס
-            username_form = self._find_parent_form(username_field)
-            password_form = self._find_parent_form(password_field)
-            
-            if username_form and password_form and username_form == password_form:
-                return True
-            
-            # אם השדות לא באותו טופס, בדיקת מרחק מקסימלי ביניהם
-            username_rect = username_field.rect
-            password_rect = password_field.rect
-            
-            distance = ((username_rect['x'] - password_rect['x']) ** 2 + 
-                       (username_rect['y'] - password_rect['y']) ** 2) ** 0.5
-            
-            return distance <= 300  # מרחק מקסימלי סביר בפיקסלים
-            
-        except Exception as e:
-            self.logger.debug(f"שגיאה בוידוא שילוב השדות: {str(e)}")
-            return False
-
-    def _find_parent_form(self, element: WebElement) -> Optional[WebElement]:
-        """מציאת טופס ההורה של אלמנט"""
-        try:
-            current = element
-            for _ in range(5):  # הגבלת עומק החיפוש
-                if current.tag_name == 'form':
-                    return current
-                
-                parent = current.find_element(By.XPATH, '..')
-                if parent == current:  # הגענו לשורש
-                    break
-                current = parent
-                
+            return self.driver.execute_script(
+                UNIQUE_SELECTORS_SCRIPT,
+                elements,
+                self.XPATH_ANCHOR_DEPTH
+            )
         except Exception as e:
-            self.logger.debug(f"שגיאה במציאת טופס הורה: {str(e)}")
-        
-        return None
+            self.logger.debug(f"שגיאה ביצירת מזהים ייחודיים: {str(e)}")
+            return [None] * len(elements)
 
-    def _calculate_keyword_score(self, keyword: str, value: str) -> float:
-        """חישוב ניקוד התאמה למילת מפתח"""
-        score = 0.0
-        
-        # התאמה מדויקת
-        if keyword.lower() == value.lower():
-            score += 3.0
-        
-        # התאמה חלקית
-        elif keyword.lower() in value.lower():
-            # ניקוד גבוה יותר אם מילת המפתח בהתחלה
-            if value.lower().startswith(keyword.lower()):
-                score += 2.0
-            else:
-                score += 1.0
-            
-            # ניקוד נוסף בהתאם לאורך היחסי
-            ratio = len(keyword) / len(value)
-            score += ratio * 0.5
-        
-        return score        
 class AdvancedLoginDialog(QDialog):
     """חלון דו-שיח להוספת ועריכת אתרים"""
     
@@ -692,6 +726,25 @@ class AdvancedLoginDialog(QDialog):
             
             form_layout.addRow(config['label'], container)
         
+        # אופן מילוי לאתר (אתרים שדורשים הקלדה אמיתית)
+        self.fill_mode_combo = QComboBox()
+        self.fill_mode_combo.addItem("לפי ההגדרות הכלליות", '')
+        self.fill_mode_combo.addItem("הקלדה (תו אחר תו)", SmartLoginFieldsFinder.FILL_TYPING)
+        self.fill_mode_combo.addItem("הצבת ערך ישירה (מהיר)", SmartLoginFieldsFinder.FILL_EVENTS)
+        form_layout.addRow('אופן מילוי:', self.fill_mode_combo)
+        
+        # אתרים באותה קבוצה חולקים את העוגיות השמורות (ברירת מחדל: לפי הדומיין)
+        self.session_group_edit = QLineEdit()
+        self.session_group_edit.setPlaceholderText("ברירת מחדל: לפי הדומיין")
+        form_layout.addRow('קבוצת סשן:', self.session_group_edit)
+        
+        # חסימת משאבים לאתר (אתרים שלא עובדים עם חסימה נכנסים לרשימת ההיתרים)
+        self.blocking_combo = QComboBox()
+        self.blocking_combo.addItem("לפי ההגדרות הכלליות", SITE_BLOCKING_DEFAULT)
+        self.blocking_combo.addItem("ללא חסימה (האתר לא עובד עם חסימה)", SITE_BLOCKING_OFF)
+        self.blocking_combo.addItem("חסימה מלאה (גם קובצי עיצוב)", SITE_BLOCKING_FULL)
+        form_layout.addRow('חסימת משאבים:', self.blocking_combo)
+        
         layout.addLayout(form_layout)
         
         # כפתורי פעולה
@@ -720,6 +773,13 @@ class AdvancedLoginDialog(QDialog):
         for field_id, value in self.site_data.items():
             if field_id in self.fields:
                 self.fields[field_id].setText(value)
+        self.fill_mode_combo.setCurrentIndex(
+            max(self.fill_mode_combo.findData(self.site_data.get('fill_mode', '')), 0)
+        )
+        self.session_group_edit.setText(self.site_data.get('session_group', ''))
+        self.blocking_combo.setCurrentIndex(
+            max(self.blocking_combo.findData(self.site_data.get('resource_blocking', '')), 0)
+        )
 
     def get_data(self):
         """קבלת הנתונים שהוזנו"""
@@ -727,16 +787,168 @@ class AdvancedLoginDialog(QDialog):
             'site_name': self.fields['site_name'].text(),
             'url': self.fields['url'].text(),
             'username': self.fields['username'].text(),
-            'password': self.fields['password'].text()
-        }        
+            'password': self.fields['password'].text(),
+            'fill_mode': self.fill_mode_combo.currentData(),
+            'session_group': self.session_group_edit.text().strip(),
+            'resource_blocking': self.blocking_combo.currentData()
+        }
+
+    def is_complete(self, data: Dict) -> bool:
+        """בדיקה שכל שדות החובה מולאו"""
+        return all(data[field_id] for field_id in self.fields)
+
+class BulkLoginDialog(QDialog):
+    """טבלת תוצאות להתחברות לכמה אתרים במקביל, עם הזמן הכולל"""
+
+    COLUMNS = ["אתר", "מצב", "זמן (שניות)", "פרטים"]
+
+    def __init__(self, parent, worker: LoginWorker, jobs: List[LoginJob]):
+        super().__init__(parent)
+        self.worker = worker
+        self.jobs = jobs
+        self.rows = {job.job_id: row for row, job in enumerate(jobs)}
+        self.started = time.perf_counter()
+        self.finished = None
+        self.setWindowTitle(f"התחברות ל-{len(jobs)} אתרים")
+        self.setMinimumSize(600, 350)
+        self.setup_ui()
+
+        self.worker.job_started.connect(self._on_started)
+        self.worker.job_progress.connect(self._on_progress)
+        self.worker.job_succeeded.connect(self._on_succeeded)
+        self.worker.job_failed.connect(self._on_failed)
+        self.worker.job_cancelled.connect(self._on_cancelled)
+
+        # עדכון הזמן הכולל כל עוד יש התחברויות פעילות
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._update_summary)
+        self.timer.start(500)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(len(self.jobs), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        for row, job in enumerate(self.jobs):
+            self.table.setItem(row, 0, QTableWidgetItem(job.site_name))
+            self._set_row(job, "בתור")
+
+        self.summary_label = QLabel()
+
+        buttons_layout = QHBoxLayout()
+        self.cancel_btn = QPushButton("בטל את כולן")
+        self.cancel_btn.clicked.connect(self.cancel_all)
+        close_btn = QPushButton("סגור")
+        close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(close_btn)
+
+        layout.addWidget(self.table)
+        layout.addWidget(self.summary_label)
+        layout.addLayout(buttons_layout)
+        self._update_summary()
+
+    def cancel_all(self):
+        """ביטול ההתחברויות של הקבוצה שעדיין לא הסתיימו"""
+        for job in self.jobs:
+            if job.active:
+                job.cancel()
+
+    def _set_row(self, job: LoginJob, status: str, details: str = ''):
+        row = self.rows[job.job_id]
+        duration = job.duration
+        self.table.setItem(row, 1, QTableWidgetItem(status))
+        self.table.setItem(row, 2, QTableWidgetItem(f"{duration:.1f}" if duration is not None else ''))
+        self.table.setItem(row, 3, QTableWidgetItem(details))
+
+    def _on_started(self, job: LoginJob):
+        if job.job_id in self.rows:
+            self._set_row(job, "מתחבר")
+
+    def _on_progress(self, job: LoginJob, message: str):
+        if job.job_id in self.rows:
+            self._set_row(job, "מתחבר", message)
+
+    def _on_succeeded(self, job: LoginJob, result: LoginResult):
+        if job.job_id not in self.rows:
+            return
+        outcome = result.outcome
+        if result.session is not None and result.session.authenticated:
+            self._set_row(job, "מחובר (סשן שמור)", f"{result.session.restored_cookies} עוגיות")
+        elif outcome is None or outcome.succeeded:
+            details = outcome.reason if outcome else "הטופס מולא"
+            if result.network:
+                details += f" | {describe_network(result.network)}"
+            self._set_row(job, "הצליחה", details)
+        else:
+            self._set_row(job, "לא ודאי", outcome.reason)
+        self._job_finished()
+
+    def _on_failed(self, job: LoginJob, error: str):
+        if job.job_id in self.rows:
+            self._set_row(job, "נכשלה", error)
+            self._job_finished()
+
+    def _on_cancelled(self, job: LoginJob):
+        if job.job_id in self.rows:
+            self._set_row(job, "בוטלה")
+            self._job_finished()
+
+    def _job_finished(self):
+        if any(job.active for job in self.jobs):
+            self._update_summary()
+            return
+
+        # כל ההתחברויות הסתיימו - עצירת המדידה וניתוק מהאותות של התהליכון
+        self.finished = time.perf_counter()
+        self.timer.stop()
+        self.cancel_btn.setEnabled(False)
+        self.worker.job_started.disconnect(self._on_started)
+        self.worker.job_progress.disconnect(self._on_progress)
+        self.worker.job_succeeded.disconnect(self._on_succeeded)
+        self.worker.job_failed.disconnect(self._on_failed)
+        self.worker.job_cancelled.disconnect(self._on_cancelled)
+        self._update_summary()
+        if not self.isVisible():
+            self.deleteLater()
+
+    def _update_summary(self):
+        """הזמן הכולל מול סכום זמני ההתחברויות - כמה חסכה ההרצה המקבילית"""
+        wall_clock = (self.finished or time.perf_counter()) - self.started
+        durations = [job.duration for job in self.jobs if job.duration is not None]
+        done = sum(1 for job in self.jobs if not job.active)
+        self.summary_label.setText(
+            f"הסתיימו {done} מתוך {len(self.jobs)} | זמן כולל: {wall_clock:.1f} שניות | "
+            f"סכום זמני ההתחברויות: {sum(durations):.1f} שניות"
+        )
+
+    def closeEvent(self, event):
+        # חלון של קבוצה שהסתיימה נמחק; אחרת רק מוסתר והטבלה ממשיכה להתעדכן
+        if self.finished is not None:
+            self.deleteLater()
+        event.accept()
+
+
 class AdvancedLoginManager(QMainWindow):
+    # אופני התחברות: דפדפן, או HTTP עם מעבר לדפדפן בעת הצורך
+    LOGIN_MODE_BROWSER = 'browser'
+    LOGIN_MODE_HTTP = 'http'
+
     def __init__(self):
         super().__init__()
         self.logger = logging.getLogger(__name__)
-        self.login_worker = None
         # הגדרת המשתנים הבסיסיים
         self.sites_file = 'sites.json'
         self.key_file = 'key.key'
+        self.profiles_dir = 'login_profiles'
+        self.login_results_file = 'login_results.jsonl'
+        self.timing_history = TimingHistory('login_timings.jsonl')
+        self.sessions_dir = 'sessions'
+        self.browser_pids_file = 'browser_pids.json'
+        self.health_pids_file = 'health_browser_pids.json'
         self.settings = QSettings('AdvancedLoginManager', 'Settings')
         self.sites = {}
         self.cipher = None
@@ -748,14 +960,69 @@ class AdvancedLoginManager(QMainWindow):
         self.edit_btn = None  # חדש: שמירת התייחסות לכפתור עריכה
         self.system_password = self.settings.value('SystemPassword', '')
         self.password_protected = self.settings.value('PasswordProtected', False, type=bool)
+        # דפדפנים שנשארו פתוחים מהפעלה קודמת שקרסה
+        orphans = kill_orphans(self.browser_pids_file) + kill_orphans(self.health_pids_file)
+        if orphans:
+            self.logger.info(f"נסגרו {orphans} תהליכי דפדפן שנשארו מהפעלה קודמת")
+        # מאגר דפדפנים חמים שמשותף לכל ההתחברויות, ורשם של כל הדפדפנים שהתוכנה הפעילה
+        self.driver_pool = DriverPool(
+            max_size=self.settings.value('BrowserPoolSize', 2, type=int),
+            max_uses=self.settings.value('BrowserMaxUses', 25, type=int),
+            max_browsers=self.settings.value('BrowserMaxOpen', 6, type=int),
+            max_rss_mb=self.settings.value('BrowserMaxMemoryMB', 0, type=int),
+            idle_timeout=self.settings.value('BrowserIdleMinutes', 120, type=int) * 60,
+            pid_file=self.browser_pids_file
+        )
+        self.driver_pool.start_reaper()
+        # התחברות ללא דפדפן לאתרים עם טופס HTML פשוט (חיבורים משותפים לכל ההתחברויות)
+        self.http_client = HttpLoginClient()
+        # תהליכון רקע שמריץ את ההתחברויות מהתור כדי שהממשק לא ייתקע
+        self.login_worker = LoginWorker(self.perform_login, self, max_parallel=self.driver_pool.max_size)
+        self.login_worker.job_started.connect(self._on_login_started)
+        self.login_worker.job_progress.connect(self._on_login_progress)
+        self.login_worker.job_succeeded.connect(self._on_login_succeeded)
+        self.login_worker.job_failed.connect(self._on_login_failed)
+        self.login_worker.job_cancelled.connect(self._on_login_cancelled)
+        # בדיקות תקינות תקופתיות: מאגר דפדפנים ללא חלון ותהליכון נפרדים, כדי לא לתפוס דפדפן של המשתמש
+        health_concurrency = self.settings.value('HealthCheckConcurrency', 1, type=int)
+        self.health_scheduler = HealthScheduler(
+            'health_checks.json',
+            interval_hours=self.settings.value('HealthCheckIntervalHours', 24, type=int)
+        )
+        self.health_pool = DriverPool(
+            max_size=health_concurrency, warm_count=0,
+            driver_factory=lambda: webdriver.Chrome(options=headless_chrome_options()),
+            max_browsers=health_concurrency, idle_timeout=300, pid_file=self.health_pids_file
+        )
+        self.health_pool.start_reaper()
+        self.health_worker = LoginWorker(self.perform_health_check, self, max_parallel=health_concurrency)
+        self.health_worker.job_succeeded.connect(self._on_health_check_succeeded)
+        self.health_worker.job_failed.connect(self._on_health_check_failed)
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self.run_due_health_checks)
+        self.jobs_list = None
+        self.browsers_list = None
 
         # אתחול בסדר הנכון
         self.init_encryption()
+        # פרטי ההתחברות נשמרים בזיכרון מוצפנים ומפוענחים רק בשימוש; הערכים המפוענחים נמחקים אחרי זמן קצוב
+        self.plaintext_cache = PlaintextCache(
+            self.decrypt, ttl=self.settings.value('CredentialCacheSeconds', 300, type=int)
+        )
+        self.cache_timer = QTimer(self)
+        self.cache_timer.timeout.connect(self.plaintext_cache.purge_expired)
+        self.cache_timer.start(30 * 1000)
+        # עוגיות הסשן נשמרות מוצפנות במפתח של האתרים
+        self.session_store = SessionStore(self.sessions_dir, self.encrypt, self.decrypt)
         self.setup_ui()
         self.load_sites()
         self.update_sites_list()
         self.setup_tray()
         self.update_edit_button_state()  # חדש: עדכון מצב כפתור העריכה
+        if self.settings.value('WarmBrowserOnStart', False, type=bool):
+            self.driver_pool.warm_up()
+        # הסבב נבדק כל דקה; הבדיקות עצמן רצות רק כשהגיע זמנן
+        self.health_timer.start(60 * 1000)
 
         
     def set_system_password(self):
@@ -884,6 +1151,34 @@ class AdvancedLoginManager(QMainWindow):
             self.logger.error(f"שגיאה בפענוח: {str(e)}")
             return ""      
 
+    def reveal_site(self, site_data: Dict) -> Dict:
+        """עותק של רשומת האתר עם פרטי ההתחברות מפוענחים, לשימוש רגעי"""
+        return reveal(site_data, self.plaintext_cache)
+
+    def _unlock_job(self, job: LoginJob) -> Dict:
+        """פענוח פרטי ההתחברות של עבודה בתחילת הריצה; מחזיר את הרשומה המוצפנת להחזרה בסיום"""
+        encrypted_site = job.site_data
+        # הטקסט המוצפן נלקח מהרשומה הנוכחית ולא מזו שנשמרה בהוספה לתור - המפתח אולי הוחלף בינתיים
+        current = self.sites.get(job.site_name)
+        source = dict(encrypted_site)
+        if current:
+            source.update({field_name: current.get(field_name, '') for field_name in ENCRYPTED_FIELDS})
+        job.site_data = self.reveal_site(source)
+        return encrypted_site
+
+    def _encrypt_credentials(self, site_data: Dict) -> Dict:
+        """הצפנת פרטי ההתחברות שהוזנו בחלון האתר לפני שמירתם ברשומה"""
+        for field_name in ENCRYPTED_FIELDS:
+            site_data[field_name] = self.encrypt(site_data.get(field_name, ''))
+        return site_data
+
+    def _is_encrypted(self, value: str) -> bool:
+        try:
+            self.cipher.decrypt(value.encode())
+            return True
+        except Exception:
+            return False
+
     def init_encryption(self):
         """אתחול מערכת ההצפנה"""
         try:
@@ -912,8 +1207,13 @@ class AdvancedLoginManager(QMainWindow):
                             'url': site_data['url'],
                             'username_field': site_data.get('username_field', ''),
                             'password_field': site_data.get('password_field', ''),
-                            'username': self.decrypt(site_data['username']),
-                            'password': self.decrypt(site_data['password'])
+                            'fill_mode': site_data.get('fill_mode', ''),
+                            'session_group': site_data.get('session_group', ''),
+                            'resource_blocking': site_data.get('resource_blocking', ''),
+                            'recipe': site_data.get('recipe'),
+                            # נשמרים מוצפנים - הפענוח רק בהתחברות, עריכה או העתקה
+                            'username': site_data['username'],
+                            'password': site_data['password']
                         }
             except Exception as e:
                 QMessageBox.critical(self, "שגיאה", f"שגיאה בטעינת קובץ האתרים: {str(e)}")
@@ -928,8 +1228,12 @@ class AdvancedLoginManager(QMainWindow):
                     'url': site_data['url'],
                     'username_field': site_data.get('username_field', ''),
                     'password_field': site_data.get('password_field', ''),
-                    'username': self.encrypt(site_data['username']),
-                    'password': self.encrypt(site_data['password'])
+                    'fill_mode': site_data.get('fill_mode', ''),
+                    'session_group': site_data.get('session_group', ''),
+                    'resource_blocking': site_data.get('resource_blocking', ''),
+                    'recipe': site_data.get('recipe'),
+                    'username': site_data['username'],
+                    'password': site_data['password']
                 }
             
             with open(self.sites_file, 'w', encoding='utf-8') as f:
@@ -958,6 +1262,8 @@ class AdvancedLoginManager(QMainWindow):
         
         self.tab_widget.addTab(sites_tab, "אתרים שמורים")
         self.tab_widget.addTab(settings_tab, "הגדרות")
+        self.tab_widget.addTab(self.create_statistics_tab(), "סטטיסטיקות")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
         
@@ -996,7 +1302,7 @@ class AdvancedLoginManager(QMainWindow):
         layout = QVBoxLayout(tab)
         
         self.sites_list = QListWidget()
-        self.sites_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
+        self.sites_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         self.sites_list.itemDoubleClicked.connect(self.login_to_site)
         self.sites_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.sites_list.customContextMenuRequested.connect(self.show_site_context_menu)
@@ -1013,11 +1319,33 @@ class AdvancedLoginManager(QMainWindow):
         login_btn = QPushButton("התחבר")
         login_btn.clicked.connect(self.login_to_site)
         
-        for btn in [self.edit_btn, delete_btn, login_btn]:
+        bulk_login_btn = QPushButton("התחבר לנבחרים")
+        bulk_login_btn.setToolTip("התחברות במקביל לכל האתרים שנבחרו (Ctrl/Shift לבחירה מרובה)")
+        bulk_login_btn.clicked.connect(self.login_to_selected_sites)
+        
+        for btn in [self.edit_btn, delete_btn, login_btn, bulk_login_btn]:
             buttons_layout.addWidget(btn)
         
+        # התחברויות בתור ובביצוע
+        jobs_group = QGroupBox("התחברויות פעילות")
+        jobs_layout = QVBoxLayout(jobs_group)
+        self.jobs_list = QListWidget()
+        self.jobs_list.setMaximumHeight(110)
+        
+        jobs_buttons = QHBoxLayout()
+        cancel_job_btn = QPushButton("בטל נבחרת")
+        cancel_job_btn.clicked.connect(self.cancel_selected_login)
+        cancel_all_btn = QPushButton("בטל הכול")
+        cancel_all_btn.clicked.connect(lambda: self.login_worker.cancel())
+        jobs_buttons.addWidget(cancel_job_btn)
+        jobs_buttons.addWidget(cancel_all_btn)
+        
+        jobs_layout.addWidget(self.jobs_list)
+        jobs_layout.addLayout(jobs_buttons)
+        
         layout.addWidget(self.sites_list)
         layout.addLayout(buttons_layout)
+        layout.addWidget(jobs_group)
         
         return tab
 
@@ -1036,7 +1364,42 @@ class AdvancedLoginManager(QMainWindow):
             lambda state: self.settings.setValue('MinimizeToTray', bool(state))
         )
         
+        profile_cb = QCheckBox("מדידת ביצועים בהתחברויות (שמירת פרופיל JSON)")
+        profile_cb.setChecked(self.settings.value('ProfileLogins', False, type=bool))
+        profile_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('ProfileLogins', bool(state))
+        )
+        
+        submit_cb = QCheckBox("שליחת טופס ההתחברות ובדיקת הצלחה")
+        submit_cb.setChecked(self.settings.value('SubmitLogin', True, type=bool))
+        submit_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('SubmitLogin', bool(state))
+        )
+        
+        session_cb = QCheckBox("שמירת סשן לכל אתר ודילוג על ההתחברות כשכבר מחוברים")
+        session_cb.setChecked(self.settings.value('ReuseSessions', False, type=bool))
+        session_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('ReuseSessions', bool(state))
+        )
+        
+        block_cb = QCheckBox("חסימת תמונות, גופנים, וידאו ורכיבי מעקב בזמן ההתחברות")
+        block_cb.setChecked(self.settings.value('BlockResources', False, type=bool))
+        block_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('BlockResources', bool(state))
+        )
+        
+        warm_cb = QCheckBox("הפעלת דפדפן מראש בפתיחת התוכנה")
+        warm_cb.setChecked(self.settings.value('WarmBrowserOnStart', False, type=bool))
+        warm_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('WarmBrowserOnStart', bool(state))
+        )
+        
         general_layout.addWidget(minimize_cb)
+        general_layout.addWidget(profile_cb)
+        general_layout.addWidget(submit_cb)
+        general_layout.addWidget(session_cb)
+        general_layout.addWidget(block_cb)
+        general_layout.addWidget(warm_cb)
         
         # הגדרות אבטחה
         security_group = QGroupBox("הגדרות אבטחה")
@@ -1052,16 +1415,328 @@ class AdvancedLoginManager(QMainWindow):
         change_key_btn = QPushButton("החלף מפתח הצפנה...")
         change_key_btn.clicked.connect(self.change_encryption_key)
         
+        cache_layout = QHBoxLayout()
+        cache_spin = QSpinBox()
+        cache_spin.setRange(0, 3600)
+        cache_spin.setSuffix(" שניות")
+        cache_spin.setSpecialValueText("ללא שמירה")
+        cache_spin.setValue(int(self.plaintext_cache.ttl))
+        cache_spin.valueChanged.connect(self._set_credential_cache_ttl)
+        cache_layout.addWidget(QLabel("שמירת פרטים מפוענחים בזיכרון:"))
+        cache_layout.addWidget(cache_spin)
+        
         security_layout.addWidget(password_protection_cb)
         security_layout.addWidget(set_password_btn)
         security_layout.addWidget(change_key_btn)
+        security_layout.addLayout(cache_layout)
+        
+        # הגדרות זיהוי שדות
+        detection_group = QGroupBox("זיהוי שדות התחברות")
+        detection_layout = QFormLayout(detection_group)
+        
+        scoring_combo = QComboBox()
+        scoring_combo.addItem("היוריסטי", 'heuristic')
+        if numpy_available():
+            scoring_combo.addItem("וקטורי (משקלים מאומנים)", 'vector')
+        scoring_combo.setCurrentIndex(
+            max(scoring_combo.findData(self.settings.value('ScoringMode', 'heuristic')), 0)
+        )
+        scoring_combo.currentIndexChanged.connect(
+            lambda index: self.settings.setValue('ScoringMode', scoring_combo.itemData(index))
+        )
+        
+        weights_btn = QPushButton(self.settings.value('ScoringWeightsFile', '') or "בחר קובץ משקלים...")
+        weights_btn.clicked.connect(lambda: self.choose_weights_file(weights_btn))
+        
+        fill_combo = QComboBox()
+        fill_combo.addItem("הקלדה (תו אחר תו)", SmartLoginFieldsFinder.FILL_TYPING)
+        fill_combo.addItem("הצבת ערך ישירה (מהיר)", SmartLoginFieldsFinder.FILL_EVENTS)
+        fill_combo.setCurrentIndex(max(fill_combo.findData(
+            self.settings.value('FillMode', SmartLoginFieldsFinder.FILL_TYPING)
+        ), 0))
+        fill_combo.currentIndexChanged.connect(
+            lambda index: self.settings.setValue('FillMode', fill_combo.itemData(index))
+        )
+        
+        login_mode_combo = QComboBox()
+        login_mode_combo.addItem("דפדפן", self.LOGIN_MODE_BROWSER)
+        login_mode_combo.addItem("HTTP ללא דפדפן (מעבר לדפדפן כשנדרש JavaScript)", self.LOGIN_MODE_HTTP)
+        login_mode_combo.setCurrentIndex(max(login_mode_combo.findData(
+            self.settings.value('LoginMode', self.LOGIN_MODE_BROWSER)
+        ), 0))
+        login_mode_combo.currentIndexChanged.connect(
+            lambda index: self.settings.setValue('LoginMode', login_mode_combo.itemData(index))
+        )
+        
+        http_browser_cb = QCheckBox("פתיחת האתר בדפדפן אחרי התחברות HTTP")
+        http_browser_cb.setChecked(self.settings.value('HttpOpenBrowser', True, type=bool))
+        http_browser_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('HttpOpenBrowser', bool(state))
+        )
+        
+        detection_layout.addRow("אופן התחברות:", login_mode_combo)
+        detection_layout.addRow("", http_browser_cb)
+        detection_layout.addRow("שיטת ניקוד:", scoring_combo)
+        detection_layout.addRow("קובץ משקלים:", weights_btn)
+        detection_layout.addRow("אופן מילוי:", fill_combo)
         
         layout.addWidget(general_group)
+        layout.addWidget(self.create_browsers_group())
+        layout.addWidget(self.create_health_check_group())
         layout.addWidget(security_group)
+        layout.addWidget(detection_group)
         layout.addStretch()
         
         return tab
 
+    def create_browsers_group(self) -> QGroupBox:
+        """הגדרות הדפדפנים הפתוחים: מקביליות, מגבלות, סגירה אחרי חוסר פעילות ותצוגת מצב"""
+        group = QGroupBox("ניהול דפדפנים")
+        layout = QFormLayout(group)
+        pool = self.driver_pool
+        
+        pool_spin = QSpinBox()
+        pool_spin.setRange(1, 8)
+        pool_spin.setValue(pool.max_size)
+        pool_spin.valueChanged.connect(self.set_browser_pool_size)
+        
+        max_open_spin = QSpinBox()
+        max_open_spin.setRange(0, 50)
+        max_open_spin.setSpecialValueText("ללא מגבלה")
+        max_open_spin.setValue(pool.max_browsers)
+        max_open_spin.valueChanged.connect(
+            lambda value: self._set_pool_limit('BrowserMaxOpen', 'max_browsers', value)
+        )
+        
+        memory_spin = QSpinBox()
+        memory_spin.setRange(0, 64000)
+        memory_spin.setSingleStep(256)
+        memory_spin.setSuffix(" MB")
+        memory_spin.setSpecialValueText("ללא מגבלה")
+        memory_spin.setValue(pool.max_rss_mb)
+        memory_spin.valueChanged.connect(
+            lambda value: self._set_pool_limit('BrowserMaxMemoryMB', 'max_rss_mb', value)
+        )
+        
+        idle_spin = QSpinBox()
+        idle_spin.setRange(0, 24 * 60)
+        idle_spin.setSuffix(" דקות")
+        idle_spin.setSpecialValueText("לעולם לא")
+        idle_spin.setValue(int(pool.idle_timeout // 60))
+        idle_spin.valueChanged.connect(
+            lambda value: self._set_pool_limit('BrowserIdleMinutes', 'idle_timeout', value * 60, value)
+        )
+        
+        self.browsers_list = QListWidget()
+        self.browsers_list.setMaximumHeight(90)
+        refresh_btn = QPushButton("רענן")
+        refresh_btn.clicked.connect(self.refresh_browsers_list)
+        
+        layout.addRow("התחברויות במקביל:", pool_spin)
+        layout.addRow("מספר דפדפנים פתוחים מרבי:", max_open_spin)
+        layout.addRow("מגבלת זיכרון לכל הדפדפנים:", memory_spin)
+        layout.addRow("סגירת דפדפן לא פעיל אחרי:", idle_spin)
+        layout.addRow(self.browsers_list)
+        layout.addRow(refresh_btn)
+        self.refresh_browsers_list()
+        return group
+
+    def create_health_check_group(self) -> QGroupBox:
+        """הגדרות בדיקת התקינות התקופתית של פרטי ההתחברות"""
+        group = QGroupBox("בדיקת תקינות פרטי התחברות")
+        layout = QFormLayout(group)
+        
+        enabled_cb = QCheckBox("בדיקה תקופתית ברקע (דפדפן ללא חלון)")
+        enabled_cb.setChecked(self.settings.value('HealthCheckEnabled', False, type=bool))
+        enabled_cb.stateChanged.connect(
+            lambda state: self.settings.setValue('HealthCheckEnabled', bool(state))
+        )
+        
+        interval_spin = QSpinBox()
+        interval_spin.setRange(1, 24 * 30)
+        interval_spin.setSuffix(" שעות")
+        interval_spin.setValue(int(self.health_scheduler.interval // 3600))
+        interval_spin.valueChanged.connect(self._set_health_interval)
+        
+        concurrency_spin = QSpinBox()
+        concurrency_spin.setRange(1, 4)
+        concurrency_spin.setValue(self.health_worker.max_parallel)
+        concurrency_spin.valueChanged.connect(self._set_health_concurrency)
+        
+        check_now_btn = QPushButton("בדוק את כל האתרים עכשיו")
+        check_now_btn.clicked.connect(lambda: self.check_sites_health(list(self.sites)))
+        
+        layout.addRow(enabled_cb)
+        layout.addRow("בדיקה כל:", interval_spin)
+        layout.addRow("בדיקות במקביל:", concurrency_spin)
+        layout.addRow(check_now_btn)
+        return group
+
+    def _set_credential_cache_ttl(self, seconds: int):
+        self.settings.setValue('CredentialCacheSeconds', seconds)
+        self.plaintext_cache.ttl = seconds
+        self.plaintext_cache.clear()
+
+    def _set_health_interval(self, hours: int):
+        self.settings.setValue('HealthCheckIntervalHours', hours)
+        self.health_scheduler.interval = hours * 3600
+
+    def _set_health_concurrency(self, value: int):
+        self.settings.setValue('HealthCheckConcurrency', value)
+        self.health_worker.max_parallel = value
+        self.health_pool.max_size = value
+        self.health_pool.max_browsers = value
+
+    def _set_pool_limit(self, key: str, attribute: str, value, stored=None):
+        self.settings.setValue(key, value if stored is None else stored)
+        setattr(self.driver_pool, attribute, value)
+
+    def create_statistics_tab(self):
+        """יצירת טאב סטטיסטיקות: אחוזוני זמן לפי אתר ושלב, ומגמה לפי יום"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        filters = QHBoxLayout()
+        self.stats_site_combo = QComboBox()
+        self.stats_period_combo = QComboBox()
+        for label, days in (("7 ימים אחרונים", 7), ("30 ימים אחרונים", 30),
+                            ("90 ימים אחרונים", 90), ("כל ההיסטוריה", 0)):
+            self.stats_period_combo.addItem(label, days)
+        self.stats_period_combo.setCurrentIndex(1)
+        refresh_btn = QPushButton("רענן")
+        refresh_btn.clicked.connect(self.refresh_statistics)
+        self.stats_site_combo.activated.connect(self.refresh_statistics)
+        self.stats_period_combo.activated.connect(self.refresh_statistics)
+        filters.addWidget(QLabel("אתר:"))
+        filters.addWidget(self.stats_site_combo, 1)
+        filters.addWidget(QLabel("תקופה:"))
+        filters.addWidget(self.stats_period_combo)
+        filters.addWidget(refresh_btn)
+        layout.addLayout(filters)
+        
+        # שורה לכל אתר (מהאיטי ביותר) או לכל שלב כשנבחר אתר אחד; כל תא: p50 / p95
+        stages_group = QGroupBox("זמני שלבים (p50 / p95, מילישניות)")
+        stages_layout = QVBoxLayout(stages_group)
+        self.stats_table = QTableWidget()
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        stages_layout.addWidget(self.stats_table)
+        layout.addWidget(stages_group, 2)
+        
+        trend_group = QGroupBox("מגמה לפי יום")
+        trend_layout = QVBoxLayout(trend_group)
+        self.trend_table = QTableWidget(0, 5)
+        self.trend_table.setHorizontalHeaderLabels(["יום", "התחברויות", "הצלחה", "p50 (שניות)", "p95 (שניות)"])
+        self.trend_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.trend_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        trend_layout.addWidget(self.trend_table)
+        layout.addWidget(trend_group, 1)
+        
+        return tab
+
+    def _on_tab_changed(self, index: int):
+        if self.tab_widget.tabText(index) == "סטטיסטיקות":
+            self.refresh_statistics()
+
+    def refresh_statistics(self):
+        """טעינת היסטוריית הזמנים ועדכון הטבלאות לפי האתר והתקופה שנבחרו"""
+        days = self.stats_period_combo.currentData()
+        since = time.time() - days * 86400 if days else None
+        entries = self.timing_history.load(since)
+        
+        # רשימת האתרים לפי מה שנמדד, בלי לאבד את הבחירה הנוכחית
+        selected = self.stats_site_combo.currentData()
+        self.stats_site_combo.clear()
+        self.stats_site_combo.addItem("כל האתרים", None)
+        for site in sorted({entry.get('site', '') for entry in entries}):
+            self.stats_site_combo.addItem(site, site)
+        self.stats_site_combo.setCurrentIndex(max(self.stats_site_combo.findData(selected), 0))
+        selected = self.stats_site_combo.currentData()
+        
+        if selected:
+            entries = [entry for entry in entries if entry.get('site') == selected]
+            self._fill_stage_rows(stage_stats(entries).get(selected, {}))
+        else:
+            self._fill_site_rows(stage_stats(entries))
+        
+        trend = daily_trend(entries)
+        self.trend_table.setRowCount(len(trend))
+        for row, day in enumerate(reversed(trend)):
+            values = [
+                day['day'], str(day['count']), f"{day['success_rate']:.0%}",
+                f"{day['p50'] / 1000:.1f}" if day['p50'] is not None else "-",
+                f"{day['p95'] / 1000:.1f}" if day['p95'] is not None else "-"
+            ]
+            for column, value in enumerate(values):
+                self.trend_table.setItem(row, column, QTableWidgetItem(value))
+
+    def _fill_site_rows(self, stats: Dict[str, Dict[str, Dict]]):
+        """שורה לכל אתר, מהאיטי ביותר לפי החציון של הזמן הכולל"""
+        sites = slowest_sites(stats)
+        self.stats_table.clear()
+        self.stats_table.setColumnCount(len(SUMMARY_STAGES) + 2)
+        self.stats_table.setHorizontalHeaderLabels(["אתר", "התחברויות"] + SUMMARY_STAGES)
+        self.stats_table.setRowCount(len(sites))
+        for row, site in enumerate(sites):
+            self.stats_table.setItem(row, 0, QTableWidgetItem(site))
+            self.stats_table.setItem(row, 1, QTableWidgetItem(str(stats[site]['total']['count'])))
+            for column, stage in enumerate(SUMMARY_STAGES, start=2):
+                self.stats_table.setItem(row, column, QTableWidgetItem(self._format_percentiles(stats[site].get(stage))))
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+    def _fill_stage_rows(self, stages: Dict[str, Dict]):
+        """שורה לכל שלב של האתר שנבחר, לפי סדר התהליך"""
+        order = DriverProfiler.STAGES + ['total']
+        names = sorted(stages, key=lambda n: order.index(n) if n in order else len(order))
+        self.stats_table.clear()
+        self.stats_table.setColumnCount(4)
+        self.stats_table.setHorizontalHeaderLabels(["שלב", "מדידות", "p50 (ms)", "p95 (ms)"])
+        self.stats_table.setRowCount(len(names))
+        for row, name in enumerate(names):
+            stage = stages[name]
+            values = [name, str(stage['count']), f"{stage['p50']:.0f}", f"{stage['p95']:.0f}"]
+            for column, value in enumerate(values):
+                self.stats_table.setItem(row, column, QTableWidgetItem(value))
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+    @staticmethod
+    def _format_percentiles(stage: Optional[Dict]) -> str:
+        if not stage:
+            return "-"
+        return f"{stage['p50']:.0f} / {stage['p95']:.0f}"
+
+    def refresh_browsers_list(self):
+        """הצגת הדפדפנים הפתוחים עם הזיכרון וזמן חוסר הפעילות"""
+        self.browsers_list.clear()
+        for browser in self.driver_pool.browsers():
+            state = "בשימוש" if browser['busy'] else ("הוצא משימוש" if browser['retired'] else "פנוי")
+            memory = f"{browser['rss_mb']} MB" if browser['rss_mb'] is not None else "זיכרון לא ידוע"
+            self.browsers_list.addItem(
+                f"{state} | {browser['tabs']} לשוניות | {memory} | "
+                f"לא פעיל {browser['idle_seconds'] // 60} דקות | {browser['uses']} התחברויות"
+            )
+        if not self.browsers_list.count():
+            self.browsers_list.addItem("אין דפדפנים פתוחים")
+
+    def set_browser_pool_size(self, size: int):
+        """עדכון מספר הדפדפנים המרבי במאגר"""
+        self.settings.setValue('BrowserPoolSize', size)
+        self.driver_pool.max_size = size
+        self.login_worker.max_parallel = size
+
+    def choose_weights_file(self, button: QPushButton):
+        """בחירת קובץ משקלים מאומנים לניקוד הוקטורי"""
+        path, _ = QFileDialog.getOpenFileName(self, "בחר קובץ משקלים", "", "JSON (*.json)")
+        if path:
+            self.settings.setValue('ScoringWeightsFile', path)
+            button.setText(path)
+
+    def create_scorer(self) -> LoginFieldScorer:
+        """מנוע הניקוד לפי ההגדרות"""
+        return create_scorer(
+            self.settings.value('ScoringMode', 'heuristic'),
+            self.settings.value('ScoringWeightsFile', '') or None
+        )
+
     def setup_tray(self):
         """הגדרת אייקון מגש המערכת"""
         self.tray_icon = QSystemTrayIcon(self)
@@ -1085,7 +1760,7 @@ class AdvancedLoginManager(QMainWindow):
         dialog = AdvancedLoginDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             site_data = dialog.get_data()
-            if not all(site_data.values()):
+            if not dialog.is_complete(site_data):
                 QMessageBox.warning(self, "שגיאה", "יש למלא את כל השדות")
                 return
             
@@ -1094,7 +1769,7 @@ class AdvancedLoginManager(QMainWindow):
                 QMessageBox.warning(self, "שגיאה", "שם האתר כבר קיים")
                 return
             
-            self.sites[site_name] = site_data
+            self.sites[site_name] = self._encrypt_credentials(site_data)
             self.save_sites()
             self.update_sites_list()
 
@@ -1106,18 +1781,27 @@ class AdvancedLoginManager(QMainWindow):
             return
         
         site_name = current_item.text()
-        dialog = AdvancedLoginDialog(self, self.sites[site_name])
+        dialog = AdvancedLoginDialog(self, self.reveal_site(self.sites[site_name]))
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             site_data = dialog.get_data()
-            if not all(site_data.values()):
+            if not dialog.is_complete(site_data):
                 QMessageBox.warning(self, "שגיאה", "יש למלא את כל השדות")
                 return
             
+            # שמירת מזהי השדות השמורים כל עוד כתובת האתר לא השתנתה
+            old_data = self.sites[site_name]
+            if old_data['url'] == site_data['url']:
+                site_data['username_field'] = old_data.get('username_field', '')
+                site_data['password_field'] = old_data.get('password_field', '')
+            site_data['recipe'] = old_data.get('recipe')
+            
             if site_name != site_data['site_name']:
                 del self.sites[site_name]
+            # פרטים שנערכו נבדקים מחדש בסבב הבא
+            self.health_scheduler.forget(site_name)
             
-            self.sites[site_data['site_name']] = site_data
+            self.sites[site_data['site_name']] = self._encrypt_credentials(site_data)
             self.save_sites()
             self.update_sites_list()
 
@@ -1138,11 +1822,12 @@ class AdvancedLoginManager(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             del self.sites[site_name]
+            self.health_scheduler.forget(site_name)
             self.save_sites()
             self.update_sites_list()
 
     def login_to_site(self, item=None):
-        """ביצוע התחברות לאתר"""
+        """הוספת התחברות לאתר לתור ההתחברויות שרץ ברקע"""
         if not item:
             item = self.sites_list.currentItem()
         if not item:
@@ -1150,118 +1835,515 @@ class AdvancedLoginManager(QMainWindow):
             return
         
         site_name = item.text()
-        site_data = self.sites[site_name]
+        job = self.login_worker.submit(site_name, dict(self.sites[site_name]), self._login_options())
+        self.status_bar.showMessage(f"ההתחברות לאתר {site_name} נוספה לתור", 3000)
+        self._refresh_jobs_list()
+        return job
+
+    def login_to_selected_sites(self):
+        """התחברות במקביל לכל האתרים שנבחרו, עם טבלת תוצאות"""
+        items = self.sites_list.selectedItems()
+        if not items:
+            QMessageBox.warning(self, "שגיאה", "יש לבחור אתרים להתחברות")
+            return
+        
+        # שגיאות של התחברות מרובה מוצגות בטבלה ולא בחלון הודעה לכל אתר
+        options = dict(self._login_options(), bulk=True)
+        jobs = []
+        for item in items:
+            site_name = item.text()
+            jobs.append(self.login_worker.submit(
+                site_name, dict(self.sites[site_name]), dict(options, scorer=self.create_scorer())
+            ))
+        
+        dialog = BulkLoginDialog(self, self.login_worker, jobs)
+        dialog.show()
+        self.status_bar.showMessage(
+            f"{len(jobs)} התחברויות נוספו לתור ({self.login_worker.max_parallel} במקביל)", 3000
+        )
+        self._refresh_jobs_list()
+        return jobs
+
+    def _login_options(self) -> Dict:
+        """ההגדרות של התחברות - נקראות בתהליכון הממשק ועוברות לעבודה"""
+        return {
+            'profile': self.settings.value('ProfileLogins', False, type=bool),
+            'submit': self.settings.value('SubmitLogin', True, type=bool),
+            'reuse_session': self.settings.value('ReuseSessions', False, type=bool),
+            'login_mode': self.settings.value('LoginMode', self.LOGIN_MODE_BROWSER),
+            'http_open_browser': self.settings.value('HttpOpenBrowser', True, type=bool),
+            'block_resources': self.settings.value('BlockResources', False, type=bool),
+            'fill_mode': self.settings.value('FillMode', SmartLoginFieldsFinder.FILL_TYPING),
+            'scorer': self.create_scorer()
+        }
+
+    def perform_login(self, job: LoginJob) -> LoginResult:
+        """ביצוע עבודת התחברות (בתהליכון הרקע - ללא גישה לממשק)"""
+        site_name = job.site_name
+        # הפרטים המפוענחים נמצאים בעבודה רק בזמן הריצה שלה
+        encrypted_site = self._unlock_job(job)
+        
+        # זמני השלבים נמדדים תמיד (להיסטוריה); מדידת הפקודות וקובץ הפרופיל רק אם הופעלו בהגדרות
+        profiler = DriverProfiler(site_name)
+        profile_commands = job.options.get('profile', False)
+        started = time.perf_counter()
+        status = 'error'
         
         try:
-            options = webdriver.ChromeOptions()
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            driver = webdriver.Chrome(options=options)
-            driver.get(site_data['url'])
+            # אתר עם טופס HTML פשוט: התחברות ב-HTTP, ודפדפן רק אם צריך JavaScript או להצגת האתר
+            http_result = None
+            if job.options.get('login_mode') == self.LOGIN_MODE_HTTP:
+                http_result = self._try_http_login(job, profiler)
             
-            # בדיקה אם זה Gmail
-            is_gmail = 'gmail.com' in site_data['url'] or 'accounts.google.com' in site_data['url']
-            
-            if is_gmail:
-                self._handle_gmail_login(driver, site_data)
+            # התחברות שנכשלה, או שהמשתמש לא ביקש דפדפן - בלי לפתוח את האתר
+            if http_result and (not http_result.outcome.succeeded or
+                                not job.options.get('http_open_browser', True)):
+                result = LoginResult(http_result.outcome)
             else:
-                finder = SmartLoginFieldsFinder(driver)
-                login_fields = finder.find_login_fields()
-                
-                if not login_fields:
-                    raise Exception("לא נמצאו שדות התחברות באתר")
-                
-                username = site_data['username']
-                password = site_data['password']
-                
-                for field_type, selectors in login_fields.items():
-                    value = username if field_type == 'username' else password
-                    for selector_type, selector in selectors.items():
-                        try:
-                            if selector_type == 'id':
-                                element = driver.find_element(By.ID, selector)
-                            elif selector_type == 'name':
-                                element = driver.find_element(By.NAME, selector)
-                            elif selector_type == 'css':
-                                element = driver.find_element(By.CSS_SELECTOR, selector)
-                            elif selector_type == 'xpath':
-                                element = driver.find_element(By.XPATH, selector)
-                            else:
-                                continue
-                            
-                            element.clear()
-                            element.send_keys(value)
-                            break
-                        except:
-                            continue
-
-            self.status_bar.showMessage(f"התחברות לאתר {site_name} בוצעה בהצלחה", 5000)
+                job.checkpoint("ממתין לדפדפן...")
+                # דפדפן חם מהמאגר - ההתחברות נפתחת בלשונית חדשה
+                with self.driver_pool.lease(profiler=profiler) as driver:
+                    job.attach(driver)
+                    if profile_commands:
+                        profiler.attach(driver)
+                    # חסימת משאבים בלשונית של ההתחברות בלבד
+                    blocker = ResourceBlocker(driver, site_categories(
+                        job.site_data, job.options.get('block_resources', False)
+                    ))
+                    try:
+                        if http_result:
+                            result = self._open_http_session(driver, job, http_result, profiler)
+                        else:
+                            result = self._run_login(driver, job, profiler, blocker)
+                    finally:
+                        # קודם הסרת העטיפות - אחרי ביטול, פקודה דרך עטיפת הביטול הייתה נכשלת שוב
+                        profiler.detach()
+                        job.detach()
+                        blocker.disable()
             
+            result.elapsed = time.perf_counter() - started
+            if result.network:
+                result.network.update(estimate_savings(
+                    self.login_results_file, site_name, result.network, result.elapsed
+                ))
+            if result.outcome:
+                try:
+                    record_outcome(
+                        self.login_results_file, site_name, result.outcome, result.elapsed,
+                        {'network': result.network} if result.network else None
+                    )
+                except Exception as e:
+                    self.logger.error(f"שגיאה בשמירת תוצאת ההתחברות: {str(e)}")
+                status = result.outcome.status
+                if result.outcome.status == OUTCOME_FAILED:
+                    raise Exception(
+                        f"ההתחברות לאתר {site_name} נכשלה: {result.outcome.error or result.outcome.reason}"
+                    )
+            else:
+                status = OUTCOME_SUCCESS
+            return result
+        except LoginCancelled:
+            status = None
+            raise
+        finally:
+            job.site_data = encrypted_site
+            # התחברות שבוטלה לא נכנסת להיסטוריה - הזמנים שלה חלקיים
+            if status:
+                self._record_timings(site_name, status, time.perf_counter() - started, profiler)
+            if profile_commands:
+                self._export_login_profile(profiler, site_name)
+
+    def _record_timings(self, site_name: str, status: str, total_seconds: float, profiler: DriverProfiler):
+        """הוספת זמני השלבים של ההתחברות להיסטוריית הזמנים"""
+        try:
+            self.timing_history.record(site_name, status, total_seconds, profiler.stage_times())
         except Exception as e:
-            QMessageBox.critical(self, "שגיאת התחברות", str(e))
-    def _handle_gmail_login(self, driver, site_data):
-        """טיפול בהתחברות מיוחדת ל-Gmail"""
+            self.logger.error(f"שגיאה בשמירת זמני ההתחברות: {str(e)}")
+
+    def perform_health_check(self, job: LoginJob) -> LoginResult:
+        """בדיקת תקינות: התחברות מלאה בדפדפן ללא חלון (בתהליכון הרקע של הבדיקות)"""
+        started = time.perf_counter()
+        encrypted_site = self._unlock_job(job)
+        try:
+            with self.health_pool.lease() as driver:
+                job.attach(driver)
+                # הבדיקה לא צריכה את התמונות והגופנים של האתר
+                blocker = ResourceBlocker(driver, site_categories(job.site_data, True))
+                try:
+                    result = self._run_login(driver, job, None, blocker)
+                finally:
+                    job.detach()
+                    blocker.disable()
+        finally:
+            job.site_data = encrypted_site
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _try_http_login(self, job: LoginJob,
+                        profiler: Optional[DriverProfiler]) -> Optional[HttpLoginResult]:
+        """התחברות ב-HTTP; None כשיש לעבור לדפדפן (נדרש JavaScript, תוצאה לא ודאית או שגיאת רשת)"""
+        site_data = job.site_data
+        # מתכונים נכתבו לאתרים שנבנים ב-JavaScript; סשן שמור נבדק בדפדפן
+        if find_recipe(site_data):
+            return None
+        if job.options.get('reuse_session') and self.session_store.has_session(site_data):
+            return None
+        
         try:
-            wait = WebDriverWait(driver, 10)
+            result = self.http_client.login(
+                site_data, job.options.get('scorer'), profiler, checkpoint=job.checkpoint
+            )
+        except JavaScriptRequired as e:
+            self.logger.info(f"התחברות HTTP לאתר {job.site_name} לא אפשרית ({e.reason}) - מעבר לדפדפן")
+            return None
+        except Exception as e:
+            self.logger.info(f"שגיאה בהתחברות HTTP לאתר {job.site_name}: {str(e)} - מעבר לדפדפן")
+            return None
+        
+        if result.outcome.status == OUTCOME_UNKNOWN:
+            self.logger.info(f"תוצאת התחברות HTTP לאתר {job.site_name} לא ודאית - מעבר לדפדפן")
+            return None
+        
+        if result.outcome.succeeded and job.options.get('reuse_session'):
+            try:
+                self.session_store.save(self.session_store.key_for(site_data), result.cookies)
+            except Exception as e:
+                self.logger.error(f"שגיאה בשמירת הסשן: {str(e)}")
+        return result
+
+    def _open_http_session(self, driver, job: LoginJob, http_result: HttpLoginResult,
+                           profiler: Optional[DriverProfiler]) -> LoginResult:
+        """פתיחת האתר בדפדפן עם העוגיות של התחברות ה-HTTP"""
+        job.checkpoint("פותח את האתר בדפדפן...")
+        with profile_stage(profiler, 'cookie_handoff'):
+            self.session_store.apply(driver, http_result.cookies, http_result.final_url)
+        with profile_stage(profiler, 'navigation'):
+            driver.get(http_result.final_url)
+        return LoginResult(http_result.outcome)
+
+    def _run_login(self, driver, job: LoginJob, profiler: Optional[DriverProfiler],
+                   blocker: Optional[ResourceBlocker] = None) -> LoginResult:
+        """תהליך ההתחברות בדפדפן: ניווט, מתכון או זיהוי ומילוי, שליחה ובדיקה"""
+        site_data = job.site_data
+        submit = job.options.get('submit', True)
+        reuse_session = job.options.get('reuse_session', False)
+        # הבדיקה רק לאתר שכבר נשמר לו סשן - דף בלי טופס התחברות לא מעיד לבד שמחוברים
+        check_session = reuse_session and self.session_store.has_session(site_data)
+        restored = 0
+        
+        if check_session:
+            with profile_stage(profiler, 'session_restore'):
+                restored = self.session_store.restore(driver, site_data)
+        
+        if blocker:
+            with profile_stage(profiler, 'blocking'):
+                blocker.enable()
+        
+        job.checkpoint("טוען את האתר...")
+        with profile_stage(profiler, 'navigation'):
+            driver.get(site_data['url'])
+        
+        # אתרים עם התחברות בכמה שלבים (Google, Microsoft או מתכון שהוגדר לאתר)
+        recipe = find_recipe(site_data)
+        
+        if check_session:
+            job.checkpoint("בודק אם כבר מחובר...")
+            ready = SmartLoginFieldsFinder(driver, profiler=profiler).wait_until_ready
+            with profile_stage(profiler, 'session_check'):
+                session = self.session_store.check(
+                    driver, self._login_markers(site_data, recipe), ready, restored
+                )
+            self.logger.info(
+                f"בדיקת סשן לאתר {job.site_name}: {session.reason} "
+                f"({restored} עוגיות, {session.elapsed:.2f} שניות)"
+            )
+            if session.authenticated:
+                outcome = LoginOutcome(OUTCOME_SUCCESS, 'session_reused', session.elapsed, session.url)
+                # המשתמש נשאר בדף שנטען עם חסימה - טעינה מחדש (ניווט GET) כדי שיקבל אותו מלא
+                if blocker and blocker.active:
+                    blocker.disable()
+                    driver.refresh()
+                return LoginResult(outcome, session=session)
+        
+        verifier = LoginVerifier(driver)
+        verifier.capture_baseline()
+        outcome = None
+        login_fields = None
+        network = None
+        
+        if recipe:
+            # משקל הדף נמדד לפני השליחה - המדידה מתייחסת לדף ההתחברות
+            network = blocker.measure() if blocker else None
+            # המתכון שולח בעצמו - החסימה מבוטלת לפניו כדי שדף הנחיתה ייטען מלא
+            if blocker:
+                blocker.disable()
+            job.checkpoint(f"מריץ מתכון התחברות ({recipe.name})...")
+            RecipeRunner(driver, profiler).run(recipe, {
+                'username': site_data['username'],
+                'password': site_data['password']
+            })
+            # המתכון שולח בעצמו - נשאר רק לבדוק את התוצאה
+            if submit:
+                with profile_stage(profiler, 'verify'):
+                    outcome = verifier.wait_for_outcome()
+        else:
+            job.checkpoint("מאתר את שדות ההתחברות...")
+            finder = SmartLoginFieldsFinder(driver, job.options.get('scorer'), profiler=profiler)
+            username = site_data['username']
+            password = site_data['password']
             
-            # שלב 1: הזנת האימייל
-            print("מזין כתובת אימייל...")  # לוג לדיבוג
-            email_field = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="email"]')))
-            email_field.clear()
-            email_field.send_keys(site_data['username'])
+            # ניסיון ראשון: מזהים שנשמרו בהתחברות מוצלחת קודמת
+            cached_fields = {
+                'username': site_data.get('username_field'),
+                'password': site_data.get('password_field')
+            }
+            with profile_stage(profiler, 'detection'):
+                with profile_stage(profiler, 'cached_lookup'):
+                    elements = finder.find_cached_fields(cached_fields)
             
-            # המתנה קצרה אחרי הזנת האימייל
-            time.sleep(2)
+            if not elements:
+                # טעינה מוקדמת (eager): בדפי אפליקציה השדות נוצרים רק אחרי שהדף מוכן
+                # (שלב נפרד ולא בתוך 'detection' - כדי שסכום השלבים בסטטיסטיקות יתאים לזמן הכולל)
+                with profile_stage(profiler, 'readiness'):
+                    finder.wait_until_ready()
             
-            # שלב 2: לחיצה על כפתור "הבא" הראשון
-            print("מחפש כפתור 'הבא' ראשון...")  # לוג לדיבוג
-            next_button = wait.until(EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, '#identifierNext button, div#identifierNext button')
-            ))
-            next_button.click()
+            with profile_stage(profiler, 'detection'):
+                if not elements and all(cached_fields.values()):
+                    with profile_stage(profiler, 'cached_lookup'):
+                        elements = finder.find_cached_fields(cached_fields)
+                
+                # אחרת: זיהוי מלא ואיתור השדות לפי המזהים שנוצרו בקריאה אחת
+                if not elements:
+                    login_fields = finder.find_login_fields(ready=True)
+                    
+                    if not login_fields:
+                        raise Exception("לא נמצאו שדות התחברות באתר")
+                    
+                    with profile_stage(profiler, 'resolve'):
+                        elements = finder.resolve_login_fields(login_fields)
+                    if not elements:
+                        raise Exception("לא ניתן לאתר את שדות ההתחברות שזוהו")
             
-            # המתנה לטעינת דף הסיסמה
-            time.sleep(3)
+            job.checkpoint("ממלא את פרטי ההתחברות...")
+            with profile_stage(profiler, 'fill'):
+                filled = finder.fill_fields(
+                    elements,
+                    {'username': username, 'password': password},
+                    site_data.get('fill_mode') or job.options.get('fill_mode')
+                )
             
-            # שלב 3: הזנת הסיסמה
-            print("מזין סיסמה...")  # לוג לדיבוג
-            password_field = wait.until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, 'input[type="password"]')
-            ))
-            password_field.clear()
-            password_field.send_keys(site_data['password'])
+            if filled != {'username', 'password'}:
+                raise Exception("מילוי שדות ההתחברות נכשל")
             
-            # המתנה קצרה אחרי הזנת הסיסמה
-            time.sleep(2)
+            network = blocker.measure() if blocker else None
             
-            # שלב 4: לחיצה על כפתור "הבא" השני
-            print("מחפש כפתור 'הבא' שני...")  # לוג לדיבוג
-            try:
-                password_next = wait.until(EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, '#passwordNext button, div#passwordNext button')
-                ))
-                password_next.click()
-            except:
-                try:
-                    # ניסיון שני עם JavaScript
-                    password_next = driver.find_element(By.CSS_SELECTOR, '#passwordNext button, div#passwordNext button')
-                    driver.execute_script("arguments[0].click();", password_next)
-                except:
-                    raise Exception("לא נמצא כפתור 'הבא' אחרי הזנת הסיסמה")
+            # דף הנחיתה אחרי ההתחברות נשאר אצל המשתמש - נטען בלי חסימה
+            if blocker:
+                blocker.disable()
             
-            # המתנה לסיום ההתחברות
-            time.sleep(3)
+            if submit:
+                job.checkpoint("שולח ובודק את ההתחברות...")
+                with profile_stage(profiler, 'submit'):
+                    self._submit_login_form(driver, elements['password'], verifier)
+                with profile_stage(profiler, 'verify'):
+                    outcome = verifier.wait_for_outcome()
             
-        except TimeoutException:
-            raise Exception("תהליך ההתחברות נכשל - זמן ההמתנה עבר")
+            # המזהים נשמרים לשימוש בהתחברויות הבאות (אלא אם ההתחברות נכשלה בוודאות)
+            if outcome is not None and outcome.status == OUTCOME_FAILED:
+                login_fields = None
+        
+        # שמירת הסשן רק אחרי הצלחה ודאית
+        if reuse_session and outcome is not None and outcome.succeeded:
+            with profile_stage(profiler, 'session_save'):
+                try:
+                    saved = self.session_store.capture(driver, site_data)
+                    self.logger.info(f"נשמרו {saved} עוגיות סשן לאתר {job.site_name}")
+                except Exception as e:
+                    self.logger.error(f"שגיאה בשמירת הסשן: {str(e)}")
+        
+        return LoginResult(outcome, login_fields, network=network)
+
+    def _login_markers(self, site_data: Dict, recipe: Optional[LoginRecipe]) -> List[str]:
+        """מזהים שנוכחותם בדף מעידה שצריך להתחבר: שדה סיסמה, השדות השמורים וצעד המתכון הראשון"""
+        markers = ['input[type="password"]']
+        for key in ('username_field', 'password_field'):
+            selectors = site_data.get(key)
+            if isinstance(selectors, dict) and selectors.get('css'):
+                markers.append(selectors['css'])
+        if recipe:
+            markers.extend(
+                step.selector for step in recipe.steps[:1]
+                if step.action in (STEP_WAIT_FOR, STEP_FILL) and step.selector
+            )
+        return markers
+
+    def _on_login_started(self, job: LoginJob):
+        self.status_bar.showMessage(f"מתחבר לאתר {job.site_name}...")
+        self._refresh_jobs_list()
+
+    def _on_login_progress(self, job: LoginJob, message: str):
+        self.status_bar.showMessage(f"{job.site_name}: {message}")
+        self._refresh_jobs_list()
+
+    def _on_login_succeeded(self, job: LoginJob, result: LoginResult):
+        """סיום התחברות: שמירת המזהים שזוהו והצגת התוצאה"""
+        if result.login_fields:
+            self._cache_login_selectors(job.site_name, result.login_fields)
+        
+        outcome = result.outcome
+        # התחברות מוצלחת של המשתמש מעידה שהפרטים תקינים - הבדיקה התקופתית נדחית
+        if outcome is not None and outcome.succeeded and job.site_name in self.sites:
+            self.health_scheduler.record(job.site_name, HEALTH_OK, outcome.reason, result.elapsed)
+            self._decorate_site_items()
+        if result.session is not None and result.session.authenticated:
+            self.status_bar.showMessage(
+                f"כבר מחובר לאתר {job.site_name} - נעשה שימוש בסשן השמור "
+                f"(נבדק תוך {result.session.elapsed:.1f} שניות)", 5000
+            )
+        elif outcome is None or outcome.succeeded:
+            network = describe_network(result.network)
+            self.status_bar.showMessage(
+                f"התחברות לאתר {job.site_name} בוצעה בהצלחה ({result.elapsed:.1f} שניות"
+                f"{', ' + network if network else ''})", 8000
+            )
+        else:
+            self.status_bar.showMessage(
+                f"הטופס נשלח לאתר {job.site_name} אך לא ניתן לוודא את ההתחברות", 5000
+            )
+        self._refresh_jobs_list()
+
+    def _on_login_failed(self, job: LoginJob, error: str):
+        self.status_bar.showMessage(f"ההתחברות לאתר {job.site_name} נכשלה", 5000)
+        self._refresh_jobs_list()
+        if not job.options.get('bulk'):
+            QMessageBox.critical(self, "שגיאת התחברות", error)
+
+    def run_due_health_checks(self):
+        """סבב הבדיקות: הוספת האתרים שהגיע זמנם לתור, עד מגבלת הבדיקות במקביל"""
+        if not self.settings.value('HealthCheckEnabled', False, type=bool):
+            return
+        # התחברויות של המשתמש קודמות - הבדיקות ממתינות לסבב הבא
+        if self.login_worker.active_jobs():
+            return
+        self._submit_health_checks(list(self.sites))
+
+    def check_sites_health(self, site_names: List[str]):
+        """בדיקה מיידית של האתרים (גם כשהבדיקה התקופתית כבויה)"""
+        self.health_scheduler.check_now(site_names)
+        self._submit_health_checks(site_names)
+        self.status_bar.showMessage(f"{len(site_names)} אתרים נוספו לבדיקת התקינות", 3000)
+
+    def _submit_health_checks(self, site_names: List[str]):
+        in_flight = [job.site_name for job in self.health_worker.active_jobs()]
+        free = self.health_worker.max_parallel - len(in_flight)
+        options = {
+            'submit': True,
+            'reuse_session': False,
+            'fill_mode': SmartLoginFieldsFinder.FILL_EVENTS,
+            'health_check': True
+        }
+        for site_name in self.health_scheduler.due_sites(site_names, free, exclude=in_flight):
+            self.health_worker.submit(
+                site_name, dict(self.sites[site_name]), dict(options, scorer=self.create_scorer())
+            )
+
+    def _on_health_check_succeeded(self, job: LoginJob, result: LoginResult):
+        outcome = result.outcome
+        if outcome is None:
+            status, reason = HEALTH_UNKNOWN, "no_outcome"
+        elif outcome.succeeded:
+            status, reason = HEALTH_OK, outcome.reason
+        elif outcome.status == OUTCOME_FAILED:
+            status, reason = HEALTH_BROKEN, outcome.error or outcome.reason
+        else:
+            status, reason = HEALTH_UNKNOWN, outcome.reason
+        self._record_health(job, status, reason, result.elapsed)
+
+    def _on_health_check_failed(self, job: LoginJob, error: str):
+        self._record_health(job, HEALTH_ERROR, error, job.duration or 0.0)
+
+    def _record_health(self, job: LoginJob, status: str, reason: str, elapsed: float):
+        # אתר שנמחק בזמן הבדיקה לא נשמר
+        if job.site_name not in self.sites:
+            return
+        health = self.health_scheduler.record(job.site_name, status, reason, elapsed)
+        self.logger.info(f"בדיקת תקינות {job.site_name}: {status} ({reason}), {elapsed:.1f} שניות")
+        self._decorate_site_items()
+        if health.flagged and self.tray_icon is not None and self.tray_icon.isVisible():
+            self.tray_icon.showMessage(
+                "בדיקת תקינות", f"{job.site_name}: {describe_health(health).splitlines()[0]}",
+                QSystemTrayIcon.MessageIcon.Warning, 5000
+            )
+
+    def _decorate_site_items(self):
+        """סימון אתרים שפרטי ההתחברות שלהם נדחו או שהבדיקה שלהם נכשלת שוב ושוב"""
+        for row in range(self.sites_list.count()):
+            item = self.sites_list.item(row)
+            health = self.health_scheduler.get(item.text())
+            item.setToolTip(describe_health(health))
+            if health and health.flagged:
+                color = Qt.GlobalColor.red if health.status == HEALTH_BROKEN else Qt.GlobalColor.darkYellow
+                item.setForeground(color)
+            else:
+                item.setData(Qt.ItemDataRole.ForegroundRole, None)
+
+    def _on_login_cancelled(self, job: LoginJob):
+        self.status_bar.showMessage(f"ההתחברות לאתר {job.site_name} בוטלה", 3000)
+        self._refresh_jobs_list()
+
+    def _refresh_jobs_list(self):
+        """עדכון רשימת ההתחברויות הפעילות"""
+        if self.jobs_list is None:
+            return
+        self.jobs_list.clear()
+        for job in self.login_worker.active_jobs():
+            state = job.message if job.status == JOB_RUNNING else "בתור"
+            item = QListWidgetItem(f"{job.site_name} - {state}")
+            item.setData(Qt.ItemDataRole.UserRole, job.job_id)
+            self.jobs_list.addItem(item)
+
+    def cancel_selected_login(self):
+        """ביטול ההתחברות שנבחרה ברשימת ההתחברויות הפעילות"""
+        item = self.jobs_list.currentItem() if self.jobs_list else None
+        if item:
+            self.login_worker.cancel(item.data(Qt.ItemDataRole.UserRole))
+
+    def _export_login_profile(self, profiler: DriverProfiler, site_name: str):
+        """כתיבת פרופיל ההתחברות ללוג ולקובץ JSON"""
+        try:
+            profiler.log_summary()
+            os.makedirs(self.profiles_dir, exist_ok=True)
+            safe_name = re.sub(r'[^\w.-]', '_', site_name)
+            filename = os.path.join(
+                self.profiles_dir,
+                f"{safe_name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            profiler.export_json(filename)
         except Exception as e:
-            raise Exception(f"שגיאה בהתחברות ל-Gmail: {str(e)}")
+            self.logger.error(f"שגיאה בשמירת פרופיל ההתחברות: {str(e)}")
+    def _cache_login_selectors(self, site_name: str, login_fields: Dict[str, Dict[str, str]]):
+        """שמירת מזהי השדות שזוהו ברשומת האתר"""
+        site_data = self.sites.get(site_name)
+        if site_data is None:
+            return
+        
+        if site_data.get('username_field') == login_fields['username'] and \
+           site_data.get('password_field') == login_fields['password']:
+            return
         
-    def _submit_login_form(self, driver):
+        site_data['username_field'] = login_fields['username']
+        site_data['password_field'] = login_fields['password']
+        self.save_sites()
+
+    def _submit_login_form(self, driver, password_element: Optional[WebElement] = None,
+                           verifier: Optional[LoginVerifier] = None):
         """שליחת טופס ההתחברות"""
         try:
+            # קודם: הטופס של שדה הסיסמה שמולא
+            if password_element is not None:
+                if (verifier or LoginVerifier(driver)).submit(password_element):
+                    return
+            
             # ניסיון למצוא כפתור התחברות
             submit_buttons = driver.find_elements(
                 By.XPATH,
@@ -1291,6 +2373,7 @@ class AdvancedLoginManager(QMainWindow):
         self.sites_list.clear()
         for site_name in sorted(self.sites.keys()):
             self.sites_list.addItem(site_name)
+        self._decorate_site_items()
         self.update_status_bar()
 
     def update_status_bar(self):
@@ -1306,6 +2389,7 @@ class AdvancedLoginManager(QMainWindow):
             if search_text in site_name.lower() or \
                search_text in self.sites[site_name]['url'].lower():
                 self.sites_list.addItem(site_name)
+        self._decorate_site_items()
 
     def show_site_context_menu(self, position):
         """הצגת תפריט הקשר לאתר נבחר"""
@@ -1316,25 +2400,40 @@ class AdvancedLoginManager(QMainWindow):
         menu = QMenu()
         
         login_action = menu.addAction("התחבר")
+        bulk_login_action = None
+        if len(self.sites_list.selectedItems()) > 1:
+            bulk_login_action = menu.addAction("התחבר לכל הנבחרים")
         edit_action = menu.addAction("ערוך")
         delete_action = menu.addAction("מחק")
         copy_action = menu.addAction("העתק פרטי התחברות")
+        health_action = menu.addAction("בדוק תקינות פרטי התחברות")
+        site_data = self.sites.get(item.text(), {})
+        forget_session_action = None
+        if site_data and self.session_store.has_session(site_data):
+            forget_session_action = menu.addAction("מחק סשן שמור")
         
         action = menu.exec(self.sites_list.mapToGlobal(position))
         
         if action == login_action:
             self.login_to_site(item)
+        elif bulk_login_action is not None and action == bulk_login_action:
+            self.login_to_selected_sites()
         elif action == edit_action:
             self.edit_site()
         elif action == delete_action:
             self.delete_site()
         elif action == copy_action:
             self.copy_login_details(item.text())
+        elif action == health_action:
+            self.check_sites_health([i.text() for i in self.sites_list.selectedItems()] or [item.text()])
+        elif forget_session_action is not None and action == forget_session_action:
+            self.session_store.delete(self.session_store.key_for(site_data))
+            self.status_bar.showMessage(f"הסשן השמור של {item.text()} נמחק", 3000)
 
     def copy_login_details(self, site_name: str):
         """העתקת פרטי התחברות ללוח"""
         if site_name in self.sites:
-            site_data = self.sites[site_name]
+            site_data = self.reveal_site(self.sites[site_name])
             details = f"אתר: {site_name}\n"
             details += f"כתובת: {site_data['url']}\n"
             details += f"שם משתמש: {site_data['username']}"
@@ -1355,8 +2454,9 @@ class AdvancedLoginManager(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # גיבוי הנתונים הנוכחיים
-                old_sites = self.sites.copy()
+                # פענוח כל הנתונים במפתח הנוכחי
+                old_sites = {name: self.reveal_site(site_data) for name, site_data in self.sites.items()}
+                old_sessions = self.session_store.load_all()
                 
                 # יצירת מפתח חדש
                 self.key = Fernet.generate_key()
@@ -1365,8 +2465,11 @@ class AdvancedLoginManager(QMainWindow):
                 self.cipher = Fernet(self.key)
                 
                 # הצפנה מחדש של כל הנתונים
-                self.sites = old_sites
+                self.plaintext_cache.clear()
+                self.sites = {name: self._encrypt_credentials(site_data) for name, site_data in old_sites.items()}
                 self.save_sites()
+                for key, cookies in old_sessions.items():
+                    self.session_store.save(key, cookies)
                 
                 QMessageBox.information(
                     self,
@@ -1393,7 +2496,9 @@ class AdvancedLoginManager(QMainWindow):
             
             if filename:
                 with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.sites, f, indent=4, ensure_ascii=False)
+                    # פורמט הייצוא נשאר כמו קודם (פרטים מפוענחים) - הקובץ נקרא גם בהתקנה אחרת ואחרי החלפת מפתח
+                    exported_sites = {name: self.reveal_site(site_data) for name, site_data in self.sites.items()}
+                    json.dump(exported_sites, f, indent=4, ensure_ascii=False)
                 self.status_bar.showMessage("הנתונים יוצאו בהצלחה", 3000)
                 
         except Exception as e:
@@ -1423,6 +2528,13 @@ class AdvancedLoginManager(QMainWindow):
                     if not all(field in site_data for field in required_fields):
                         raise ValueError(f"נתונים חסרים באתר {site_name}")
                 
+                # קובץ הייצוא מכיל פרטים מפוענחים - הם מוצפנים במפתח הנוכחי לפני המיזוג
+                # (ערך שכבר מוצפן במפתח הנוכחי נשאר כמו שהוא)
+                for site_data in imported_sites.values():
+                    for field_name in ENCRYPTED_FIELDS:
+                        if not self._is_encrypted(site_data[field_name]):
+                            site_data[field_name] = self.encrypt(site_data[field_name])
+                
                 # מיזוג הנתונים
                 self.sites.update(imported_sites)
                 self.save_sites()
@@ -1455,6 +2567,13 @@ def main():
     window = AdvancedLoginManager()
     window.show()
     
+    # עצירת ההתחברויות וסגירת הדפדפנים של המאגר ביציאה מהתוכנה
+    app.aboutToQuit.connect(window.login_worker.stop)
+    app.aboutToQuit.connect(window.health_worker.stop)
+    app.aboutToQuit.connect(window.driver_pool.shutdown)
+    app.aboutToQuit.connect(window.health_pool.shutdown)
+    app.aboutToQuit.connect(window.http_client.close)
+    
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""חסימת משאבים מיותרים (תמונות, גופנים, וידאו ורכיבי מעקב) בזמן התחברות, ומדידת החיסכון"""
+import json
+import logging
+import os
+import statistics
+from typing import Dict, List, Optional
+
+# קטגוריות חסימה: תבניות כתובת של Network.setBlockedURLs ('*' מתאים לכל רצף תווים)
+EXTENSION_CATEGORIES = {
+    'images': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'bmp', 'ico', 'svg'],
+    'fonts': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a', 'mov'],
+    'stylesheets': ['css']
+}
+
+TRACKER_DOMAINS = [
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'connect.facebook.net', 'facebook.com/tr', 'hotjar.com', 'clarity.ms',
+    'segment.io', 'segment.com', 'mixpanel.com', 'amplitude.com', 'newrelic.com', 'nr-data.net',
+    'fullstory.com', 'mouseflow.com', 'taboola.com', 'outbrain.com', 'criteo.com', 'adnxs.com',
+    'scorecardresearch.com', 'quantserve.com', 'bat.bing.com', 'tiktok.com/i18n/pixel', 'yandex.ru/metrika'
+]
+
+CATEGORIES = list(EXTENSION_CATEGORIES) + ['trackers']
+
+# ברירת המחדל לא חוסמת עיצוב - זיהוי השדות נשען על נראות מחושבת
+DEFAULT_CATEGORIES = ['images', 'fonts', 'media', 'trackers']
+
+# מצבי חסימה לאתר
+SITE_BLOCKING_DEFAULT = ''
+SITE_BLOCKING_OFF = 'off'      # רשימת ההיתרים: אתרים שלא עובדים עם חסימה
+SITE_BLOCKING_FULL = 'full'    # כל הקטגוריות, כולל עיצוב
+
+# משקל הדף עד עכשיו: בתים שהועברו, מספר המשאבים והפניות בדף שתואמות לתבניות החסומות
+PAGE_WEIGHT_SCRIPT = r"""
+const patterns = arguments[0].map((pattern) => new RegExp(
+    '^' + pattern.replace(/[.+?^${}()|[\]\\]/g, '\\$&').replace(/\*/g, '.*') + '$', 'i'
+));
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+const bytes = entries.reduce((sum, entry) => sum + (entry.transferSize || 0), 0);
+
+const urls = new Set();
+document.querySelectorAll('img[src], source[src], video[src], audio[src], script[src], iframe[src], link[href]')
+    .forEach((el) => urls.add(el.src || el.href));
+const blocked = Array.from(urls).filter((url) => patterns.some((re) => re.test(url))).length;
+
+const nav = performance.getEntriesByType('navigation')[0];
+return {
+    bytes: bytes,
+    resources: entries.length,
+    blocked_requests: blocked,
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null
+};
+"""
+
+
+def blocking_patterns(categories: List[str]) -> List[str]:
+    """תבניות הכתובות לחסימה עבור הקטגוריות (גם עם מחרוזת שאילתה אחרי הסיומת)"""
+    patterns = []
+    for category in categories:
+        for extension in EXTENSION_CATEGORIES.get(category, []):
+            patterns += [f'*.{extension}', f'*.{extension}?*']
+        if category == 'trackers':
+            patterns += [f'*{domain}*' for domain in TRACKER_DOMAINS]
+    return patterns
+
+
+def site_categories(site_data: Dict, enabled: bool, categories: Optional[List[str]] = None) -> List[str]:
+    """הקטגוריות שנחסמות באתר: ההגדרה של האתר גוברת על ההגדרה הכללית"""
+    mode = site_data.get('resource_blocking') or SITE_BLOCKING_DEFAULT
+    if mode == SITE_BLOCKING_OFF:
+        return []
+    if mode == SITE_BLOCKING_FULL:
+        return list(CATEGORIES)
+    return list(categories or DEFAULT_CATEGORIES) if enabled else []
+
+
+class ResourceBlocker:
+    """חסימה דרך DevTools בלשונית של ההתחברות בלבד - מבוטלת בסיום כדי שהמשתמש יקבל דף מלא"""
+
+    def __init__(self, driver, categories: List[str]):
+        self.driver = driver
+        self.categories = categories
+        self.patterns = blocking_patterns(categories)
+        self.logger = logging.getLogger(__name__)
+        self.active = False
+
+    def enable(self) -> bool:
+        if not self.patterns:
+            return False
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+            self.active = True
+        except Exception as e:
+            self.logger.debug(f"שגיאה בהפעלת חסימת המשאבים: {str(e)}")
+        return self.active
+
+    def disable(self):
+        if not self.active:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except Exception as e:
+            self.logger.debug(f"שגיאה בביטול חסימת המשאבים: {str(e)}")
+        self.active = False
+
+    def measure(self) -> Optional[Dict]:
+        """משקל הדף הנוכחי וכמה הפניות בו נחסמו"""
+        try:
+            weight = self.driver.execute_script(PAGE_WEIGHT_SCRIPT, self.patterns or blocking_patterns(CATEGORIES))
+        except Exception as e:
+            self.logger.debug(f"שגיאה במדידת משקל הדף: {str(e)}")
+            return None
+        weight['blocked'] = self.active
+        if not self.active:
+            # ללא חסימה: ההפניות התואמות נטענו בפועל
+            weight['blocked_requests'] = 0
+        return weight
+
+
+def estimate_savings(history_path: str, site_name: str, network: Dict, total_seconds: float) -> Dict:
+    """החיסכון לעומת ההתחברויות לאותו אתר ללא חסימה (חציון מקובץ ההיסטוריה), אם יש כאלה"""
+    if not network or not network.get('blocked') or not os.path.exists(history_path):
+        return {}
+
+    baseline_bytes, baseline_seconds = [], []
+    try:
+        with open(history_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                page = entry.get('network') or {}
+                if entry.get('site') != site_name or page.get('blocked', True):
+                    continue
+                if page.get('bytes'):
+                    baseline_bytes.append(page['bytes'])
+                if entry.get('total_seconds'):
+                    baseline_seconds.append(entry['total_seconds'])
+    except (OSError, ValueError):
+        return {}
+
+    savings = {}
+    if baseline_bytes:
+        savings['bytes_saved'] = int(statistics.median(baseline_bytes) - network.get('bytes', 0))
+    if baseline_seconds:
+        savings['seconds_saved'] = round(statistics.median(baseline_seconds) - total_seconds, 3)
+    return savings
+
+
+def describe_network(network: Optional[Dict]) -> str:
+    """תיאור קצר של משקל הדף והחיסכון לתצוגה"""
+    if not network:
+        return ''
+    text = f"{network.get('bytes', 0) / 1024:.0f} KB הועברו"
+    if network.get('blocked'):
+        text += f", {network.get('blocked_requests', 0)} בקשות נחסמו"
+    if 'bytes_saved' in network:
+        text += f", חיסכון של {network['bytes_saved'] / 1024:.0f} KB"
+    if 'seconds_saved' in network:
+        text += f" ו-{network['seconds_saved']:.1f} שניות לעומת התחברות ללא חסימה"
+    return text
@@ -0,0 +1,180 @@
+"""שמירת עוגיות הסשן לכל אתר (או קבוצת אתרים) ובדיקה זולה אם הדפדפן כבר מחובר"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+# האם סימני טופס ההתחברות גלויים בדף, בקריאה אחת לדפדפן
+LOGIN_MARKERS_SCRIPT = r"""
+const selectors = arguments[0];
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+};
+const visible = selectors.filter((selector) => {
+    try {
+        return Array.from(document.querySelectorAll(selector)).some(isVisible);
+    } catch (e) {
+        return false;
+    }
+});
+return {url: location.href, visible: visible};
+"""
+
+# שדות עוגייה ש-Network.setCookies מקבל
+CDP_COOKIE_KEYS = ['name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires']
+
+# סיומות דומיין בשתי רמות (למשל co.il) - הדומיין הבסיסי כולל עוד רמה אחת
+SECOND_LEVEL_LABELS = {'co', 'com', 'org', 'net', 'gov', 'ac', 'edu', 'muni'}
+
+
+@dataclass
+class SessionCheck:
+    """תוצאת בדיקת הסשן לפני ההתחברות"""
+    authenticated: bool
+    reason: str
+    # שניות מסיום הניווט ועד להחלטה
+    elapsed: float
+    restored_cookies: int = 0
+    url: str = ''
+
+
+def base_domain(host: str) -> str:
+    """הדומיין הבסיסי של שם מארח (accounts.google.com -> google.com, www.bank.co.il -> bank.co.il)"""
+    labels = [label for label in (host or '').lower().split('.') if label]
+    if len(labels) > 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class SessionStore:
+    """קובץ עוגיות מוצפן לכל אתר או קבוצת אתרים, שחוזר לדפדפן לפני הניווט"""
+
+    def __init__(self, directory: str, encrypt: Callable[[str], str], decrypt: Callable[[str], str]):
+        self.directory = directory
+        self.encrypt = encrypt
+        self.decrypt = decrypt
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def key_for(self, site_data: Dict) -> str:
+        """מפתח הסשן: קבוצת הסשן שהוגדרה לאתר, אחרת הדומיין הבסיסי של כתובתו"""
+        group = site_data.get('session_group')
+        if group:
+            return group
+        return base_domain(urlparse(site_data.get('url', '')).hostname or '') or site_data.get('site_name', '')
+
+    def has_session(self, site_data: Dict) -> bool:
+        return os.path.exists(self._path(self.key_for(site_data)))
+
+    def load(self, key: str) -> List[Dict]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return []
+        try:
+            with self._lock, open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            cookies = json.loads(self.decrypt(data['cookies']) or '[]')
+        except Exception as e:
+            self.logger.debug(f"שגיאה בטעינת הסשן {key}: {str(e)}")
+            return []
+
+        # עוגיות שפג תוקפן לא מוחזרות לדפדפן
+        now = time.time()
+        return [c for c in cookies if not c.get('expires') or c['expires'] < 0 or c['expires'] > now]
+
+    def save(self, key: str, cookies: List[Dict]):
+        os.makedirs(self.directory, exist_ok=True)
+        data = {
+            'saved': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'cookies': self.encrypt(json.dumps(cookies, ensure_ascii=False))
+        }
+        with self._lock, open(self._path(key), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def load_all(self) -> Dict[str, List[Dict]]:
+        """כל הסשנים השמורים (להצפנה מחדש בהחלפת מפתח)"""
+        if not os.path.isdir(self.directory):
+            return {}
+        keys = [name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json')]
+        return {key: self.load(key) for key in keys}
+
+    def restore(self, driver, site_data: Dict) -> int:
+        """החזרת העוגיות השמורות לדפדפן לפני הניווט לאתר; מחזיר את מספר העוגיות"""
+        cookies = self.load(self.key_for(site_data))
+        if not cookies:
+            return 0
+        return self.apply(driver, cookies, site_data['url'])
+
+    def apply(self, driver, cookies: List[Dict], url: str) -> int:
+        """הכנסת עוגיות לדפדפן (גם עוגיות של התחברות שבוצעה ב-HTTP)"""
+        try:
+            # Chrome: כל הדומיינים בפקודה אחת, בלי ניווט מקדים
+            driver.execute_cdp_cmd('Network.setCookies', {
+                'cookies': [{k: c[k] for k in CDP_COOKIE_KEYS if k in c} for c in cookies]
+            })
+            return len(cookies)
+        except Exception as e:
+            self.logger.debug(f"שגיאה בהחזרת עוגיות דרך CDP: {str(e)}")
+
+        # גיבוי: add_cookie חל רק על הדומיין של הדף הנוכחי
+        driver.get(url)
+        restored = 0
+        for cookie in cookies:
+            try:
+                driver.add_cookie({k: cookie[k] for k in ('name', 'value', 'domain', 'path', 'secure')
+                                   if k in cookie})
+                restored += 1
+            except Exception:
+                pass
+        return restored
+
+    def capture(self, driver, site_data: Dict) -> int:
+        """שמירת עוגיות האתר אחרי התחברות מוצלחת; מחזיר את מספר העוגיות שנשמרו"""
+        # הדפדפן משותף לכמה אתרים - נשמרות רק העוגיות של דומייני האתר והכתובת הסופית
+        domains = {
+            base_domain(urlparse(site_data.get('url', '')).hostname or ''),
+            base_domain(urlparse(driver.current_url).hostname or '')
+        } - {''}
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        except Exception:
+            cookies = driver.get_cookies()
+
+        cookies = [c for c in cookies if base_domain(c.get('domain', '').lstrip('.')) in domains]
+        if cookies:
+            self.save(self.key_for(site_data), cookies)
+        return len(cookies)
+
+    def check(self, driver, markers: List[str], ready: Optional[Callable[[], Dict]] = None,
+              restored: int = 0) -> SessionCheck:
+        """האם כבר מחוברים: אחרי שהדף נרגע, אף אחד מסימני טופס ההתחברות לא גלוי"""
+        start = time.perf_counter()
+        if ready:
+            ready()
+        try:
+            state = driver.execute_script(LOGIN_MARKERS_SCRIPT, markers) or {}
+        except Exception as e:
+            self.logger.debug(f"שגיאה בבדיקת הסשן: {str(e)}")
+            return SessionCheck(False, 'check_failed', time.perf_counter() - start, restored)
+
+        elapsed = time.perf_counter() - start
+        if state.get('visible'):
+            return SessionCheck(False, 'login_form_visible', elapsed, restored, state.get('url', ''))
+        return SessionCheck(True, 'no_login_form', elapsed, restored, state.get('url', ''))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', key) + '.json')
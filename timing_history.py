@@ -0,0 +1,121 @@
+"""היסטוריית זמני שלבים לכל התחברות וחישוב אחוזונים לפי אתר, שלב ותקופה"""
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+# השלבים שמוצגים בטבלת הסטטיסטיקות, לפי סדר התהליך ('total' - ההתחברות כולה)
+SUMMARY_STAGES = [
+    'driver_start', 'navigation', 'readiness', 'detection', 'fill', 'submit', 'verify', 'total'
+]
+
+_write_lock = threading.Lock()
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """אחוזון באינטרפולציה לינארית בין הערכים הממוינים"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class TimingHistory:
+    """קובץ JSONL מקומי: שורה לכל התחברות עם הזמן של כל שלב במילישניות"""
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+
+    def record(self, site_name: str, status: str, total_seconds: float, stages: Dict[str, float]):
+        entry = {
+            'site': site_name,
+            'timestamp': time.time(),
+            'status': status,
+            'stages': {name: round(ms, 1) for name, ms in stages.items()},
+        }
+        entry['stages']['total'] = round(total_seconds * 1000, 1)
+        with _write_lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._trim()
+
+    def load(self, since: Optional[float] = None, site_name: Optional[str] = None) -> List[Dict]:
+        """הרשומות (מהתקופה ומהאתר שנבחרו), מהישנה לחדשה"""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since and entry.get('timestamp', 0) < since:
+                    continue
+                if site_name and entry.get('site') != site_name:
+                    continue
+                entries.append(entry)
+        return entries
+
+    def _trim(self):
+        """שמירה על גודל הקובץ: מעבר למגבלה נשארות הרשומות החדשות (נקרא בתוך הנעילה)"""
+        try:
+            if os.path.getsize(self.path) < self.max_entries * 200:
+                return
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            if len(lines) <= self.max_entries:
+                return
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[-self.max_entries:])
+        except OSError:
+            pass
+
+
+def stage_stats(entries: Iterable[Dict], key: str = 'site') -> Dict[str, Dict[str, Dict]]:
+    """p50/p95 ומספר מדידות לכל ערך של key (אתר) ולכל שלב"""
+    samples = defaultdict(lambda: defaultdict(list))
+    for entry in entries:
+        for stage, ms in entry.get('stages', {}).items():
+            samples[entry.get(key, '')][stage].append(ms)
+    return {
+        group: {
+            stage: {'count': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+            for stage, values in stages.items()
+        }
+        for group, stages in samples.items()
+    }
+
+
+def slowest_sites(stats: Dict[str, Dict[str, Dict]], stage: str = 'total', limit: int = 0) -> List[str]:
+    """האתרים לפי החציון של השלב, מהאיטי ביותר"""
+    sites = [site for site, stages in stats.items() if stage in stages]
+    sites.sort(key=lambda site: stats[site][stage]['p50'], reverse=True)
+    return sites[:limit] if limit else sites
+
+
+def daily_trend(entries: Iterable[Dict]) -> List[Dict]:
+    """מגמה לפי יום: מספר התחברויות, שיעור הצלחה ואחוזוני הזמן הכולל"""
+    days = defaultdict(list)
+    for entry in entries:
+        day = time.strftime('%Y-%m-%d', time.localtime(entry.get('timestamp', 0)))
+        days[day].append(entry)
+
+    trend = []
+    for day in sorted(days):
+        totals = [e['stages']['total'] for e in days[day] if 'total' in e.get('stages', {})]
+        succeeded = sum(1 for e in days[day] if e.get('status') == 'success')
+        trend.append({
+            'day': day,
+            'count': len(days[day]),
+            'success_rate': succeeded / len(days[day]),
+            'p50': percentile(totals, 50),
+            'p95': percentile(totals, 95)
+        })
+    return trend
@@ -0,0 +1,326 @@
+"""ניקוד וקטורי של שדות התחברות: וקטור מאפיינים לכל שדה וניקוד כל הדף בפעולת מטריצה אחת"""
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy אופציונלי - בלעדיו זמין רק הניקוד ההיוריסטי
+    np = None
+
+from driver_profiler import profile_stage
+from field_scoring import (
+    FieldScore, FieldSnapshot, LoginFieldScorer, PageSnapshot, ScoringResult, load_snapshot
+)
+
+# שמות המאפיינים לפי סדר העמודות במטריצה
+FEATURE_NAMES = [
+    'bias',
+    'type_password', 'type_email_tel',
+    'attr_username_keywords', 'attr_password_keywords',
+    'attr_username_patterns', 'attr_password_patterns',
+    'autocomplete_username', 'autocomplete_current_password',
+    'maxlength_password_range', 'maxlength_username_range',
+    'label_username', 'label_password',
+    'nearby_username', 'nearby_password',
+    'described_username', 'described_password',
+    'top_third', 'top_half',
+    'prev_not_password', 'next_password', 'password_before_field',
+    'displayed',
+    'form_submit', 'form_field_combo', 'form_post', 'form_login_action'
+]
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# משקלים שמשחזרים בדיוק את הניקוד ההיוריסטי של LoginFieldScorer (עמודה לכל סוג שדה)
+HEURISTIC_WEIGHTS = {
+    'username': {
+        'type_email_tel': 3, 'attr_username_keywords': 1, 'attr_username_patterns': 2,
+        'autocomplete_username': 2, 'maxlength_username_range': 1,
+        'label_username': 3, 'nearby_username': 1, 'described_username': 2,
+        'top_third': 2, 'top_half': 1, 'prev_not_password': 1, 'next_password': 2,
+        'displayed': 1,
+        'form_submit': 1, 'form_field_combo': 2, 'form_post': 1, 'form_login_action': 1
+    },
+    'password': {
+        'type_password': 5, 'attr_password_keywords': 1, 'attr_password_patterns': 2,
+        'autocomplete_current_password': 2, 'maxlength_password_range': 1,
+        'label_password': 3, 'nearby_password': 1, 'described_password': 2,
+        'top_third': 2, 'top_half': 1, 'password_before_field': 2,
+        'displayed': 1,
+        'form_submit': 1, 'form_field_combo': 2, 'form_post': 1, 'form_login_action': 1
+    }
+}
+
+FIELD_TYPES = ('username', 'password')
+
+# סף המועמדות של המשקלים ההיוריסטיים (כמו ב-_score_all_fields)
+HEURISTIC_THRESHOLD = 3.0
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class VectorFieldScorer(LoginFieldScorer):
+    """מנקד את כל המועמדים בדף במכפלת מטריצה אחת עם משקלים שניתן לאמן מאוסף מתויג"""
+
+    TIER_VECTOR = 'vector'
+
+    def __init__(self, weights: Optional[Dict[str, Dict[str, float]]] = None,
+                 threshold: float = HEURISTIC_THRESHOLD):
+        """אתחול עם משקלים לכל סוג שדה (ברירת מחדל: שחזור הניקוד ההיוריסטי)"""
+        if np is None:
+            raise RuntimeError("ניקוד וקטורי דורש את numpy")
+        super().__init__()
+        self.threshold = threshold
+        self.weights = self._weights_matrix(weights or HEURISTIC_WEIGHTS)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'VectorFieldScorer':
+        """טעינת משקלים מאומנים מקובץ JSON"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['weights'], data.get('threshold', HEURISTIC_THRESHOLD))
+
+    def save(self, path: str):
+        """שמירת המשקלים לקובץ JSON"""
+        data = {
+            'threshold': self.threshold,
+            'weights': {
+                field_type: {
+                    name: float(value)
+                    for name, value in zip(FEATURE_NAMES, self.weights[:, column])
+                    if value
+                }
+                for column, field_type in enumerate(FIELD_TYPES)
+            }
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def _weights_matrix(self, weights: Dict[str, Dict[str, float]]):
+        matrix = np.zeros((len(FEATURE_NAMES), len(FIELD_TYPES)))
+        for column, field_type in enumerate(FIELD_TYPES):
+            for name, value in weights.get(field_type, {}).items():
+                matrix[FEATURE_INDEX[name], column] = value
+        return matrix
+
+    def _score_all_fields(self, snapshot: PageSnapshot, profiler=None,
+                          candidates: Optional[List[FieldSnapshot]] = None) -> ScoringResult:
+        """בניית מטריצת המאפיינים של המועמדים וניקוד כולם יחד"""
+        with profile_stage(profiler, 'features'):
+            fields, features = self.extract_features(snapshot, candidates)
+
+        with profile_stage(profiler, 'vector_score'):
+            scores = features @ self.weights
+
+        username_candidates = []
+        password_candidates = []
+        for field_snapshot, (username_total, password_total) in zip(fields, scores.tolist()):
+            if username_total > self.threshold:
+                username_candidates.append(FieldScore(field_snapshot, base_score=username_total))
+            if password_total > self.threshold:
+                password_candidates.append(FieldScore(field_snapshot, base_score=password_total))
+
+        result = ScoringResult(
+            username_candidates=self._rank_candidates(username_candidates),
+            password_candidates=self._rank_candidates(password_candidates),
+            tier=self.TIER_VECTOR
+        )
+
+        # בחירת הזוג - אותם כללים כמו בניקוד ההיוריסטי
+        best_username = self._select_best_candidate(result.username_candidates)
+        best_password = self._select_best_candidate(result.password_candidates)
+        if best_username and best_password:
+            if self._validate_field_combination(best_username.element, best_password.element):
+                result.username = best_username
+                result.password = best_password
+
+        return result
+
+    def extract_features(self, snapshot: PageSnapshot,
+                         candidates: Optional[List[FieldSnapshot]] = None
+                         ) -> Tuple[List[FieldSnapshot], 'np.ndarray']:
+        """מטריצת מאפיינים (שורה לכל שדה גלוי ופעיל) יחד עם רשימת השדות"""
+        fields = [
+            f for f in (snapshot.fields if candidates is None else candidates)
+            if f.displayed and f.enabled
+        ]
+        features = np.zeros((len(fields), len(FEATURE_NAMES)))
+        for row, field_snapshot in enumerate(fields):
+            try:
+                self._fill_features(features[row], field_snapshot, snapshot)
+            except Exception as e:
+                self.logger.debug(f"שגיאה בחילוץ מאפיינים: {str(e)}")
+        return fields, features
+
+    def _fill_features(self, row, element: FieldSnapshot, snapshot: PageSnapshot):
+        """חישוב המאפיינים של שדה בודד - אותם סימנים שבודקות פונקציות ה-_analyze"""
+        column = FEATURE_INDEX
+        matcher = self.KEYWORD_MATCHER
+        row[column['bias']] = 1
+
+        # מאפיינים בסיסיים
+        input_type = element.get_attribute('type')
+        if input_type == 'password':
+            row[column['type_password']] = 1
+        elif input_type in ['email', 'tel']:
+            row[column['type_email_tel']] = 1
+
+        value_lower = None
+        for attr in ['name', 'id', 'class', 'aria-label', 'placeholder', 'data-testid', 'role']:
+            value = element.get_attribute(attr)
+            if not value:
+                continue
+            value_lower = value.lower()
+            hits = matcher.find(value_lower)
+            row[column['attr_username_keywords']] += sum(
+                self._calculate_keyword_score(keyword, value_lower) for keyword in hits['username']
+            )
+            row[column['attr_password_keywords']] += sum(
+                self._calculate_keyword_score(keyword, value_lower) for keyword in hits['password']
+            )
+
+        # כמו בניקוד ההיוריסטי: שדה בלי מאפיין מזהה לא מקבל את סימני התבניות, autocomplete ו-maxlength
+        if value_lower is not None:
+            row[column['attr_username_patterns']] = matcher.count_matches(matcher.username_patterns, value_lower)
+            row[column['attr_password_patterns']] = matcher.count_matches(matcher.password_patterns, value_lower)
+
+            autocomplete = (element.get_attribute('autocomplete') or '').lower()
+            if any(x in autocomplete for x in ['username', 'email']):
+                row[column['autocomplete_username']] = 1
+            elif 'current-password' in autocomplete:
+                row[column['autocomplete_current_password']] = 1
+
+            try:
+                maxlen = int(element.get_attribute('maxlength') or '')
+                if 20 <= maxlen <= 128:
+                    row[column['maxlength_password_range']] = 1
+                elif 3 <= maxlen <= 50:
+                    row[column['maxlength_username_range']] = 1
+            except ValueError:
+                pass
+
+        # הקשר טקסטואלי
+        for prefix, texts in (
+            ('label', element.label_texts),
+            ('nearby', [t.text for t in self._get_surrounding_elements(element, snapshot, max_distance=150)]),
+            ('described', element.described_texts)
+        ):
+            for text in texts:
+                username_hits, password_hits = self._text_signals(text)
+                row[column[f'{prefix}_username']] += username_hits
+                row[column[f'{prefix}_password']] += password_hits
+
+        # מיקום
+        viewport_height = snapshot.viewport_height
+        if element.rect['y'] < viewport_height / 3:
+            row[column['top_third']] = 1
+        elif element.rect['y'] < viewport_height / 2:
+            row[column['top_half']] = 1
+
+        form = self._find_parent_form(element, snapshot)
+        if form and element.form_input_index >= 0:
+            input_types = form.input_types
+            current_index = element.form_input_index
+            if current_index > 0 and input_types[current_index - 1] != 'password':
+                row[column['prev_not_password']] = 1
+            if current_index < len(input_types) - 1:
+                if input_types[current_index + 1] == 'password':
+                    row[column['next_password']] = 1
+                elif input_type == 'password':
+                    row[column['password_before_field']] = 1
+
+        if element.displayed:
+            row[column['displayed']] = 1
+
+        # סימני הטופס
+        if form:
+            has_login_inputs = 'password' in form.input_types and (
+                'text' in form.input_types or 'email' in form.input_types
+            )
+            action = (form.action or '').lower()
+            row[column['form_submit']] = float(form.has_submit)
+            row[column['form_field_combo']] = float(has_login_inputs)
+            row[column['form_post']] = float(form.method == 'post')
+            row[column['form_login_action']] = float(
+                any(keyword in action for keyword in ['login', 'signin', 'auth', 'התחבר'])
+            )
+
+    def _text_signals(self, text: str) -> Tuple[float, float]:
+        """ניקוד טקסט לפני משקל - כמו _analyze_text_content"""
+        if not text:
+            return 0.0, 0.0
+        text = text.lower()
+        matcher = self.KEYWORD_MATCHER
+        hits = matcher.find(text)
+        return (
+            2 * len(hits['username']) + matcher.count_searches(matcher.username_searchers, text),
+            2 * len(hits['password']) + matcher.count_searches(matcher.password_searchers, text)
+        )
+
+
+def labeled_rows(scorer: VectorFieldScorer, snapshot: PageSnapshot,
+                 labels: Dict[str, Optional[int]]):
+    """מאפיינים ותוויות (0/1 לכל סוג שדה) של כל השדות בדף"""
+    fields, features = scorer.extract_features(snapshot)
+    targets = np.zeros((len(fields), len(FIELD_TYPES)))
+    for column, field_type in enumerate(FIELD_TYPES):
+        for row, field_snapshot in enumerate(fields):
+            if field_snapshot.index == labels.get(field_type):
+                targets[row, column] = 1
+    return features, targets
+
+
+def fit_weights(features, targets, l2: float = 0.01, iterations: int = 2000,
+                learning_rate: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """אימון רגרסיה לוגיסטית לכל סוג שדה (ירידה במורד הגרדיאנט, מחלקות מאוזנות)"""
+    # נרמול העמודות לאימון יציב; המשקלים מוחזרים בסקאלה המקורית
+    scale = features[:, 1:].std(axis=0)
+    scale[scale == 0] = 1
+    mean = features[:, 1:].mean(axis=0)
+    normalized = np.hstack([np.ones((len(features), 1)), (features[:, 1:] - mean) / scale])
+
+    weights = {}
+    for column, field_type in enumerate(FIELD_TYPES):
+        y = targets[:, column]
+        positives = max(y.sum(), 1)
+        sample_weight = np.where(y == 1, len(y) / (2 * positives), len(y) / (2 * max(len(y) - positives, 1)))
+
+        w = np.zeros(normalized.shape[1])
+        for _ in range(iterations):
+            predicted = 1 / (1 + np.exp(-(normalized @ w)))
+            gradient = normalized.T @ (sample_weight * (predicted - y)) / len(y)
+            gradient[1:] += l2 * w[1:]
+            w -= learning_rate * gradient
+
+        # החזרה לסקאלה המקורית: w·((x-mean)/scale) = (w/scale)·x - w·mean/scale
+        raw = np.zeros_like(w)
+        raw[1:] = w[1:] / scale
+        raw[0] = w[0] - (w[1:] * mean / scale).sum()
+        weights[field_type] = dict(zip(FEATURE_NAMES, raw.tolist()))
+
+    return weights
+
+
+def load_labeled_snapshot(path: str) -> Tuple[PageSnapshot, Dict[str, Optional[int]]]:
+    """טעינת תמונת מצב שנשמרה עם תוויות (אינדקס השדה הנכון לכל סוג)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        labels = json.load(f).get('labels', {})
+    return load_snapshot(path), labels
+
+
+def create_scorer(mode: str = 'heuristic', weights_file: Optional[str] = None) -> LoginFieldScorer:
+    """יצירת מנוע הניקוד לפי המצב שנבחר, עם חזרה להיוריסטי אם הוקטורי לא זמין"""
+    logger = logging.getLogger(__name__)
+    if mode == 'vector':
+        if np is None:
+            logger.warning("numpy לא מותקן - משתמש בניקוד ההיוריסטי")
+            return LoginFieldScorer()
+        if weights_file:
+            try:
+                return VectorFieldScorer.from_file(weights_file)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"טעינת המשקלים נכשלה ({str(e)}) - משתמש במשקלים ההיוריסטיים")
+        return VectorFieldScorer()
+    return LoginFieldScorer()